@@ -0,0 +1,3 @@
+"""
+Benchmarks de parser, pipeline de ingesta y pintado de widgets
+"""
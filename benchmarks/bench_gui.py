@@ -0,0 +1,96 @@
+"""
+Costo de ``MainWindow.update_sensors`` y tiempo de pintado de cada widget
+
+Requiere un ``QApplication`` (con ``QT_QPA_PLATFORM=offscreen`` en servidores).
+"""
+
+import math
+from typing import Callable, Dict, List, Tuple
+import numpy as np
+from PyQt5.QtWidgets import QApplication, QWidget
+from benchmarks.common import result, time_calls
+from benchmarks.bench_parser import sample_lines
+from src.gui import widgets
+from src.gui.main_window import MainWindow
+from src.sensors.arduino_serial import ArduinoSerial
+from src.sensors.batch_parser import parse_lines
+
+
+class _OfflineSource(ArduinoSerial):
+    """Fuente que nunca conecta, para medir la ventana sin hardware"""
+
+    def connect(self, callback=None, batch_callback=None) -> bool:
+        return False
+
+
+def _tick_results(window: MainWindow, app: QApplication, prefix: str, ticks: int):
+    def tick():
+        window.update_sensors()
+        app.processEvents()
+    times = time_calls(tick, ticks) * 1000
+    return {
+        f"{prefix}_mean_ms": result(times.mean(), "ms", False),
+        f"{prefix}_p99_ms": result(np.percentile(times, 99), "ms", False),
+    }
+
+
+def bench_update_sensors(app: QApplication, ticks: int = 200) -> Dict[str, Dict[str, object]]:
+    window = MainWindow(source=_OfflineSource())
+    window.timer.stop()
+    window.show()
+    app.processEvents()
+    results = _tick_results(window, app, "update_sensors_simulated", ticks)
+    # Rama de datos reales: el store con lecturas y la fuente marcada como conectada
+    window.arduino_connected = True
+    window.store.append_batch(parse_lines(sample_lines(600)))
+    results.update(_tick_results(window, app, "update_sensors_real", ticks))
+    window.arduino_connected = False
+    window.close()
+    return results
+
+
+# (nombre, constructor, actualización con el paso i)
+WIDGETS: List[Tuple[str, Callable[[], QWidget], Callable[[QWidget, int], None]]] = [
+    ("LineGraphWidget", lambda: widgets.LineGraphWidget("LM35", 15, 35),
+     lambda w, i: w.update_value(25 + 5 * math.sin(i * 0.1))),
+    ("CircularGaugeWidget", lambda: widgets.CircularGaugeWidget("Suelo"),
+     lambda w, i: w.update_value(i % 100)),
+    ("BrightnessIndicatorWidget", lambda: widgets.BrightnessIndicatorWidget("LDR"),
+     lambda w, i: w.update_value(i % 100)),
+    ("DigitalIndicatorWidget", lambda: widgets.DigitalIndicatorWidget("Botón"),
+     lambda w, i: w.update_state(bool(i & 1))),
+    ("JoystickDisplayWidget", lambda: widgets.JoystickDisplayWidget("Joystick"),
+     lambda w, i: w.update_values(80 * math.sin(i * 0.1), 80 * math.cos(i * 0.1), bool(i & 8))),
+    ("RotaryWidget", lambda: widgets.RotaryWidget("Pot"),
+     lambda w, i: w.update_value(i % 100)),
+    ("KeyboardDisplayWidget", lambda: widgets.KeyboardDisplayWidget("Teclado"),
+     lambda w, i: w.show_key_pressed("123A456B789C*0#D"[i % 16])),
+]
+
+
+def bench_widgets(app: QApplication, frames: int = 200) -> Dict[str, Dict[str, object]]:
+    """Tiempo de ``repaint()`` (pintado síncrono con hijos) tras cada actualización"""
+    results = {}
+    for name, build, feed in WIDGETS:
+        widget = build()
+        widget.resize(400, 300)
+        widget.show()
+        app.processEvents()
+        step = 0
+
+        def frame():
+            nonlocal step
+            feed(widget, step)
+            step += 1
+            widget.repaint()
+        times = time_calls(frame, frames) * 1000
+        results[f"paint_{name}_mean_ms"] = result(times.mean(), "ms", False)
+        widget.close()
+    return results
+
+
+def run() -> Dict[str, Dict[str, object]]:
+    app = QApplication.instance() or QApplication([])
+    results = bench_update_sensors(app)
+    results.update(bench_widgets(app))
+    return results
@@ -0,0 +1,60 @@
+"""
+Throughput del parser: línea a línea (``_parse_and_callback``) y por lotes
+
+El throughput absoluto varía mucho entre corridas en una misma máquina, así
+que las métricas comparadas con el baseline son la velocidad relativa a un
+bucle de calibración (``split`` + ``float`` en Python puro) medido
+intercalado; las líneas/s se informan sin comparar.
+"""
+
+import numpy as np
+from typing import Dict, List
+from benchmarks.common import relative_speed, result, time_calls
+from src.sensors.arduino_serial import ArduinoSerial
+from src.sensors.batch_parser import parse_lines
+
+REPEAT = 60
+
+
+def sample_lines(n: int) -> List[str]:
+    """Líneas con la mezcla de formatos que envía el sketch"""
+    pattern = ["POT,57", "LDR,43", "LM35,24.5", "JOYSTICK,-12,87", "BUTTON,1", "JOYSTICK_BTN,0"]
+    return [pattern[i % len(pattern)] for i in range(n)]
+
+
+def calibration(lines: List[str]) -> None:
+    """Parser ingenuo de referencia: no cambia con el código del proyecto"""
+    rows = [line.split(",") for line in lines]
+    np.array([float(row[1]) for row in rows])
+
+
+def _results(name: str, fn, lines: List[str]) -> Dict[str, Dict[str, object]]:
+    """Velocidad relativa a la calibración y mediana de líneas/s"""
+    speed = relative_speed(lambda: fn(lines), lambda: calibration(lines), REPEAT)
+    per_second = len(lines) / np.median(time_calls(lambda: fn(lines), REPEAT))
+    return {
+        f"{name}_relative_speed": result(speed, "x", True),
+        f"{name}_lines_per_s": result(per_second, "lines/s", True, compare=False),
+    }
+
+
+def run() -> Dict[str, Dict[str, object]]:
+    arduino = ArduinoSerial()
+    readings = []
+    arduino.callback = readings.append
+
+    def per_line(lines):
+        for line in lines:
+            arduino._parse_and_callback(line)
+        readings.clear()
+
+    def batched(lines):
+        arduino._handle_lines(lines)
+        readings.clear()
+
+    lines = sample_lines(2000)
+    return {
+        **_results("parse_and_callback", per_line, lines),
+        **_results("handle_lines_batch", batched, lines),
+        **_results("parse_lines", parse_lines, lines),
+    }
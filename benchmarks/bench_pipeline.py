@@ -0,0 +1,63 @@
+"""
+Latencia de punta a punta desde un pty hasta los listeners de ``ArduinoSerial``
+
+Un thread escribe ráfagas de líneas en el lado maestro de un pty; cada línea
+lleva su instante de envío (``perf_counter``) como valor. El listener mide
+la diferencia al recibir el lote, cubriendo framing, parser y dispatch.
+"""
+
+import os
+import threading
+import time
+import tty
+from typing import Dict, List
+from benchmarks.common import latency_results, result
+from src.sensors.arduino_serial import ArduinoSerial
+
+
+def run(duration: float = 2.0, rate: float = 2000.0, burst: int = 10) -> Dict[str, Dict[str, object]]:
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    port = os.ttyname(slave)
+    arduino = ArduinoSerial(port=port)
+    arduino.read_timeout = 0.05
+    arduino.reset_delay = 0.0  # El pty no se reinicia al abrirlo
+    latencies: List[float] = []
+
+    def listener(batch):
+        now = time.perf_counter()
+        latencies.extend(now - batch['value0'])
+
+    arduino.add_listener(listener)
+    sent = 0
+    stop = threading.Event()
+
+    def writer():
+        nonlocal sent
+        interval = burst / rate
+        next_write = time.perf_counter()
+        while not stop.is_set():
+            delay = next_write - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            next_write += interval
+            data = "".join(f"LM35,{time.perf_counter():.6f}\r\n" for _ in range(burst))
+            os.write(master, data.encode())
+            sent += burst
+
+    arduino.connect()
+    thread = threading.Thread(target=writer, daemon=True)
+    start = time.perf_counter()
+    thread.start()
+    time.sleep(duration)
+    stop.set()
+    thread.join()
+    time.sleep(0.2)
+    elapsed = time.perf_counter() - start
+    arduino.disconnect()
+    os.close(master)
+    os.close(slave)
+    results = latency_results("pty_latency", latencies)
+    results["pty_lines_per_s"] = result(len(latencies) / elapsed, "lines/s", True)
+    results["pty_lines_lost"] = result(sent - len(latencies), "lines", False, compare=False)
+    return results
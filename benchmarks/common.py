@@ -0,0 +1,55 @@
+"""
+Utilidades comunes: medición de tiempos y formato de resultados
+"""
+
+import time
+import numpy as np
+from typing import Callable, Dict, List
+
+
+def result(value: float, unit: str, higher_is_better: bool, **extra) -> Dict[str, object]:
+    """Un resultado de benchmark listo para JSON"""
+    return {"value": float(value), "unit": unit, "higher_is_better": higher_is_better, **extra}
+
+
+def time_calls(fn: Callable[[], None], repeat: int, warmup: int = 3) -> np.ndarray:
+    """Duración en segundos de ``repeat`` llamadas a ``fn``"""
+    for _ in range(warmup):
+        fn()
+    times = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times[i] = time.perf_counter() - start
+    return times
+
+
+def relative_speed(fn: Callable[[], None], reference: Callable[[], None], repeat: int,
+                   warmup: int = 3) -> float:
+    """Mediana de ``t(reference) / t(fn)`` con llamadas intercaladas
+
+    Los cambios de velocidad de la máquina (frecuencia, otros procesos)
+    afectan por igual a las dos llamadas de cada par, así que el cociente es
+    mucho más estable que el tiempo absoluto.
+    """
+    for _ in range(warmup):
+        reference()
+        fn()
+    ratios = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        reference()
+        middle = time.perf_counter()
+        fn()
+        ratios[i] = (middle - start) / (time.perf_counter() - middle)
+    return float(np.median(ratios))
+
+
+def latency_results(prefix: str, seconds: List[float]) -> Dict[str, Dict[str, object]]:
+    """Percentiles 50/99 y máximo de una lista de latencias, en ms"""
+    ms = np.asarray(seconds) * 1000
+    return {
+        f"{prefix}_p50_ms": result(np.percentile(ms, 50), "ms", False),
+        f"{prefix}_p99_ms": result(np.percentile(ms, 99), "ms", False),
+        f"{prefix}_max_ms": result(ms.max(), "ms", False, compare=False),
+    }
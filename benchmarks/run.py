@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Ejecuta los benchmarks, guarda los resultados en JSON y los compara con un baseline
+
+Uso::
+
+    python3 -m benchmarks.run                          # todos, compara con baseline.json
+    python3 -m benchmarks.run --only parser pipeline
+    python3 -m benchmarks.run --save-baseline          # fija los resultados actuales
+
+Sale con código 1 si alguna métrica empeora más que ``--tolerance``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+# Sin pantalla: Qt usa la plataforma offscreen salvo que se indique otra
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+SUITES = ["parser", "pipeline", "gui"]
+
+
+def run_suite(name: str):
+    """Importa el módulo del suite al usarlo (``gui`` es el único que carga Qt)"""
+    if name == "parser":
+        from benchmarks import bench_parser as module
+    elif name == "pipeline":
+        from benchmarks import bench_pipeline as module
+    else:
+        from benchmarks import bench_gui as module
+    return module.run()
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> list:
+    """Métricas que empeoraron más que ``tolerance`` (fracción) respecto al baseline
+
+    En métricas en ms, diferencias menores a ``min_delta_ms`` se consideran ruido.
+    """
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None or not current.get("compare", True) or reference["value"] <= 0:
+            continue
+        if current["unit"] == "ms" and abs(current["value"] - reference["value"]) < min_delta_ms:
+            continue
+        ratio = current["value"] / reference["value"]
+        worse = ratio < 1 - tolerance if current["higher_is_better"] else ratio > 1 + tolerance
+        if worse:
+            regressions.append((name, reference["value"], current["value"], current["unit"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del monitor de sensores")
+    parser.add_argument("--only", nargs="+", choices=SUITES, default=SUITES, help="Suites a ejecutar")
+    parser.add_argument("--output", default="bench_output.json", help="Archivo JSON de resultados")
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline contra el cual comparar")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Empeoramiento permitido antes de marcar regresión (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5,
+                        help="Diferencia mínima en ms para marcar regresión en latencias")
+    parser.add_argument("--save-baseline", action="store_true", help="Guarda los resultados como baseline")
+    args = parser.parse_args()
+
+    results = {}
+    for suite in args.only:
+        print(f"⏱  {suite}...", file=sys.stderr)
+        results.update(run_suite(suite))
+
+    report = {
+        "meta": {
+            "time": time.time(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    width = max(len(name) for name in results)
+    for name, metric in results.items():
+        print(f"{name:<{width}}  {metric['value']:>14.3f} {metric['unit']}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Baseline guardado en {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"⚠️  Sin baseline en {args.baseline}")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+    if not regressions:
+        print(f"✅ Sin regresiones (tolerancia {args.tolerance:.0%})")
+        return
+    for name, reference, current, unit in regressions:
+        print(f"❌ Regresión {name}: {reference:.3f} → {current:.3f} {unit}")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
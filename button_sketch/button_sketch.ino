@@ -2,6 +2,12 @@
  * Multi-Sensor Sketch
  * Lee sensores y envía datos por serial
  * Formato: SENSOR,valor
+ *
+ * Modo binario opcional: si el host envía "BIN\n" después de SENSORS_READY,
+ * el sketch responde BINARY_READY, cambia a BINARY_BAUD_RATE y envía tramas
+ * COBS (delimitadas por 0x00) con layout little-endian:
+ *   id (u8) | valor0 (i16) | valor1 (i16) | millis (u32) | crc8 (u8)
+ * Los valores son ADC crudos y se envían todos los canales en cada ciclo.
  */
 
 // Pines
@@ -16,6 +22,19 @@ const int JOYSTICK_SW_PIN = 3;
 // Configuración
 const int BAUD_RATE = 9600;
 const int READ_INTERVAL = 100; // ms
+const long BINARY_BAUD_RATE = 115200;
+const int BINARY_READ_INTERVAL = 10; // ms
+
+// IDs de sensor del modo binario (iguales a SENSOR_IDS en el host)
+const uint8_t ID_BUTTON = 1;
+const uint8_t ID_POT = 2;
+const uint8_t ID_LDR = 3;
+const uint8_t ID_LM35 = 4;
+const uint8_t ID_JOYSTICK = 5;
+const uint8_t ID_JOYSTICK_BTN = 6;
+
+bool binaryMode = false;
+String command = "";
 
 // Estados previos
 int lastButtonState = -1;
@@ -61,9 +80,90 @@ void setup() {
   Serial.println("SENSORS_READY");
 }
 
+uint8_t crc8(const uint8_t *data, uint8_t len) {
+  uint8_t crc = 0;
+  for (uint8_t i = 0; i < len; i++) {
+    crc ^= data[i];
+    for (uint8_t b = 0; b < 8; b++) {
+      crc = (crc & 0x80) ? (crc << 1) ^ 0x07 : (crc << 1);
+    }
+  }
+  return crc;
+}
+
+void sendFrame(uint8_t id, int16_t raw0, int16_t raw1, unsigned long t) {
+  uint8_t frame[10];
+  frame[0] = id;
+  memcpy(frame + 1, &raw0, 2);
+  memcpy(frame + 3, &raw1, 2);
+  memcpy(frame + 5, &t, 4);
+  frame[9] = crc8(frame, 9);
+
+  // COBS: ningún bloque supera 254 bytes con tramas de 10 bytes
+  uint8_t out[12];
+  uint8_t codeIndex = 0;
+  uint8_t code = 1;
+  uint8_t n = 1;
+  for (uint8_t i = 0; i < 10; i++) {
+    if (frame[i] == 0) {
+      out[codeIndex] = code;
+      codeIndex = n++;
+      code = 1;
+    } else {
+      out[n++] = frame[i];
+      code++;
+    }
+  }
+  out[codeIndex] = code;
+  out[n++] = 0;
+  Serial.write(out, n);
+}
+
+void checkCommand() {
+  while (Serial.available() > 0) {
+    char c = Serial.read();
+    if (c == '\n') {
+      if (command == "BIN") {
+        Serial.println("BINARY_READY");
+        Serial.flush();
+        Serial.end();
+        Serial.begin(BINARY_BAUD_RATE);
+        binaryMode = true;
+      }
+      command = "";
+    } else if (command.length() < 8) {
+      command += c;
+    }
+  }
+}
+
+void sendBinary(unsigned long currentTime) {
+  sendFrame(ID_BUTTON, digitalRead(BUTTON_PIN) == LOW ? 1 : 0, 0, currentTime);
+  sendFrame(ID_POT, analogRead(POT_PIN), 0, currentTime);
+  sendFrame(ID_LDR, analogRead(LDR_PIN), 0, currentTime);
+  sendFrame(ID_LM35, analogRead(LM35_PIN), 0, currentTime);
+  sendFrame(ID_JOYSTICK,
+            analogRead(JOYSTICK_X_PIN) - joystickXOffset,
+            analogRead(JOYSTICK_Y_PIN) - joystickYOffset,
+            currentTime);
+  sendFrame(ID_JOYSTICK_BTN, digitalRead(JOYSTICK_SW_PIN) == LOW ? 1 : 0, 0, currentTime);
+}
+
 void loop() {
   unsigned long currentTime = millis();
   
+  if (!binaryMode) {
+    checkCommand();
+  }
+  
+  if (binaryMode) {
+    if (currentTime - lastReadTime >= BINARY_READ_INTERVAL) {
+      lastReadTime = currentTime;
+      sendBinary(currentTime);
+    }
+    return;
+  }
+  
   if (currentTime - lastReadTime >= READ_INTERVAL) {
     lastReadTime = currentTime;
     
@@ -0,0 +1,163 @@
+"""
+Pirámide min/max para graficar historiales largos con costo acotado por píxeles
+"""
+
+import numpy as np
+from typing import List, Tuple
+
+
+class MinMaxPyramid:
+    """Historial circular con niveles de detalle min/max
+
+    El nivel 0 guarda las muestras crudas; cada nivel ``k`` guarda el mínimo y
+    el máximo de bloques de ``2**k`` muestras. Cada nivel es un buffer del
+    doble de su capacidad donde cada valor se escribe en ``i`` y en
+    ``i + capacidad``, así la ventana cronológica es siempre una vista
+    contigua. Los niveles se actualizan por lote con NumPy, sin recorrer
+    muestra por muestra.
+    """
+
+    def __init__(self, capacity: int, min_level_size: int = 64):
+        self.capacity = capacity
+        self.count = 0  # Total de muestras recibidas
+        self.sizes: List[int] = [capacity]
+        while self.sizes[-1] // 2 >= min_level_size:
+            self.sizes.append(self.sizes[-1] // 2)
+        self.mins = [np.zeros(2 * size) for size in self.sizes]
+        # En el nivel 0 mínimo y máximo son la misma muestra
+        self.maxs = [self.mins[0]] + [np.zeros(2 * size) for size in self.sizes[1:]]
+        # Primer bloque calculado de cada nivel: un lote grande deja sin
+        # calcular bloques cuyas muestras ya salieron del nivel anterior
+        self.valid = [0] * len(self.sizes)
+        self._ages = np.arange(capacity - 1, -1, -1, dtype=np.float64)
+
+    @property
+    def levels(self) -> int:
+        return len(self.sizes)
+
+    def level_count(self, level: int) -> int:
+        """Cantidad de bloques completos del nivel"""
+        return self.count >> level
+
+    def append(self, values: np.ndarray) -> None:
+        """Agrega muestras en orden cronológico y actualiza todos los niveles"""
+        n = len(values)
+        if n == 0:
+            return
+        old_count = self.count
+        self._write(0, old_count, values, values)
+        self.count = old_count + n
+        for level in range(1, self.levels):
+            before = old_count >> level
+            after = self.count >> level
+            new = after - before
+            if new == 0:
+                break
+            # Los bloques nuevos salen de los últimos 2*new bloques del nivel
+            # anterior que siguen en su buffer
+            lower_count = after * 2
+            oldest = max(self.level_count(level - 1) - self.sizes[level - 1], self.valid[level - 1])
+            new = min(new, (lower_count - oldest) // 2)
+            if new < after - before:
+                self.valid[level] = after - new
+            if new <= 0:
+                continue
+            lows = self.window(level - 1, lower_count - 2 * new, lower_count, self.mins)
+            highs = self.window(level - 1, lower_count - 2 * new, lower_count, self.maxs)
+            self._write(level, after - new,
+                        lows.reshape(new, 2).min(axis=1),
+                        highs.reshape(new, 2).max(axis=1))
+
+    def _write(self, level: int, start: int, lows: np.ndarray, highs: np.ndarray) -> None:
+        size = self.sizes[level]
+        if len(lows) == 1:
+            # Caso típico de una muestra por tick: sin arrays temporales
+            i = start % size
+            self.mins[level][i] = self.mins[level][i + size] = lows[0]
+            self.maxs[level][i] = self.maxs[level][i + size] = highs[0]
+            return
+        if len(lows) > size:
+            start += len(lows) - size
+            lows = lows[-size:]
+            highs = highs[-size:]
+        positions = (start + np.arange(len(lows))) % size
+        for ring, block in ((self.mins[level], lows), (self.maxs[level], highs)):
+            ring[positions] = block
+            ring[positions + size] = block
+
+    def window(self, level: int, first: int, last: int, rings=None) -> np.ndarray:
+        """Vista de los bloques ``[first, last)`` de un nivel (índices absolutos)"""
+        rings = self.mins if rings is None else rings
+        size = self.sizes[level]
+        first = max(first, self.level_count(level) - size, self.valid[level])
+        if last <= first:
+            return rings[level][:0]
+        start = first % size
+        return rings[level][start:start + (last - first)]
+
+    def choose_level(self, span: float, max_points: int) -> int:
+        """Nivel más fino cuyo número de puntos en ``span`` muestras no supera ``max_points``"""
+        level = 0
+        points = span
+        while level + 1 < self.levels and points > max_points:
+            level += 1
+            points = 2 * span / (1 << level)
+        return level
+
+    def render(self, age_min: float, age_max: float, max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Puntos (antigüedad, valor) visibles entre dos antigüedades
+
+        La antigüedad 0 es la muestra más nueva. En niveles decimados cada
+        bloque aporta su mínimo y su máximo, así los picos siguen visibles.
+        """
+        total = min(self.count, self.capacity)
+        age_min = max(0, int(age_min))
+        age_max = min(total - 1, int(np.ceil(age_max)))
+        if total == 0 or age_max < age_min:
+            return np.empty(0), np.empty(0)
+        level = self.choose_level(age_max - age_min + 1, max_points)
+        # Índices absolutos de las muestras visibles
+        first = self.count - 1 - age_max
+        last = self.count - age_min
+        if level == 0:
+            ages = self._ages[self.capacity - 1 - age_max:self.capacity - age_min]
+            return ages, self.window(0, first, last)
+
+        committed = self.level_count(level)
+        end_block = min(committed, ((last - 1) >> level) + 1)
+        lows = self.window(level, first >> level, end_block, self.mins)
+        highs = self.window(level, first >> level, end_block, self.maxs)
+        block = 1 << level
+        first_block = end_block - len(lows)
+        centers = self.count - 1 - (np.arange(first_block, first_block + len(lows)) * block + (block - 1) / 2)
+        # Muestras recientes que aún no completan un bloque
+        tail_first = max(committed * block, first)
+        tail = self.window(0, tail_first, last)
+        if len(tail):
+            lows = np.append(lows, tail.min())
+            highs = np.append(highs, tail.max())
+            centers = np.append(centers, self.count - 1 - (tail_first + last - 1) / 2)
+        ages = np.repeat(centers, 2)
+        values = np.empty(2 * len(lows))
+        values[0::2] = lows
+        values[1::2] = highs
+        return ages, values
+
+
+def minmax_decimate(x: np.ndarray, y: np.ndarray, max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce una serie a pares (mín, máx) por bloque, con a lo sumo ``max_points`` puntos"""
+    n = len(y)
+    if n <= max_points:
+        return x, y
+    block = -(-n // max(1, max_points // 2))
+    blocks = -(-n // block)
+    # El último bloque (las muestras más nuevas) puede quedar incompleto:
+    # se rellena con su propio último valor para no cambiar su mín/máx
+    body = np.empty(blocks * block)
+    body[:n] = y
+    body[n:] = y[-1]
+    body = body.reshape(blocks, block)
+    values = np.empty(2 * blocks)
+    values[0::2] = body.min(axis=1)
+    values[1::2] = body.max(axis=1)
+    return np.repeat(x[::block], 2), values
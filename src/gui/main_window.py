@@ -1,21 +1,55 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout,
                              QGridLayout, QLabel)
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QFont, QCloseEvent
+from PyQt5.QtCore import Qt, QTimer, QEvent, pyqtSignal
+from PyQt5.QtGui import QFont, QCloseEvent, QKeySequence
+from PyQt5.QtWidgets import QShortcut
 from typing import Optional
+import time
+import numpy as np
 from src.gui.widgets import (
     LineGraphWidget, CircularGaugeWidget, BrightnessIndicatorWidget,
     DigitalIndicatorWidget, JoystickDisplayWidget, RotaryWidget,
-    KeyboardDisplayWidget
+    KeyboardDisplayWidget, PerformanceHudWidget, AlertBannerWidget
 )
-from src.sensors.sensor_data import SensorSimulator
-from src.sensors.arduino_serial import ArduinoSerial, SensorReading
+from src.gui.scheduler import FrameScheduler
+from src.sensors.sensor_data import SensorSimulator, KEYS
+from src.sensors.arduino_serial import ArduinoSerial
+from src.sensors.sensor_store import SensorStore, TIMESTAMP, VALUE0, VALUE1
+from src.sensors.recorder import SessionRecorder
+from src.sensors.session_query import SessionReader
+from src.sensors.latency import LatencyTracer
+from src.sensors.window_stats import WindowedStats, window_label
+from src.sensors.alerts import AlertEngine
+from src.sensors.batch_parser import READING_DTYPE, sensor_id, sensor_name
+from src.sensors.registry import ANALOG, DIGITAL, KEY, REGISTRY, SENSORS, SensorSpec, specs_of_kind
+
+# Nombre del "sensor" que agrupa los canales simulados en el planificador
+SIMULATED = "__simulated__"
+# Período de los canales simulados (ms); los reales se actualizan al llegar
+SIMULATION_INTERVAL = 100
+# Ventana (s) de las estadísticas que muestran los widgets y su período de refresco (ms)
+STATS_WINDOW = 60.0
+STATS_INTERVAL = 1000
+# Muestras de historial de cada gráfico: un valor por frame (hasta 60 por
+# segundo) son unos 4.5 minutos, y la pirámide min/max tiene 9 niveles. Sin
+# zoom se ven las últimas GRAPH_VISIBLE; alejando el zoom, el resto
+GRAPH_HISTORY = 16384
+GRAPH_VISIBLE = 100
+# Sensores digitales: cada flanco se entrega como evento, sin esperar al frame.
+# KEYPAD envía el índice de la tecla en KEYS
+DIGITAL_SENSORS = [spec.tag for spec in specs_of_kind(DIGITAL, KEY)]
 
 
 class MainWindow(QMainWindow):
     """Ventana principal de la aplicación"""
     
-    def __init__(self):
+    # Eventos digitales en orden [(sensor, valor), ...], emitidos desde el thread de lectura
+    digital_events = pyqtSignal(object)
+    # Cambios de estado de las reglas de alerta (thread de lectura o de plazos)
+    alert_events = pyqtSignal(object)
+    
+    def __init__(self, record_dir: Optional[str] = None, source: Optional[ArduinoSerial] = None,
+                 store: Optional[SensorStore] = None, alerts: Optional[AlertEngine] = None):
         super().__init__()
         self.setWindowTitle("Monitor de Actividad de Sensores Arduino Diseñado por Rodrigo Figueroa")
         self.setGeometry(100, 100, 1400, 900)
@@ -23,17 +57,40 @@ class MainWindow(QMainWindow):
         # Inicializar simulador
         self.simulator = SensorSimulator()
         
-        # Inicializar comunicación con Arduino
-        self.arduino = ArduinoSerial()
+        # Inicializar comunicación con Arduino (o una fuente compatible, ej. ReplaySource)
+        self.arduino = source if source is not None else ArduinoSerial()
         self.arduino_connected = False
-        self.button_real_value = None  # Almacenar último valor real del botón
-        self.pot_real_value = None  # Almacenar último valor real del potenciómetro
-        self.ldr_real_value = None  # Almacenar último valor real del LDR
-        self.lm35_real_value = None  # Almacenar último valor real del LM35
-        self.joystick_real_value = None  # Almacenar último valor real del joystick (x, y)
+        # Series de tiempo de cada sensor real (escribe el thread serial, o el
+        # proceso de ingesta si se pasa un SharedSensorStore de solo lectura)
+        self.store = store if store is not None else SensorStore()
+        
+        # Grabación opcional de la sesión a disco
+        self.recorder: Optional[SessionRecorder] = None
+        if record_dir:
+            self.recorder = SessionRecorder(record_dir)
+            self.recorder.start()
+            self.arduino.add_listener(self.recorder.append)
+        
+        # Estadísticas por ventana de tiempo de cada canal real (10 s, 1 min, 1 h)
+        self.stats = WindowedStats()
+        
+        # Latencia por etapa (recibida → parseada → guardada → tomada → pintada)
+        self.tracer = LatencyTracer()
+        if hasattr(self.arduino, "tracer"):
+            self.arduino.tracer = self.tracer
+        
+        # Los datos nuevos marcan sus sensores y el planificador agrupa la
+        # actualización en el siguiente frame
+        self.scheduler = FrameScheduler(self)
+        self.scheduler.frame.connect(self.render_frame)
+        # Sensores reales que ya enviaron datos (dejan de simularse)
+        self.real_seen = set()
+        # Flancos digitales: cola ordenada hacia el thread de la GUI
+        self.digital_ids = np.array([sensor_id(name) for name in DIGITAL_SENSORS], dtype=np.uint8)
+        self.digital_events.connect(self.on_digital_events, Qt.ConnectionType.QueuedConnection)
         
         # Intentar conectar a Arduino
-        self.arduino_connected = self.arduino.connect(callback=self.on_arduino_data)
+        self.arduino_connected = self.arduino.connect(batch_callback=self.store_batch)
         if self.arduino_connected:
             print("✅ Arduino conectado - usando datos reales del botón y potenciómetro")
         else:
@@ -53,19 +110,27 @@ class MainWindow(QMainWindow):
         title.setAlignment(Qt.AlignCenter)  # type: ignore
         main_layout.addWidget(title)
         
+        # Alertas activas (el motor corre en el thread de lectura, registrado por main.py)
+        self.alert_banner = AlertBannerWidget()
+        main_layout.addWidget(self.alert_banner)
+        self.alerts = alerts
+        if alerts is not None:
+            self.alert_events.connect(self.alert_banner.show_alert, Qt.ConnectionType.QueuedConnection)
+            alerts.add_sink(self.alert_events.emit)
+        
         # Grid principal (sin scroll)
         grid_layout = QGridLayout()
         grid_layout.setSpacing(8)
         grid_layout.setContentsMargins(0, 0, 0, 0)
         
         # ===== FILA 1: TEMPERATURAS Y HUMEDAD =====
-        self.lm35_graph = LineGraphWidget("Temperatura LM35", min_val=15, max_val=35)
+        self.lm35_graph = self.graph("Temperatura LM35", "LM35")
         grid_layout.addWidget(self.lm35_graph, 0, 0)
         
-        self.dht_temp_graph = LineGraphWidget("Temperatura DHT22", min_val=15, max_val=32)
+        self.dht_temp_graph = self.graph("Temperatura DHT22", "DHT_TEMP")
         grid_layout.addWidget(self.dht_temp_graph, 0, 1)
         
-        self.dht_humidity_graph = LineGraphWidget("Humedad Relativa DHT22", min_val=30, max_val=90)
+        self.dht_humidity_graph = self.graph("Humedad Relativa DHT22", "DHT_HUM")
         grid_layout.addWidget(self.dht_humidity_graph, 0, 2)
         
         # ===== FILA 2: SENSORES ANALÓGICOS =====
@@ -101,92 +166,227 @@ class MainWindow(QMainWindow):
         main_widget.setLayout(main_layout)
         self.setCentralWidget(main_widget)
         
-        # Timer para actualizar datos
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_sensors)
-        self.timer.start(100)  # Actualizar cada 100ms
-    
-    def on_arduino_data(self, reading: SensorReading):
-        """Callback cuando Arduino envía datos"""
-        if reading.name == "BUTTON":
-            # 1 = presionado, 0 = suelto
-            self.button_real_value = bool(reading.value)
-        elif reading.name == "POT":
-            # 0-100 %
-            self.pot_real_value = reading.value
-        elif reading.name == "LDR":
-            # 0-100 % de luz
-            self.ldr_real_value = reading.value
-        elif reading.name == "LM35":
-            # °C
-            self.lm35_real_value = reading.value
-        elif reading.name == "JOYSTICK":
-            # Tupla (x, y) en porcentaje
-            self.joystick_real_value = reading.value
-    
-    def update_sensors(self):
-        """Actualiza todos los sensores con datos simulados"""
-        
-        # Temperaturas
-        if self.arduino_connected and self.lm35_real_value is not None:
-            self.lm35_graph.update_value(self.lm35_real_value)
-        else:
-            lm35_data = self.simulator.get_temperature_lm35()
-            self.lm35_graph.update_value(lm35_data.value)
-        
-        dht_temp_data = self.simulator.get_dht_temperature()
-        self.dht_temp_graph.update_value(dht_temp_data.value)
-        
-        dht_humidity_data = self.simulator.get_dht_humidity()
-        self.dht_humidity_graph.update_value(dht_humidity_data.value)
+        # Overlay de rendimiento (F3)
+        self.hud = PerformanceHudWidget(main_widget)
+        self.hud_timer = QTimer()
+        self.hud_timer.timeout.connect(self.update_hud)
+        QShortcut(QKeySequence("F3"), self, self.toggle_hud)
         
-        # Sensores analógicos
-        soil_data = self.simulator.get_soil_humidity()
-        self.soil_humidity.update_value(soil_data.value)
+        # Ruteo de cada sensor declarado en el registro a su widget
+        self.real_handlers = {}
+        self.digital_handlers = {}
+        self.simulated_handlers = {}
+        for spec in SENSORS:
+            self.bind_sensor(spec)
         
-        # LDR: usar dato real si está conectado, sino simulador
-        if self.arduino_connected and self.ldr_real_value is not None:
-            self.light_indicator.update_value(self.ldr_real_value)
-        else:
-            light_data = self.simulator.get_light_ldr()
-            self.light_indicator.update_value(light_data.value)
-        
-        # Potenciómetro: usar dato real si está conectado, sino simulador
-        if self.arduino_connected and self.pot_real_value is not None:
-            self.potentiometer.update_value(self.pot_real_value)
-        else:
-            pot_data = self.simulator.get_potentiometer()
-            self.potentiometer.update_value(pot_data.value)
-        
-        # Sensores digitales
-        flame_data = self.simulator.get_flame_sensor()
-        self.flame_sensor.update_state(flame_data.state)
-        
-        tilt_data = self.simulator.get_tilt_switch()
-        self.tilt_switch.update_state(tilt_data.state)
-        
-        # Botón: usar dato real si está conectado, sino simulador
-        if self.arduino_connected and self.button_real_value is not None:
-            self.button_sensor.update_state(self.button_real_value)
-        else:
-            button_data = self.simulator.get_button()
-            self.button_sensor.update_state(button_data.state)
-        
-        # Joystick: usar dato real si está conectado, sino simulador
-        if self.arduino_connected and self.joystick_real_value is not None:
-            x, y = self.joystick_real_value
-            # Convertir de -100 a +100 a 0-100 para el widget
-            x_normalized = int((x + 100) / 2)
-            y_normalized = int((-y + 100) / 2)  # Y invertido
-            self.joystick.update_values(x_normalized, y_normalized, 0)
+        # Los canales simulados no tienen eventos: se marcan periódicamente
+        self.timer = QTimer()
+        self.timer.timeout.connect(lambda: self.scheduler.mark_dirty((SIMULATED,)))
+        self.timer.start(SIMULATION_INTERVAL)
+        self.stats_timer = QTimer()
+        self.stats_timer.timeout.connect(self.update_stats)
+        self.stats_timer.start(STATS_INTERVAL)
+        # Con un store externo (proceso de ingesta) no hay callbacks: se revisan
+        # los contadores de cada buffer una vez por frame
+        self.last_stamps = {}
+        # Último timestamp pasado a las estadísticas por sensor (solo con store compartido)
+        self.stats_stamps = {}
+        self.poll_timer = QTimer()
+        self.poll_timer.timeout.connect(self.poll_store)
+        if store is not None and self.arduino_connected:
+            self.poll_timer.start(max(1, int(self.scheduler.frame_interval * 1000)))
+    
+    @staticmethod
+    def graph(title: str, name: str) -> LineGraphWidget:
+        """Gráfico con el rango declarado del sensor en el registro"""
+        spec = REGISTRY[name]
+        return LineGraphWidget(title, min_val=spec.min_value, max_val=spec.max_value,
+                               capacity=GRAPH_HISTORY, visible=GRAPH_VISIBLE)
+    
+    def bind_sensor(self, spec: SensorSpec) -> None:
+        """Conecta un sensor a ``update_<slot>``/``push_<slot>`` de su widget
+
+        Los analógicos se muestran por frame con el último valor; los
+        digitales y teclas llegan como eventos. Sensores sin widget en esta
+        ventana solo se guardan en el store.
+        """
+        widget = getattr(self, spec.widget, None) if spec.widget else None
+        if widget is None:
+            return
+        update = getattr(widget, f"update_{spec.slot}")
+        if spec.kind == ANALOG:
+            arity = spec.arity
+            # ``update_real_<slot>`` adapta las lecturas reales (ej. el Y invertido del joystick)
+            update_real = getattr(widget, f"update_real_{spec.slot}", update)
+            self.real_handlers[spec.tag] = lambda row: update_real(*row[VALUE0:VALUE0 + arity])
         else:
-            joystick_data = self.simulator.get_joystick()
-            self.joystick.update_values(joystick_data.x, joystick_data.y, joystick_data.button)
-        
-        # Teclado
-        key = self.simulator.get_keyboard()
-        if key:
-            self.keyboard.show_key_pressed(key)
+            push = getattr(widget, f"push_{spec.slot}")
+            self.digital_handlers[spec.tag] = lambda value: push(self.event_value(spec, value))
+        if spec.simulated:
+            self.simulated_handlers[spec.tag] = (spec, update)
+    
+    @staticmethod
+    def event_value(spec: SensorSpec, value):
+        """Valor de un evento digital como lo recibe el widget (estado o tecla)"""
+        if spec.kind == KEY:
+            return KEYS[int(value) % len(KEYS)]
+        return bool(value)
+    
+    def show_history(self, name: str, start: float, end: float) -> bool:
+        """Muestra en el gráfico del sensor un rango de la sesión grabada"""
+        spec = REGISTRY.get(name)
+        graph = getattr(self, spec.widget, None) if spec and spec.widget else None
+        if not self.recorder or not hasattr(graph, "show_history"):
+            return False
+        chunk = SessionReader(self.recorder.directory).query(name, start, end)
+        graph.show_history(chunk.timestamps, chunk.value0)
+        return True
+    
+    def toggle_hud(self):
+        """Muestra u oculta el overlay de rendimiento"""
+        if self.hud.isVisible():
+            self.hud.hide()
+            self.hud_timer.stop()
+            return
+        self.update_hud()
+        self.hud.show()
+        self.hud.raise_()
+        self.hud_timer.start(500)
+    
+    def update_hud(self):
+        dropped = getattr(self.arduino, "lines_dropped", 0) + getattr(self.arduino, "frame_errors", 0)
+        self.hud.update_stats(self.tracer, dropped)
+        self.hud.move(self.centralWidget().width() - self.hud.width() - 12, 12)
+    
+    def event(self, a0) -> bool:
+        """Mide cada frame: Qt pinta los widgets pendientes al procesar UpdateRequest"""
+        if a0 is not None and a0.type() == QEvent.Type.UpdateRequest:
+            start = time.perf_counter()
+            handled = super().event(a0)
+            self.tracer.painted(time.perf_counter() - start)
+            return handled
+        return super().event(a0)
+    
+    def real_value(self, name: str):
+        """Última fila (timestamp, valor0, valor1) real de un sensor, o None"""
+        if not self.arduino_connected:
+            return None
+        row = self.store.latest(name)
+        if row is not None:
+            self.tracer.pickup(name)
+        return row
+    
+    def store_batch(self, batch):
+        """Guarda un lote (thread de lectura) y marca sus sensores para el próximo frame"""
+        self.store.append_batch(batch)
+        self.stats.append(batch)
+        digital = np.isin(batch['sensor'], self.digital_ids)
+        if digital.any():
+            rows = batch[digital]
+            self.digital_events.emit([(sensor_name(sid), value)
+                                      for sid, value in zip(rows['sensor'].tolist(), rows['value0'].tolist())])
+        self.scheduler.mark_dirty(sensor_name(int(sid)) for sid in set(batch['sensor'][~digital].tolist()))
+    
+    def on_digital_events(self, events):
+        """Aplica cada flanco en orden (thread de la GUI)"""
+        for name, value in events:
+            # Sensores registrados sin widget en esta ventana
+            handler = self.digital_handlers.get(name)
+            if handler is None:
+                continue
+            self.real_seen.add(name)
+            self.tracer.pickup(name)
+            handler(value)
+    
+    def poll_store(self):
+        """Marca los sensores cuyo buffer compartido creció desde el último frame"""
+        dirty = []
+        for name in self.real_handlers:
+            row = self.store.latest(name)
+            if row is not None and self.last_stamps.get(name) != row[TIMESTAMP]:
+                self.last_stamps[name] = row[TIMESTAMP]
+                dirty.append(name)
+        if dirty:
+            self.scheduler.mark_dirty(dirty)
+        # Los flancos digitales se leen completos para no perder pulsaciones cortas
+        events = []
+        for name in DIGITAL_SENSORS:
+            rows = self.store.since(name, self.last_stamps.get(name, 0.0))
+            if len(rows):
+                self.last_stamps[name] = rows[-1, TIMESTAMP]
+                events.extend((stamp, name, value) for stamp, value
+                              in zip(rows[:, TIMESTAMP].tolist(), rows[:, VALUE0].tolist()))
+        if events:
+            events.sort(key=lambda event: event[0])
+            self.on_digital_events([(name, value) for _, name, value in events])
+        self.poll_stats()
+    
+    def poll_stats(self):
+        """Pasa a ``WindowedStats`` las filas nuevas del buffer compartido
+
+        Con ``--ingest-process`` no hay ``batch_callback`` en este proceso: las
+        estadísticas se calculan con las filas que el proceso de ingesta dejó
+        en el store.
+        """
+        batches = []
+        for spec in SENSORS:
+            rows = self.store.since(spec.tag, self.stats_stamps.get(spec.tag, 0.0))
+            if not len(rows):
+                continue
+            self.stats_stamps[spec.tag] = rows[-1, TIMESTAMP]
+            batch = np.zeros(len(rows), dtype=READING_DTYPE)
+            batch['sensor'] = spec.id
+            batch['timestamp'] = rows[:, TIMESTAMP]
+            batch['value0'] = rows[:, VALUE0]
+            batch['value1'] = rows[:, VALUE1]
+            batches.append(batch)
+        if batches:
+            self.stats.append(np.concatenate(batches))
+    
+    def update_stats(self):
+        """Muestra las estadísticas de la ventana en los widgets que las soportan"""
+        for spec in SENSORS:
+            widget = getattr(self, spec.widget, None) if spec.widget else None
+            if hasattr(widget, "update_stats"):
+                widget.update_stats(self.stats.query(spec.tag, STATS_WINDOW), window_label(STATS_WINDOW))
+    
+    def render_frame(self, dirty):
+        """Actualiza solo los widgets cuyos datos cambiaron"""
+        tick_start = time.perf_counter()
+        self.update_real(dirty)
+        if SIMULATED in dirty:
+            self.update_simulated()
+        self.tracer.tick(time.perf_counter() - tick_start)
+    
+    def update_sensors(self):
+        """Actualiza todos los sensores (reales y simulados) sin esperar al planificador"""
+        self.render_frame(set(self.real_handlers) | {SIMULATED})
+    
+    def update_real(self, names):
+        """Muestra el último valor de cada sensor real en ``names``"""
+        for name in names:
+            handler = self.real_handlers.get(name)
+            if handler is None:
+                continue
+            row = self.real_value(name)
+            if row is not None:
+                self.real_seen.add(name)
+                handler(row)
+    
+    def update_simulated(self):
+        """Actualiza los canales simulados (y los reales que aún no enviaron datos)"""
+        for name, (spec, update) in self.simulated_handlers.items():
+            if name in self.real_seen:
+                continue
+            values = [self.simulator.current(field) for field in spec.simulated]
+            if spec.kind == KEY:
+                # -1: ninguna tecla en este paso
+                if values[0] >= 0:
+                    update(self.event_value(spec, values[0]))
+            elif spec.kind == DIGITAL:
+                update(self.event_value(spec, values[0]))
+            else:
+                update(*values)
         
         # Avanzar simulación
         self.simulator.update()
@@ -194,7 +394,14 @@ class MainWindow(QMainWindow):
     def closeEvent(self, a0: Optional[QCloseEvent]) -> None:
         """Ejecuta al cerrar la ventana"""
         self.timer.stop()
+        self.poll_timer.stop()
+        self.hud_timer.stop()
+        self.stats_timer.stop()
         if self.arduino_connected:
             self.arduino.disconnect()
+        if self.alerts:
+            self.alerts.close()
+        if self.recorder:
+            self.recorder.stop()
         if a0:
             a0.accept()
@@ -0,0 +1,60 @@
+"""
+Planificador de frames con marcas de "sucio" para la GUI
+"""
+
+import threading
+import time
+from typing import Iterable, Optional, Set
+from PyQt5.QtCore import QObject, Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QGuiApplication
+
+# Frecuencia usada si la pantalla no informa la suya
+DEFAULT_FPS = 60.0
+
+
+class FrameScheduler(QObject):
+    """Agrupa cambios en a lo sumo un frame por intervalo de pantalla
+
+    ``mark_dirty`` se puede llamar desde cualquier thread. El primer cambio
+    después de un frame agenda el siguiente (sin esperar si ya pasó un
+    intervalo completo); los cambios que llegan antes se suman al mismo
+    frame. ``frame`` se emite en el thread de la GUI con los nombres
+    cambiados. Sin cambios no hay timers activos.
+    """
+
+    frame = pyqtSignal(object)
+    _wake = pyqtSignal()
+
+    def __init__(self, parent: Optional[QObject] = None, fps: Optional[float] = None):
+        super().__init__(parent)
+        if fps is None:
+            screen = QGuiApplication.primaryScreen()
+            fps = screen.refreshRate() if screen and screen.refreshRate() > 0 else DEFAULT_FPS
+        self.frame_interval = 1.0 / fps
+        self.frames = 0
+        self._dirty: Set[str] = set()
+        self._scheduled = False
+        self._last_frame = 0.0
+        self._lock = threading.Lock()
+        self._wake.connect(self._schedule, Qt.ConnectionType.QueuedConnection)
+
+    def mark_dirty(self, names: Iterable[str]) -> None:
+        """Marca sensores con datos nuevos y agenda un frame si no hay uno pendiente"""
+        with self._lock:
+            self._dirty.update(names)
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._wake.emit()
+
+    def _schedule(self):
+        delay = self._last_frame + self.frame_interval - time.perf_counter()
+        QTimer.singleShot(max(0, int(delay * 1000)), self._run_frame)
+
+    def _run_frame(self):
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            self._scheduled = False
+        self._last_frame = time.perf_counter()
+        self.frames += 1
+        self.frame.emit(dirty)
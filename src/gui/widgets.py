@@ -1,20 +1,122 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QFrame, QGridLayout
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QColor, QPainter, QPen, QBrush, QFont, QPaintEvent
-from typing import Optional, Dict
-import pyqtgraph as pg  # type: ignore
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QGridLayout
+from PyQt5.QtCore import Qt, QTimer, QPoint
+from PyQt5.QtGui import (QColor, QPainter, QPen, QBrush, QFont, QPaintEvent, QPalette,
+                         QPixmap, QPolygon, QResizeEvent)
+from typing import Any, Callable, Deque, Optional, Dict, Tuple
 from collections import deque
+import time
+import numpy as np
+import pyqtgraph as pg  # type: ignore
+from src.gui.decimation import MinMaxPyramid, minmax_decimate
+
+# Cantidad de tonos precalculados para el gradiente de LineGraphWidget
+COLOR_BUCKETS = 64
+# Tiempo mínimo en pantalla de cada flanco digital: dos frames a 60 Hz, así una
+# pulsación más corta que un frame se alcanza a pintar. Solo se demora un
+# flanco que llega antes de que venza el anterior (ej. la liberación de un toque)
+MIN_HOLD_MS = 35
+# Flancos pendientes antes de descartar pares viejos (rebotes); los descartados
+# se cuentan y se muestran en el widget (la grabación y el store los tienen todos)
+MAX_PENDING_EDGES = 16
+
+
+class DroppedEdgesLabel(QLabel):
+    """Aviso oculto hasta que un ``HoldQueue`` descarta flancos"""
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setFont(QFont("Arial", 8))
+        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.setStyleSheet("color: #b26a00;")
+        self.hide()
+
+    def show_count(self, dropped: int) -> None:
+        self.setText(f"{dropped} flancos sin mostrar")
+        self.show()
+
+
+def line_gradient_color(normalized: float) -> Tuple[int, int, int]:
+    """Color azul-verde-rojo de LineGraphWidget para un valor normalizado 0-1"""
+    if normalized < 0.5:
+        r = int(0 + normalized * 2 * 255)
+        g = int(100 + normalized * 2 * 100)
+        b = 255
+    else:
+        r = int((normalized - 0.5) * 2 * 255)
+        g = int(200 - (normalized - 0.5) * 2 * 200)
+        b = int(255 - (normalized - 0.5) * 2 * 255)
+    return r, g, b
+
+
+class HoldQueue:
+    """Aplica estados en orden, cada uno visible al menos ``min_hold_ms``
+
+    Un flanco que llega mientras otro está en pantalla espera su turno, así
+    una pulsación y su liberación dentro del mismo frame se ven ambas. Si se
+    acumulan más de ``MAX_PENDING_EDGES`` se descartan los pares más viejos
+    (el estado final no cambia); ``dropped`` los cuenta y ``on_drop`` recibe
+    el total.
+    """
+
+    def __init__(self, apply: Callable[[Any], None], min_hold_ms: int = MIN_HOLD_MS,
+                 on_drop: Optional[Callable[[int], None]] = None):
+        self.apply = apply
+        self.min_hold_ms = min_hold_ms
+        self.on_drop = on_drop
+        self.pending: Deque[Any] = deque()
+        self.holding = False
+        self.edges = 0
+        self.dropped = 0
+
+    def push(self, state: Any) -> None:
+        self.edges += 1
+        self.pending.append(state)
+        if len(self.pending) > MAX_PENDING_EDGES:
+            while len(self.pending) > MAX_PENDING_EDGES:
+                self.pending.popleft()
+                self.pending.popleft()
+                self.dropped += 2
+            if self.on_drop:
+                self.on_drop(self.dropped)
+        if not self.holding:
+            self._advance()
+
+    def _advance(self) -> None:
+        if not self.pending:
+            self.holding = False
+            return
+        self.apply(self.pending.popleft())
+        self.holding = True
+        QTimer.singleShot(self.min_hold_ms, self._advance)
 
 
 class LineGraphWidget(QWidget):
-    """Widget para gráfico de línea en tiempo real con escala de colores"""
+    """Widget para gráfico de línea en tiempo real con escala de colores
+
+    Los puntos viven en una ``MinMaxPyramid`` de ``capacity`` muestras: con
+    historiales cortos se grafica el nivel crudo como vista sin copiar; con
+    historiales largos se elige el nivel min/max según el ancho en píxeles y
+    el zoom actual. Sin zoom se muestran las últimas ``visible`` muestras
+    (por defecto todo el historial); al alejar el zoom aparece el resto. Los
+    pens y estilos del gradiente se precalculan por tono.
+    """
     
-    def __init__(self, title: str, min_val: float = 0, max_val: float = 100, parent: Optional[QWidget] = None):
+    def __init__(self, title: str, min_val: float = 0, max_val: float = 100, parent: Optional[QWidget] = None,
+                 capacity: int = 100, visible: Optional[int] = None):
         super().__init__(parent)
         self.title = title
         self.min_val = min_val
         self.max_val = max_val
-        self.data_points: deque[float] = deque(maxlen=100)
+        self.capacity = capacity
+        self.visible = min(capacity, visible or capacity)
+        # Eje x como antigüedad en muestras: el punto más nuevo queda en x = 0
+        self.history = MinMaxPyramid(capacity)
+        self._single = np.zeros(1)
+        self.frozen = False  # True mientras se muestra un rango grabado
+        colors = [line_gradient_color(i / (COLOR_BUCKETS - 1)) for i in range(COLOR_BUCKETS)]
+        self._pens = [pg.mkPen(color, width=2) for color in colors]
+        self._styles = [f"color: rgb({r},{g},{b}); font-weight: bold;" for r, g, b in colors]
+        self._bucket = -1
         
         layout = QVBoxLayout()
         layout.setContentsMargins(6, 6, 6, 6)
@@ -33,6 +135,7 @@ class LineGraphWidget(QWidget):
         self.plot_widget.setMinimumHeight(140)
         
         self.curve: pg.PlotDataItem = self.plot_widget.plot(pen=pg.mkPen('b', width=2))  # type: ignore
+        self.plot_widget.getViewBox().sigXRangeChanged.connect(self._render_curve)  # type: ignore
         layout.addWidget(self.plot_widget)
         
         self.value_label = QLabel("Valor: --")
@@ -40,82 +143,168 @@ class LineGraphWidget(QWidget):
         self.value_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.value_label)
         
+        self.stats_label = QLabel("")
+        self.stats_label.setFont(QFont("Arial", 8))
+        self.stats_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.stats_label.hide()
+        layout.addWidget(self.stats_label)
+        
         self.setLayout(layout)
     
     def update_value(self, value: float) -> None:
         """Actualiza con nuevo valor"""
         value = max(self.min_val, min(self.max_val, value))
-        self.data_points.append(value)
+        self._single[0] = value
+        self.history.append(self._single)
+        self._redraw(value)
+    
+    def update_values(self, values: np.ndarray) -> None:
+        """Agrega varios valores (en orden cronológico) y redibuja una sola vez"""
+        if not len(values):
+            return
+        values = np.clip(values, self.min_val, self.max_val)
+        self.history.append(values)
+        self._redraw(float(values[-1]))
+    
+    def update_stats(self, stats: Optional[Dict[str, float]], label: str) -> None:
+        """Muestra min/media/max/p99 de una ventana (``WindowedStats.query``); None la oculta"""
+        if stats is None:
+            self.stats_label.hide()
+            return
+        self.stats_label.setText(f"{label}: min {stats['min']:.1f} · media {stats['mean']:.1f} · "
+                                 f"máx {stats['max']:.1f} · p99 {stats['p99']:.1f}")
+        self.stats_label.show()
+    
+    def show_history(self, timestamps: np.ndarray, values: np.ndarray) -> None:
+        """Muestra un rango grabado (eje x en segundos desde su inicio)
+
+        Los valores en vivo se siguen acumulando; ``follow_live`` vuelve a
+        mostrarlos.
+        """
+        self.frozen = True
+        if not len(values):
+            self.curve.setData([], [])  # type: ignore
+            self.value_label.setText("Historial: sin datos")
+            return
+        view = self.plot_widget.getViewBox()  # type: ignore
+        x, y = minmax_decimate(timestamps - timestamps[0], values, 2 * (int(view.width()) or 800))
+        self.curve.setData(x, y)  # type: ignore
+        start = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamps[0]))
+        end = time.strftime("%H:%M:%S", time.localtime(timestamps[-1]))
+        self.value_label.setText(f"Historial: {start} – {end}")
+    
+    def follow_live(self) -> None:
+        """Vuelve a graficar los datos en vivo"""
+        self.frozen = False
+        self._render_curve()
+    
+    def _render_curve(self) -> None:
+        """Grafica el nivel de detalle adecuado para el rango visible"""
+        if self.frozen:
+            return
+        view = self.plot_widget.getViewBox()  # type: ignore
+        if view.autoRangeEnabled()[0]:
+            age_min, age_max = 0.0, float(self.visible - 1)
+        else:
+            age_min, age_max = view.viewRange()[0]
+        # Dos puntos (mín y máx) por píxel bastan para no perder picos
+        max_points = 2 * (int(view.width()) or 800)
+        ages, values = self.history.render(age_min, age_max, max_points)
+        self.curve.setData(ages, values)  # type: ignore
+    
+    def _redraw(self, value: float) -> None:
+        if self.frozen:
+            return
+        self._render_curve()
         
         normalized = (value - self.min_val) / (self.max_val - self.min_val)
         normalized = max(0, min(1, normalized))
-        
-        if normalized < 0.5:
-            r = int(0 + normalized * 2 * 255)
-            g = int(100 + normalized * 2 * 100)
-            b = 255
-        else:
-            r = int((normalized - 0.5) * 2 * 255)
-            g = int(200 - (normalized - 0.5) * 2 * 200)
-            b = int(255 - (normalized - 0.5) * 2 * 255)
-        
-        color_tuple = (r, g, b)
-        self.curve.setPen(pg.mkPen(color_tuple, width=2))  # type: ignore
-        
-        data_reversed: list[float] = list(reversed(self.data_points))
-        self.curve.setData(data_reversed)  # type: ignore
+        bucket = int(normalized * (COLOR_BUCKETS - 1) + 0.5)
+        if bucket != self._bucket:
+            # Solo se cambia pen y stylesheet cuando cambia el tono
+            self._bucket = bucket
+            self.curve.setPen(self._pens[bucket])  # type: ignore
+            self.value_label.setStyleSheet(self._styles[bucket])
         
         self.value_label.setText(f"Valor: {value:.2f}")
-        self.value_label.setStyleSheet(f"color: rgb({r},{g},{b}); font-weight: bold;")
 
 
-class SoilBarWidget(QWidget):
-    """Widget interno para pintar la barra de humedad"""
+def bar_fill_color(normalized: float) -> QColor:
+    """Color azul-verde-rojo del relleno de las barras verticales"""
+    if normalized < 0.5:
+        r = int(normalized * 2 * 255)
+        g = 200
+        b = int(255 - normalized * 2 * 255)
+    else:
+        r = 255
+        g = int(200 - (normalized - 0.5) * 2 * 200)
+        b = 0
+    return QColor(r, g, b)
+
+
+class CachedBarWidget(QWidget):
+    """Barra vertical con el fondo y el borde cacheados en un ``QPixmap``
+
+    La capa estática se dibuja una vez por tamaño; cada ``paintEvent`` solo
+    copia el pixmap y pinta el relleno. El relleno queda 2 px dentro del
+    borde, así el borde puede ir en la misma capa estática.
+    """
 
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         super().__init__(parent)
         self.setMinimumSize(80, 140)
+        self._static: Optional[QPixmap] = None
 
-    def paintEvent(self, a0: Optional[QPaintEvent]) -> None:
-        parent = self.parent()
-        value = getattr(parent, "value", 0)
-
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)  # type: ignore
-
-        w = self.width()
-        h = self.height()
+    def _bar_rect(self) -> Tuple[int, int, int, int]:
         padding = 6
-        bar_width = max(20, w - padding * 2)
-        bar_height = max(40, h - padding * 2)
-        bar_x = (w - bar_width) // 2
-        bar_y = (h - bar_height) // 2
-
+        bar_width = max(20, self.width() - padding * 2)
+        bar_height = max(40, self.height() - padding * 2)
+        return (self.width() - bar_width) // 2, (self.height() - bar_height) // 2, bar_width, bar_height
+
+    def resizeEvent(self, a0: Optional[QResizeEvent]) -> None:
+        self._static = None
+        super().resizeEvent(a0)
+
+    def _static_layer(self) -> QPixmap:
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)  # type: ignore
+        bar_x, bar_y, bar_width, bar_height = self._bar_rect()
         painter.setBrush(QBrush(QColor(230, 230, 230)))
-        painter.setPen(QPen(QColor(150, 150, 150), 1))
+        painter.setPen(QPen(QColor(0, 0, 0), 1))
         painter.drawRoundedRect(bar_x, bar_y, bar_width, bar_height, 6, 6)
+        painter.end()
+        return pixmap
 
-        fill_height = int(bar_height * (value / 100))
-        fill_y = bar_y + (bar_height - fill_height)
+    def normalized(self) -> float:
+        """Nivel de relleno entre 0 y 1"""
+        return 0.0
 
-        normalized = value / 100
-        if normalized < 0.5:
-            r = int(normalized * 2 * 255)
-            g = 200
-            b = int(255 - normalized * 2 * 255)
-        else:
-            r = 255
-            g = int(200 - (normalized - 0.5) * 2 * 200)
-            b = 0
+    def paintEvent(self, a0: Optional[QPaintEvent]) -> None:
+        if self._static is None:
+            self._static = self._static_layer()
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._static)
 
-        painter.setBrush(QBrush(QColor(r, g, b)))
-        painter.setPen(Qt.PenStyle.NoPen)  # type: ignore
+        normalized = self.normalized()
+        bar_x, bar_y, bar_width, bar_height = self._bar_rect()
+        fill_height = int(bar_height * normalized)
         if fill_height > 0:
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)  # type: ignore
+            painter.setBrush(QBrush(bar_fill_color(normalized)))
+            painter.setPen(Qt.PenStyle.NoPen)  # type: ignore
+            fill_y = bar_y + (bar_height - fill_height)
             painter.drawRoundedRect(bar_x + 2, fill_y + 2, bar_width - 4, fill_height - 4, 4, 4)
 
-        painter.setPen(QPen(QColor(0, 0, 0), 1))
-        painter.setBrush(Qt.BrushStyle.NoBrush)  # type: ignore
-        painter.drawRoundedRect(bar_x, bar_y, bar_width, bar_height, 6, 6)
+
+class SoilBarWidget(CachedBarWidget):
+    """Widget interno para pintar la barra de humedad"""
+
+    def normalized(self) -> float:
+        return getattr(self.parent(), "value", 0) / 100
 
 
 class CircularGaugeWidget(QWidget):
@@ -154,57 +343,20 @@ class CircularGaugeWidget(QWidget):
         super().paintEvent(a0)
 
 
-class VerticalBarWidget(QWidget):
+class VerticalBarWidget(CachedBarWidget):
     """Widget interno para pintar una barra vertical"""
 
     def __init__(self, parent: Optional[QWidget] = None, min_value: float = 0, max_value: float = 100) -> None:
         super().__init__(parent)
         self.min_value = min_value
         self.max_value = max_value
-        self.setMinimumSize(80, 140)
 
-    def paintEvent(self, a0: Optional[QPaintEvent]) -> None:
-        parent = self.parent()
-        value = getattr(parent, "value", 0)
+    def normalized(self) -> float:
+        value = getattr(self.parent(), "value", 0)
         value = max(self.min_value, min(self.max_value, value))
-
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)  # type: ignore
-
-        w = self.width()
-        h = self.height()
-        padding = 6
-        bar_width = max(20, w - padding * 2)
-        bar_height = max(40, h - padding * 2)
-        bar_x = (w - bar_width) // 2
-        bar_y = (h - bar_height) // 2
-
-        painter.setBrush(QBrush(QColor(230, 230, 230)))
-        painter.setPen(QPen(QColor(150, 150, 150), 1))
-        painter.drawRoundedRect(bar_x, bar_y, bar_width, bar_height, 6, 6)
-
-        normalized = 0 if self.max_value == self.min_value else (value - self.min_value) / (self.max_value - self.min_value)
-        normalized = max(0, min(1, normalized))
-        fill_height = int(bar_height * normalized)
-        fill_y = bar_y + (bar_height - fill_height)
-
-        if normalized < 0.5:
-            r = int(normalized * 2 * 255)
-            g = 200
-            b = int(255 - normalized * 2 * 255)
-        else:
-            r = 255
-            g = int(200 - (normalized - 0.5) * 2 * 200)
-            b = 0
-
-        painter.setBrush(QBrush(QColor(r, g, b)))
-        painter.setPen(Qt.PenStyle.NoPen)  # type: ignore
-        if fill_height > 0:
-            painter.drawRoundedRect(bar_x + 2, fill_y + 2, bar_width - 4, fill_height - 4, 4, 4)
-
-        painter.setPen(QPen(QColor(0, 0, 0), 1))
-        painter.setBrush(Qt.BrushStyle.NoBrush)  # type: ignore
-        painter.drawRoundedRect(bar_x, bar_y, bar_width, bar_height, 6, 6)
+        if self.max_value == self.min_value:
+            return 0.0
+        return max(0, min(1, (value - self.min_value) / (self.max_value - self.min_value)))
 
 
 class BrightnessIndicatorWidget(QWidget):
@@ -241,6 +393,25 @@ class BrightnessIndicatorWidget(QWidget):
         self.brightness_display.update()
 
 
+class IndicatorLampWidget(QWidget):
+    """Lámpara pintada de ``DigitalIndicatorWidget`` (verde encendida, roja apagada)"""
+
+    BRUSHES = {True: QBrush(QColor("green")), False: QBrush(QColor("red"))}
+    PENS = {True: QPen(QColor("darkgreen"), 3), False: QPen(QColor("darkred"), 3)}
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.state = False
+        self.setMinimumSize(70, 70)
+
+    def paintEvent(self, a0: Optional[QPaintEvent]) -> None:
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)  # type: ignore
+        painter.setBrush(self.BRUSHES[self.state])
+        painter.setPen(self.PENS[self.state])
+        painter.drawRoundedRect(self.rect().adjusted(2, 2, -2, -2), 10, 10)
+
+
 class DigitalIndicatorWidget(QWidget):
     """Widget para indicadores digitales (encendido/apagado)"""
     
@@ -248,6 +419,8 @@ class DigitalIndicatorWidget(QWidget):
         super().__init__(parent)
         self.title = title
         self.state = False
+        self.dropped_label = DroppedEdgesLabel()
+        self.edges = HoldQueue(self.update_state, on_drop=self.dropped_label.show_count)
         
         layout = QVBoxLayout()
         layout.setContentsMargins(6, 6, 6, 6)
@@ -256,46 +429,63 @@ class DigitalIndicatorWidget(QWidget):
         title_label.setFont(QFont("Arial", 10, QFont.Weight.Bold))
         layout.addWidget(title_label)
         
-        self.indicator = QFrame()
-        self.indicator.setMinimumSize(70, 70)
-        self.indicator.setStyleSheet("background-color: red; border: 3px solid darkred; border-radius: 10px;")
+        self.indicator = IndicatorLampWidget()
         layout.addWidget(self.indicator)
         
         self.state_label = QLabel("DESACTIVADO")
         self.state_label.setFont(QFont("Arial", 9, QFont.Weight.Bold))
         self.state_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        # Paletas precalculadas en vez de setStyleSheet en cada cambio
+        self._palettes = {}
+        for state, color in ((True, "green"), (False, "red")):
+            palette = QPalette(self.state_label.palette())
+            palette.setColor(QPalette.ColorRole.WindowText, QColor(color))
+            self._palettes[state] = palette
+        self.state_label.setPalette(self._palettes[False])
         layout.addWidget(self.state_label)
+        layout.addWidget(self.dropped_label)
         
         self.setLayout(layout)
     
+    def push_state(self, state: bool) -> None:
+        """Flanco de un evento digital: se muestra en orden y al menos ``MIN_HOLD_MS``"""
+        self.edges.push(state)
+    
     def update_state(self, state: bool) -> None:
         """Actualiza estado (True = verde, False = rojo)"""
+        state = bool(state)
+        if state == self.state:
+            return
         self.state = state
-        if state:
-            self.indicator.setStyleSheet("background-color: green; border: 3px solid darkgreen; border-radius: 10px;")
-            self.state_label.setText("ACTIVADO")
-            self.state_label.setStyleSheet("color: green; font-weight: bold;")
-        else:
-            self.indicator.setStyleSheet("background-color: red; border: 3px solid darkred; border-radius: 10px;")
-            self.state_label.setText("DESACTIVADO")
-            self.state_label.setStyleSheet("color: red; font-weight: bold;")
+        self.indicator.state = state
+        self.indicator.update()
+        self.state_label.setText("ACTIVADO" if state else "DESACTIVADO")
+        self.state_label.setPalette(self._palettes[state])
 
 
 class JoystickCanvasWidget(QWidget):
-    """Widget interno para pintar el joystick"""
+    """Widget interno para pintar el joystick
+
+    Los ejes y las marcas de la grilla se cachean en un ``QPixmap`` por
+    tamaño; cada ``paintEvent`` solo pinta el punto.
+    """
 
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         super().__init__(parent)
         self.setMinimumSize(160, 160)
         self.setStyleSheet("background-color: white; border: 2px solid black;")
-
-    def paintEvent(self, a0: Optional[QPaintEvent]) -> None:
-        parent = self.parent()
-        x = getattr(parent, "joy_x", 0)
-        y = getattr(parent, "joy_y", 0)
-        button_pressed = getattr(parent, "button_pressed", False)
-
-        painter = QPainter(self)
+        self._static: Optional[QPixmap] = None
+
+    def resizeEvent(self, a0: Optional[QResizeEvent]) -> None:
+        self._static = None
+        super().resizeEvent(a0)
+
+    def _static_layer(self) -> QPixmap:
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)  # type: ignore
 
         w = self.width()
@@ -308,14 +498,30 @@ class JoystickCanvasWidget(QWidget):
         painter.drawLine(center_x, 0, center_x, h)
 
         painter.setPen(QPen(QColor(200, 200, 200), 0.5))
+        ticks = []
         for i in range(-100, 101, 20):
-            pixel_x = center_x + (i / 100) * (w / 2)
-            pixel_y = center_y - (i / 100) * (h / 2)
-            painter.drawPoint(int(pixel_x), center_y)
-            painter.drawPoint(center_x, int(pixel_y))
+            ticks.append(QPoint(int(center_x + (i / 100) * (w / 2)), center_y))
+            ticks.append(QPoint(center_x, int(center_y - (i / 100) * (h / 2))))
+        painter.drawPoints(QPolygon(ticks))
+        painter.end()
+        return pixmap
 
-        pixel_x = center_x + (x / 100) * (w / 2 - 10)
-        pixel_y = center_y - (y / 100) * (h / 2 - 10)
+    def paintEvent(self, a0: Optional[QPaintEvent]) -> None:
+        parent = self.parent()
+        x = getattr(parent, "joy_x", 0)
+        y = getattr(parent, "joy_y", 0)
+        button_pressed = getattr(parent, "button_pressed", False)
+
+        if self._static is None:
+            self._static = self._static_layer()
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._static)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)  # type: ignore
+
+        w = self.width()
+        h = self.height()
+        pixel_x = w // 2 + (x / 100) * (w / 2 - 10)
+        pixel_y = h // 2 - (y / 100) * (h / 2 - 10)
 
         color = QColor(0, 150, 255) if button_pressed else QColor(100, 100, 100)
         painter.setBrush(QBrush(color))
@@ -332,6 +538,8 @@ class JoystickDisplayWidget(QWidget):
         self.joy_x: float = 0
         self.joy_y: float = 0
         self.button_pressed = False
+        self.dropped_label = DroppedEdgesLabel()
+        self.button_edges = HoldQueue(self.update_button, on_drop=self.dropped_label.show_count)
         
         layout = QVBoxLayout()
         layout.setContentsMargins(6, 6, 6, 6)
@@ -347,6 +555,7 @@ class JoystickDisplayWidget(QWidget):
         self.values_label.setFont(QFont("Arial", 9))
         self.values_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.values_label)
+        layout.addWidget(self.dropped_label)
         
         self.setLayout(layout)
     
@@ -359,6 +568,22 @@ class JoystickDisplayWidget(QWidget):
         button_text = "PRESIONADO" if button else "LIBRE"
         self.values_label.setText(f"X: {self.joy_x:.0f}  Y: {self.joy_y:.0f}  Botón: {button_text}")
         self.joystick_display.update()
+    
+    def update_position(self, x: float, y: float) -> None:
+        """Mueve el punto (x,y: -100 a 100) sin cambiar el botón"""
+        self.update_values(x, y, self.button_pressed)
+    
+    def update_real_position(self, x: float, y: float) -> None:
+        """Lectura del módulo real: su eje Y crece hacia abajo (Y invertido)"""
+        self.update_position(x, -y)
+    
+    def push_button(self, pressed: bool) -> None:
+        """Flanco del botón del joystick: se muestra en orden y al menos ``MIN_HOLD_MS``"""
+        self.button_edges.push(pressed)
+    
+    def update_button(self, pressed: bool) -> None:
+        """Actualiza solo el botón, sin mover la posición"""
+        self.update_values(self.joy_x, self.joy_y, pressed)
 
 
 class RotaryWidget(QWidget):
@@ -402,6 +627,8 @@ class KeyboardDisplayWidget(QWidget):
         super().__init__(parent)
         self.title = title
         self.last_key: Optional[str] = None
+        self.dropped_label = DroppedEdgesLabel()
+        self.key_edges = HoldQueue(self.show_key_pressed, on_drop=self.dropped_label.show_count)
         
         layout = QVBoxLayout()
         layout.setContentsMargins(6, 6, 6, 6)
@@ -436,9 +663,18 @@ class KeyboardDisplayWidget(QWidget):
         self.pressed_label.setFont(QFont("Arial", 9, QFont.Weight.Bold))
         self.pressed_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(self.pressed_label)
+        layout.addWidget(self.dropped_label)
         
         self.setLayout(layout)
     
+    def push_key(self, key: str) -> None:
+        """Tecla de un evento: cada una se resalta en orden al menos ``MIN_HOLD_MS``"""
+        self.key_edges.push(key)
+    
+    def update_key(self, key: str) -> None:
+        """Muestra una tecla muestreada (simulador), sin cola de flancos"""
+        self.show_key_pressed(key)
+    
     def show_key_pressed(self, key: str) -> None:
         """Resalta tecla presionada"""
         if self.last_key and self.last_key in self.key_buttons:
@@ -447,4 +683,54 @@ class KeyboardDisplayWidget(QWidget):
         if key in self.key_buttons:
             self.key_buttons[key].setStyleSheet("background-color: yellow; border: 2px solid orange; font-weight: bold;")
             self.last_key = key
-            self.pressed_label.setText(f"Última tecla: {key}")
\ No newline at end of file
+            self.pressed_label.setText(f"Última tecla: {key}")
+
+class PerformanceHudWidget(QLabel):
+    """Overlay semitransparente con latencias, ingesta y costo de frame"""
+    
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setFont(QFont("Courier", 9))
+        self.setStyleSheet("background-color: rgba(0, 0, 0, 180); color: white; padding: 6px; border-radius: 6px;")
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.hide()
+    
+    def update_stats(self, tracer, dropped: int) -> None:
+        """Muestra p50/p99 de latencia total por sensor, lecturas/s, descartes y frame"""
+        lines = [
+            f"Ingesta     {tracer.rate():8.0f} lect/s",
+            f"Descartadas {dropped:8d}",
+            f"Tick        {tracer.ticks.percentile(50) * 1000:6.2f} / {tracer.ticks.percentile(99) * 1000:6.2f} ms",
+            f"Pintado     {tracer.frames.percentile(50) * 1000:6.2f} / {tracer.frames.percentile(99) * 1000:6.2f} ms",
+            "Sensor        p50 ms   p99 ms",
+        ]
+        for name, stats in sorted(tracer.summary().items()):
+            if stats['total_p50_ms'] != stats['total_p50_ms']:
+                continue  # Sensor sin widget en pantalla
+            lines.append(f"{name:<12} {stats['total_p50_ms']:7.1f}  {stats['total_p99_ms']:7.1f}")
+        self.setText("\n".join(lines))
+        self.adjustSize()
+
+class AlertBannerWidget(QLabel):
+    """Franja con las alertas activas; se oculta cuando no queda ninguna"""
+    
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        font = QFont("Arial", 11)
+        font.setBold(True)
+        self.setFont(font)
+        self.setAlignment(Qt.AlignCenter)  # type: ignore
+        self.setStyleSheet("background-color: #c62828; color: white; padding: 4px; border-radius: 4px;")
+        self.active: Dict[Tuple[str, int], str] = {}
+        self.hide()
+    
+    def show_alert(self, alert: Any) -> None:
+        """Agrega o quita un ``Alert`` de ``src.sensors.alerts`` según su estado"""
+        key = (alert.rule, alert.device)
+        if alert.active:
+            board = f" (placa {alert.device})" if alert.device else ""
+            self.active[key] = f"{alert.rule}{board}: {alert.value:g}"
+        else:
+            self.active.pop(key, None)
+        self.setText("🚨 " + "   |   ".join(self.active.values()))
+        self.setVisible(bool(self.active))
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Ingesta sin interfaz gráfica - para nodos de recolección sin pantalla
+
+No importa PyQt5 ni pyqtgraph. Lee del Arduino, del simulador o de una
+sesión grabada y entrega los lotes a la grabación, a stdout (JSON Lines) o a
+un socket Unix local.
+
+Uso::
+
+    python3 src/headless.py --record sesiones/nodo1
+    python3 src/headless.py --simulate --stdout | head
+    python3 src/headless.py --socket /tmp/sensores.sock
+    python3 src/headless.py --multi --record sesiones/todas
+    python3 src/headless.py --simulate --stats 10 --record sesiones/nodo1
+    python3 src/headless.py --alert "LM35>30/28" --alert "FLAME==1 for 200ms"
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+# Agregar el directorio padre al path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.sensors.alerts import AlertEngine, LogAlertSink, SocketAlertSink
+from src.sensors.arduino_serial import ArduinoSerial
+from src.sensors.multi_device import MultiArduinoSerial
+from src.sensors.recorder import SessionRecorder
+from src.sensors.replay import ReplaySource
+from src.sensors.simulator_source import SimulatorSource
+from src.sensors.sinks import JsonLinesSink, SocketSink
+from src.sensors.window_stats import DEFAULT_WINDOWS, WindowedStats, window_label
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Ingesta de sensores Arduino sin interfaz gráfica")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--simulate", action="store_true", help="Usar el simulador en vez del Arduino")
+    source.add_argument("--replay", metavar="DIR", help="Reproduce una sesión grabada")
+    source.add_argument("--multi", action="store_true",
+                        help="Leer todas las placas detectadas (o las de --port, separadas por comas)")
+    parser.add_argument("--port", help="Puerto serial fijo (ej. el pty del emulador)")
+    parser.add_argument("--binary", action="store_true", help="Negociar el protocolo binario")
+    parser.add_argument("--rate", type=float, default=10.0, help="Pasos por segundo del simulador")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Velocidad de reproducción (1 = tiempo real, 0 = lo más rápido posible)")
+    parser.add_argument("--record", metavar="DIR", help="Graba la sesión en DIR")
+    parser.add_argument("--stdout", action="store_true", help="Escribe las lecturas en stdout como JSON Lines")
+    parser.add_argument("--socket", metavar="PATH", help="Publica JSON Lines en un socket Unix")
+    parser.add_argument("--duration", type=float, help="Segundos antes de terminar (por defecto sin límite)")
+    parser.add_argument("--stats", type=float, metavar="SEG",
+                        help="Imprime estadísticas por ventana de cada canal cada SEG segundos")
+    parser.add_argument("--stats-windows", default=",".join(f"{w:g}" for w in DEFAULT_WINDOWS),
+                        help="Ventanas en segundos, separadas por comas (por defecto %(default)s)")
+    parser.add_argument("--alert", action="append", default=[], metavar="REGLA",
+                        help="Regla de alerta: LM35>30, LM35>30/28 (histéresis), LM35 rate>2, "
+                             "FLAME==1 for 200ms, POT z>3. Repetible")
+    parser.add_argument("--alert-socket", metavar="PATH", help="Publica las alertas (JSON Lines) en un socket Unix")
+    return parser
+
+
+def print_stats(stats: WindowedStats):
+    """Una línea por canal y ventana: cantidad, media, desvío, extremos y percentiles"""
+    for window in stats.windows:
+        for name, s in stats.summary(window).items():
+            print(f"📊 {window_label(window):>6} {name:<14} n={s['count']:<7} media={s['mean']:.2f} "
+                  f"σ={s['std']:.2f} min={s['min']:.2f} máx={s['max']:.2f} "
+                  f"p50={s['p50']:.2f} p99={s['p99']:.2f}")
+
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+    if not (args.record or args.stdout or args.socket or args.alert):
+        print("❌ Indica al menos una salida: --record, --stdout, --socket o --alert", file=sys.stderr)
+        sys.exit(2)
+    try:
+        alerts = AlertEngine.from_specs(args.alert) if args.alert else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.simulate:
+        source = SimulatorSource(rate=args.rate)
+    elif args.multi:
+        ports = args.port.split(",") if args.port else None
+        source = MultiArduinoSerial(ports=ports, binary=args.binary)
+    elif args.replay:
+        source = ReplaySource(args.replay, speed=args.speed)
+    else:
+        source = ArduinoSerial(port=args.port, binary=args.binary)
+
+    stdout = sys.stdout
+    recorder = SessionRecorder(args.record) if args.record else None
+    socket_sink = SocketSink(args.socket) if args.socket else None
+    # Con --stdout los mensajes de estado van a stderr para no mezclarse con los datos
+    with contextlib.redirect_stdout(sys.stderr if args.stdout else stdout):
+        if recorder:
+            source.add_listener(recorder.append)
+            recorder.start()
+        if args.stdout:
+            source.add_listener(JsonLinesSink(stdout))
+        if socket_sink:
+            source.add_listener(socket_sink)
+            print(f"✅ Socket en {args.socket}")
+
+        if alerts:
+            # Va a stdout, o a stderr si --stdout lleva los datos
+            alerts.add_sink(LogAlertSink())
+            if args.alert_socket:
+                alerts.add_sink(SocketAlertSink(args.alert_socket))
+                print(f"✅ Alertas en {args.alert_socket}")
+            source.add_listener(alerts)
+
+        stats = None
+        if args.stats:
+            stats = WindowedStats(float(w) for w in args.stats_windows.split(","))
+            source.add_listener(stats)
+
+        connected = source.connect()
+        try:
+            deadline = time.monotonic() + args.duration if args.duration else None
+            next_stats = time.monotonic() + args.stats if stats else None
+            while connected and source.running:
+                if deadline and time.monotonic() >= deadline:
+                    break
+                if next_stats and time.monotonic() >= next_stats:
+                    print_stats(stats)
+                    next_stats += args.stats
+                time.sleep(0.2)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if connected:
+                source.disconnect()
+            if isinstance(source, MultiArduinoSerial):
+                for stats in source.stats():
+                    print(f"   placa {stats['device']} {stats['port']}: {stats['readings']} lecturas, "
+                          f"{stats['frame_errors']} tramas inválidas, {stats['disconnects']} desconexiones")
+            if recorder:
+                recorder.stop()
+                print(f"✅ {recorder.rows_written} lecturas grabadas en {args.record}")
+            if socket_sink:
+                socket_sink.close()
+            if alerts:
+                alerts.close()
+                print(f"✅ {alerts.alerts_fired} alertas disparadas")
+    sys.exit(0 if connected else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,19 +3,77 @@
 Aplicación principal - Monitor de sensores Arduino
 """
 
+import argparse
 import sys
 import os
 
 # Agregar el directorio padre al path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from PyQt5.QtWidgets import QApplication
-from src.gui.main_window import MainWindow
+from src.sensors.alerts import AlertEngine, LogAlertSink, SocketAlertSink, parse_rule
+from src.sensors.arduino_serial import ArduinoSerial
+from src.sensors.filters import ConditioningStage
+from src.sensors.ingest_process import IngestProcess
+from src.sensors.replay import ReplaySource
 
 
 def main():
-    app = QApplication(sys.argv)
-    window = MainWindow()
+    parser = argparse.ArgumentParser(description="Monitor de sensores Arduino")
+    parser.add_argument("--record", metavar="DIR", help="Graba la sesión en DIR")
+    parser.add_argument("--port", help="Puerto serial fijo (ej. el pty del emulador)")
+    parser.add_argument("--binary", action="store_true", help="Negociar el protocolo binario")
+    parser.add_argument("--ingest-process", action="store_true",
+                        help="Leer y parsear en un proceso separado (memoria compartida con la GUI)")
+    parser.add_argument("--replay", metavar="DIR", help="Reproduce una sesión grabada en vez de leer el Arduino")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Velocidad de reproducción (1 = tiempo real, 0 = lo más rápido posible)")
+    parser.add_argument("--filter", action="append", default=[], metavar="SENSOR=TIPO[:PARAMS]",
+                        help="Filtro por sensor antes de la GUI: ema:ALPHA, median:VENTANA, "
+                             "oneeuro:MIN_CORTE:BETA, kalman:Q:R (ej. POT=ema:0.3). Repetible")
+    parser.add_argument("--alert", action="append", default=[], metavar="REGLA",
+                        help="Regla de alerta: LM35>30, LM35>30/28 (histéresis), LM35 rate>2, "
+                             "FLAME==1 for 200ms, POT z>3. Repetible")
+    parser.add_argument("--alert-socket", metavar="PATH", help="Publica las alertas (JSON Lines) en un socket Unix")
+    args, qt_args = parser.parse_known_args()
+    if args.ingest_process and args.replay:
+        # El proceso de ingesta solo lee el puerto serial
+        parser.error("--ingest-process no se puede combinar con --replay")
+    try:
+        conditioner = ConditioningStage.from_specs(args.filter)
+        rules = [parse_rule(rule) for rule in args.alert]
+    except ValueError as e:
+        parser.error(str(e))
+    
+    # Qt se importa aquí: el proceso de ingesta (spawn) reimporta este módulo
+    # y no debe cargar PyQt5
+    from PyQt5.QtWidgets import QApplication
+    from src.gui.main_window import MainWindow
+    
+    record_dir = args.record
+    store = None
+    alerts = None
+    if args.ingest_process:
+        # Los lotes no cruzan procesos: grabación, filtros y alertas se pasan
+        # al proceso de ingesta (las alertas no llegan al banner de la GUI)
+        source = IngestProcess(port=args.port, binary=args.binary, record_dir=args.record, filters=args.filter,
+                               alerts=args.alert, alert_socket=args.alert_socket)
+        store = source.store
+        record_dir = None  # Graba el proceso de ingesta
+    else:
+        if args.replay:
+            source = ReplaySource(args.replay, speed=args.speed)
+        else:
+            source = ArduinoSerial(port=args.port, binary=args.binary)
+        if args.filter:
+            source.conditioner = conditioner
+        if rules:
+            alerts = AlertEngine(rules, [LogAlertSink()])
+            if args.alert_socket:
+                alerts.add_sink(SocketAlertSink(args.alert_socket))
+            source.add_listener(alerts)
+    
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = MainWindow(record_dir=record_dir, source=source, store=store, alerts=alerts)
     window.show()
     sys.exit(app.exec_())
 
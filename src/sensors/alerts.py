@@ -0,0 +1,474 @@
+"""
+Motor de reglas y alertas evaluado en el thread de lectura
+
+Las reglas se registran por canal (sensor y columna). Cada lote se agrupa
+por sensor una sola vez y cada canal evalúa todas sus reglas juntas: las de
+umbral en una sola comparación (filas × reglas) y las que tienen estado
+(histéresis, tasa de cambio, "sostenido N ms", z-score EWMA) con unas pocas
+llamadas de NumPy sobre las filas del canal. Los sensores sin reglas no
+cuestan nada, así que el costo no crece con reglas de otros sensores.
+
+Una regla está activa o inactiva; cada cambio genera un ``Alert`` (activa o
+normalizada) que se entrega a los sinks en el mismo thread, milisegundos
+después de leer los bytes. Uso::
+
+    engine = AlertEngine([parse_rule("LM35>30"), parse_rule("FLAME==1 for 200ms")],
+                         sinks=[LogAlertSink()])
+    source.add_listener(engine)
+
+Sintaxis de ``parse_rule`` (``[nombre=]SENSOR[.columna] ...``)::
+
+    LM35>30               umbral (también <, >=, <=, ==)
+    LM35>30/28            histéresis: se activa sobre 30 y se normaliza bajo 28
+    LM35 rate>2           |variación| mayor a 2 unidades por segundo
+    FLAME==1 for 200ms    condición sostenida al menos 200 ms
+    POT z>3               |z-score| sobre media y varianza EWMA mayor a 3
+"""
+
+import json
+import operator
+import re
+import sys
+import threading
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, TextIO, Tuple
+from src.sensors.filters import linear_recurrence
+from src.sensors.registry import REGISTRY, sensor_name
+from src.sensors.sinks import SocketSink
+
+COMPARISONS: Dict[str, Callable[[np.ndarray, float], np.ndarray]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+}
+
+
+@dataclass
+class Alert:
+    """Cambio de estado de una regla"""
+    rule: str
+    sensor: str
+    device: int
+    value: float
+    timestamp: float  # Timestamp de la lectura que lo causó (o vencimiento de "sostenido")
+    active: bool  # True = se activó, False = volvió a la normalidad
+    detected: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict:
+        return {"rule": self.rule, "sensor": self.sensor, "device": self.device, "value": self.value,
+                "timestamp": self.timestamp, "active": self.active, "detected": self.detected}
+
+
+class Rule:
+    """Base de las reglas: ``active`` evalúa las filas de un canal en orden
+
+    ``state`` es un dict propio de la regla y de la placa, que persiste entre
+    lotes.
+    """
+
+    def __init__(self, sensor: str, column: int = 0, name: str = ""):
+        # Un tag mal escrito registraría un sensor nuevo y la regla nunca se activaría
+        if sensor not in REGISTRY:
+            raise ValueError(f"Sensor desconocido en la regla: {sensor} (opciones: {', '.join(REGISTRY)})")
+        if column >= REGISTRY[sensor].arity:
+            raise ValueError(f"{sensor} no tiene columna {column}")
+        self.sensor = sensor
+        self.column = column
+        self.name = name or self.describe()
+
+    @property
+    def channel(self) -> str:
+        return self.sensor + (f".{self.column}" if self.column else "")
+
+    def describe(self) -> str:
+        return self.channel
+
+    def active(self, values: np.ndarray, times: np.ndarray, state: dict) -> np.ndarray:
+        raise NotImplementedError
+
+
+class ThresholdRule(Rule):
+    """Activa mientras el valor cumple ``valor <op> limit``
+
+    Las reglas de umbral de un canal se evalúan juntas en ``_Channel``.
+    """
+
+    def __init__(self, sensor: str, op: str, limit: float, column: int = 0, name: str = ""):
+        if op not in COMPARISONS:
+            raise ValueError(f"Operador desconocido: {op}")
+        self.op = op
+        self.limit = limit
+        super().__init__(sensor, column, name)
+
+    def describe(self) -> str:
+        return f"{self.channel}{self.op}{self.limit:g}"
+
+    def active(self, values, times, state):
+        return COMPARISONS[self.op](values, self.limit)
+
+
+class HysteresisRule(Rule):
+    """Se activa al cruzar ``on`` y se normaliza recién al volver más allá de ``off``
+
+    Con ``on > off`` alerta por valores altos; con ``on < off``, por bajos.
+    """
+
+    def __init__(self, sensor: str, on: float, off: float, column: int = 0, name: str = ""):
+        if on == off:
+            raise ValueError("on y off deben ser distintos")
+        self.on = on
+        self.off = off
+        super().__init__(sensor, column, name)
+
+    def describe(self) -> str:
+        return f"{self.channel}{'>' if self.on > self.off else '<'}{self.on:g}/{self.off:g}"
+
+    def active(self, values, times, state):
+        if self.on > self.off:
+            events = np.where(values > self.on, 1, np.where(values < self.off, 0, -1))
+        else:
+            events = np.where(values < self.on, 1, np.where(values > self.off, 0, -1))
+        # Cada fila hereda el último cruce (forward-fill vectorizado)
+        last = np.maximum.accumulate(np.where(events >= 0, np.arange(len(events)), -1))
+        result = np.where(last >= 0, events[last] == 1, state.get("on", False))
+        state["on"] = bool(result[-1])
+        return result
+
+
+class RateRule(Rule):
+    """Activa cuando ``|Δvalor / Δt|`` supera ``limit`` unidades por segundo
+
+    Lecturas sin separación de tiempo (mismo lote en modo texto) se suponen
+    espaciadas ``min_interval`` segundos.
+    """
+
+    def __init__(self, sensor: str, limit: float, column: int = 0, name: str = "", min_interval: float = 0.01):
+        self.limit = limit
+        self.min_interval = min_interval
+        super().__init__(sensor, column, name)
+
+    def describe(self) -> str:
+        return f"{self.channel} rate>{self.limit:g}"
+
+    def active(self, values, times, state):
+        previous = state.get("previous")
+        if previous is None:
+            previous = (values[0], times[0])
+        dv = np.diff(values, prepend=previous[0])
+        dt = np.maximum(np.diff(times, prepend=previous[1]), self.min_interval)
+        state["previous"] = (values[-1], times[-1])
+        return np.abs(dv / dt) > self.limit
+
+
+class HeldRule(Rule):
+    """Activa cuando ``valor <op> limit`` se cumple sin interrupción ``hold_ms``
+
+    Los sensores digitales solo envían flancos: si la condición sigue
+    cumpliéndose sin lecturas nuevas, ``AlertEngine`` la activa al vencer el
+    plazo (``deadline``).
+    """
+
+    def __init__(self, sensor: str, op: str, limit: float, hold_ms: float, column: int = 0, name: str = ""):
+        if op not in COMPARISONS:
+            raise ValueError(f"Operador desconocido: {op}")
+        self.op = op
+        self.limit = limit
+        self.hold = hold_ms / 1000.0
+        super().__init__(sensor, column, name)
+
+    def describe(self) -> str:
+        return f"{self.channel}{self.op}{self.limit:g} for {self.hold * 1000:g}ms"
+
+    def active(self, values, times, state):
+        condition = COMPARISONS[self.op](values, self.limit)
+        since = state.get("since", np.nan)  # Inicio de la racha actual (NaN: no se cumple)
+        previous = np.concatenate(([since == since], condition[:-1]))
+        rises = np.where(condition & ~previous, np.arange(len(values)), -1)
+        last = np.maximum.accumulate(rises)
+        started = np.where(last >= 0, times[np.maximum(last, 0)], since)
+        # Una racha que ya venció su plazo (``held``) sigue activa aunque lleguen
+        # lecturas con timestamp anterior al vencimiento
+        result = condition & ((times - started >= self.hold) | ((last < 0) & state.get("held", False)))
+        state["since"] = float(started[-1]) if condition[-1] else np.nan
+        state["held"] = bool(result[-1])
+        state["value"] = float(values[-1])
+        return result
+
+    def deadline(self, state: dict) -> Optional[float]:
+        since = state.get("since", np.nan)
+        return since + self.hold if since == since else None
+
+
+class ZScoreRule(Rule):
+    """Anomalía: ``|x - media| / desvío`` sobre media y varianza EWMA mayor a ``threshold``
+
+    Cada lectura se compara con la media y varianza previas (sin incluirse);
+    las primeras ``warmup`` lecturas solo entrenan.
+    """
+
+    def __init__(self, sensor: str, threshold: float = 3.0, alpha: float = 0.05, warmup: int = 20,
+                 column: int = 0, name: str = ""):
+        if not 0 < alpha < 1:
+            raise ValueError(f"alpha debe estar en (0, 1): {alpha}")
+        self.threshold = threshold
+        self.alpha = alpha
+        self.warmup = warmup
+        super().__init__(sensor, column, name)
+
+    def describe(self) -> str:
+        return f"{self.channel} z>{self.threshold:g}"
+
+    def active(self, values, times, state):
+        a = self.alpha
+        mean0 = state.get("mean", values[0])
+        var0 = state.get("var", 0.0)
+        count = state.get("count", 0)
+        decay = np.full(len(values), 1 - a)
+        means = linear_recurrence(decay, a * values, mean0)
+        previous_means = np.concatenate(([mean0], means[:-1]))
+        deviation = values - previous_means
+        variances = linear_recurrence(decay, (1 - a) * a * deviation * deviation, var0)
+        previous_vars = np.concatenate(([var0], variances[:-1]))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = np.abs(deviation) / np.sqrt(previous_vars)
+        trained = count + np.arange(len(values)) >= self.warmup
+        state.update(mean=float(means[-1]), var=float(variances[-1]), count=count + len(values))
+        return trained & (z > self.threshold)
+
+
+RULE_PATTERN = re.compile(
+    r"^\s*(?:(?P<name>[\w-]+)=)?(?P<sensor>[A-Za-z0-9_]+)(?:\.(?P<column>[01]))?\s*"
+    r"(?P<kind>rate|z)?\s*(?P<op>>=|<=|==|>|<)\s*(?P<limit>-?[\d.]+)"
+    r"(?:/(?P<off>-?[\d.]+))?(?:\s+for\s+(?P<hold>[\d.]+)\s*ms)?\s*$")
+
+
+def parse_rule(text: str) -> Rule:
+    """Crea una regla desde su texto (ver la sintaxis en el docstring del módulo)"""
+    match = RULE_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"Regla inválida: {text}")
+    sensor = match["sensor"]
+    column = int(match["column"] or 0)
+    name = match["name"] or ""
+    op = match["op"]
+    try:
+        limit = float(match["limit"])
+        off = float(match["off"]) if match["off"] else None
+        hold = float(match["hold"]) if match["hold"] else None
+    except ValueError:
+        raise ValueError(f"Número inválido en la regla: {text}") from None
+    if match["kind"] == "rate":
+        return RateRule(sensor, limit, column, name)
+    if match["kind"] == "z":
+        return ZScoreRule(sensor, limit, column=column, name=name)
+    if off is not None:
+        return HysteresisRule(sensor, limit, off, column, name)
+    if hold is not None:
+        return HeldRule(sensor, op, limit, hold, column, name)
+    return ThresholdRule(sensor, op, limit, column, name)
+
+
+class _Channel:
+    """Reglas de un (sensor, columna), compiladas para evaluarse juntas"""
+
+    def __init__(self, rules: List[Rule]):
+        # Umbrales primero: una sola comparación por operador para todas
+        self.rules = sorted(rules, key=lambda rule: not isinstance(rule, ThresholdRule))
+        thresholds = [rule for rule in self.rules if isinstance(rule, ThresholdRule)]
+        self.thresholds = len(thresholds)
+        self.by_op = [(COMPARISONS[op], np.array([i for i, rule in enumerate(thresholds) if rule.op == op]),
+                       np.array([rule.limit for rule in thresholds if rule.op == op]))
+                      for op in sorted({rule.op for rule in thresholds})]
+        self.stateful = self.rules[self.thresholds:]
+
+    def evaluate(self, values: np.ndarray, times: np.ndarray, states: List[dict]) -> np.ndarray:
+        """Matriz (filas × reglas) de reglas activas"""
+        active = np.empty((len(values), len(self.rules)), dtype=bool)
+        column = values[:, None]
+        for compare, indices, limits in self.by_op:
+            active[:, indices] = compare(column, limits[None, :])
+        for offset, rule in enumerate(self.stateful, start=self.thresholds):
+            active[:, offset] = rule.active(values, times, states[offset])
+        return active
+
+
+class AlertEngine:
+    """Evalúa las reglas en cada lote y entrega los cambios a los sinks
+
+    Se registra con ``source.add_listener(engine)``, así corre antes del
+    store y de la GUI y funciona sin ventana (modo headless). Los sinks son
+    callables que reciben un ``Alert``; una excepción en un sink se informa
+    y no detiene la lectura.
+    """
+
+    def __init__(self, rules: Iterable[Rule] = (), sinks: Iterable[Callable[[Alert], None]] = ()):
+        self.rules: List[Rule] = list(rules)
+        self.sinks: List[Callable[[Alert], None]] = list(sinks)
+        self.alerts_fired = 0
+        self.active: Dict[Tuple[str, int], Alert] = {}  # Alertas activas por (regla, placa)
+        self._lock = threading.RLock()
+        self._channels: Dict[int, List[Tuple[int, _Channel]]] = {}
+        # Estado por (sensor, columna, placa): estados de cada regla y vector de activas
+        self._states: Dict[Tuple[int, int, int], Tuple[List[dict], np.ndarray]] = {}
+        self._wake = threading.Condition(self._lock)
+        self._deadlines: Dict[Tuple[int, int, int, int], float] = {}
+        self._running = True
+        self._compile()
+        self._timer = threading.Thread(target=self._deadline_loop, daemon=True)
+        self._timer.start()
+
+    @classmethod
+    def from_specs(cls, specs: Iterable[str], sinks: Iterable[Callable[[Alert], None]] = ()) -> "AlertEngine":
+        """Crea el motor desde textos de ``parse_rule`` (ej. ``LM35>30``)"""
+        return cls([parse_rule(spec) for spec in specs], sinks)
+
+    def add_rule(self, rule: Rule) -> None:
+        with self._lock:
+            self.rules.append(rule)
+            self._compile()
+
+    def add_sink(self, sink: Callable[[Alert], None]) -> None:
+        self.sinks.append(sink)
+
+    def _compile(self):
+        grouped: Dict[Tuple[int, int], List[Rule]] = {}
+        for rule in self.rules:
+            grouped.setdefault((REGISTRY[rule.sensor].id, rule.column), []).append(rule)
+        self._channels = {}
+        for (sid, column), rules in grouped.items():
+            self._channels.setdefault(sid, []).append((column, _Channel(rules)))
+        self._states.clear()
+        self._deadlines.clear()
+
+    def _state(self, sid: int, column: int, device: int, channel: _Channel):
+        key = (sid, column, device)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = ([{} for _ in channel.rules], np.zeros(len(channel.rules), dtype=bool))
+        return state
+
+    def __call__(self, batch: np.ndarray) -> None:
+        if not self._channels or not len(batch):
+            return
+        alerts: List[Alert] = []
+        sensors = batch['sensor']
+        with self._lock:
+            for sid in np.unique(sensors).tolist():
+                channels = self._channels.get(sid)
+                if channels is None:
+                    continue
+                rows = batch[sensors == sid]
+                devices = np.unique(rows['device']).tolist()
+                for device in devices:
+                    board = rows if len(devices) == 1 else rows[rows['device'] == device]
+                    for column, channel in channels:
+                        values = board['value1' if column else 'value0']
+                        finite = np.isfinite(values)
+                        if not finite.all():
+                            values = values[finite]
+                            times = board['timestamp'][finite]
+                        else:
+                            times = board['timestamp']
+                        if len(values):
+                            self._evaluate(sid, column, device, channel, values, times, alerts)
+        self._emit(alerts)
+
+    def _evaluate(self, sid, column, device, channel, values, times, alerts):
+        states, previous = self._state(sid, column, device, channel)
+        active = channel.evaluate(values, times, states)
+        changes = np.vstack((previous[None, :], active))
+        rows, rules = np.nonzero(changes[1:] != changes[:-1])  # En orden de fila
+        name = sensor_name(sid)
+        for row, index in zip(rows.tolist(), rules.tolist()):
+            alerts.append(self._transition(channel.rules[index], name, device, float(values[row]),
+                                           float(times[row]), bool(active[row, index])))
+        previous[:] = active[-1]
+        for index, rule in enumerate(channel.rules):
+            if isinstance(rule, HeldRule):
+                key = (sid, column, device, index)
+                deadline = rule.deadline(states[index]) if not active[-1, index] else None
+                if deadline is None:
+                    self._deadlines.pop(key, None)
+                else:
+                    self._deadlines[key] = deadline
+                    self._wake.notify()
+
+    def _transition(self, rule: Rule, sensor: str, device: int, value: float, timestamp: float,
+                    active: bool) -> Alert:
+        alert = Alert(rule.name, sensor, device, value, timestamp, active)
+        if active:
+            self.active[(rule.name, device)] = alert
+            self.alerts_fired += 1
+        else:
+            self.active.pop((rule.name, device), None)
+        return alert
+
+    def _emit(self, alerts: List[Alert]) -> None:
+        for alert in alerts:
+            for sink in self.sinks:
+                try:
+                    sink(alert)
+                except Exception as e:
+                    print(f"⚠️  Sink de alertas falló: {e}", file=sys.stderr)
+
+    def _deadline_loop(self):
+        """Activa las reglas "sostenido" cuyo plazo vence sin lecturas nuevas"""
+        while True:
+            alerts: List[Alert] = []
+            with self._lock:
+                if not self._running:
+                    return
+                now = time.time()
+                due = [key for key, deadline in self._deadlines.items() if deadline <= now]
+                for key in due:
+                    sid, column, device, index = key
+                    deadline = self._deadlines.pop(key)
+                    channel = dict(self._channels.get(sid, ())).get(column)
+                    if channel is None:
+                        continue
+                    states, previous = self._state(sid, column, device, channel)
+                    previous[index] = True
+                    states[index]["held"] = True
+                    alerts.append(self._transition(channel.rules[index], sensor_name(sid), device,
+                                                   states[index].get("value", np.nan), deadline, True))
+                pending = min(self._deadlines.values(), default=None)
+                if not alerts:
+                    self._wake.wait(None if pending is None else max(0.0, pending - now))
+            self._emit(alerts)
+
+    def close(self) -> None:
+        """Detiene el thread de plazos y cierra los sinks que tengan ``close``"""
+        with self._lock:
+            self._running = False
+            self._wake.notify()
+        self._timer.join(timeout=1)
+        for sink in self.sinks:
+            if hasattr(sink, "close"):
+                sink.close()
+
+
+class LogAlertSink:
+    """Escribe cada alerta como una línea de texto (por defecto en stdout)"""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream
+
+    def __call__(self, alert: Alert) -> None:
+        stamp = time.strftime("%H:%M:%S", time.localtime(alert.timestamp))
+        board = f"@{alert.device}" if alert.device else ""
+        if alert.active:
+            text = f"🚨 {stamp} {alert.rule}{board}: {alert.sensor}={alert.value:g}"
+        else:
+            text = f"✅ {stamp} {alert.rule}{board}: normal ({alert.sensor}={alert.value:g})"
+        print(text, file=self.stream or sys.stdout, flush=True)
+
+
+class SocketAlertSink(SocketSink):
+    """Publica cada alerta como una línea JSON en un socket Unix local"""
+
+    def __call__(self, alert: Alert) -> None:
+        self.send_text(json.dumps(alert.to_dict()) + "\n")
@@ -2,12 +2,19 @@
 Módulo para lectura de sensores reales desde Arduino vía serial
 """
 
+import os
 import serial
 import serial.tools.list_ports
 import threading
 import time
 from dataclasses import dataclass
-from typing import Optional, Callable, Union
+from typing import Optional, Callable, Union, List
+import numpy as np
+from src.sensors.batch_parser import parse_lines, sensor_name
+from src.sensors.registry import ANALOG, sensor_spec
+from src.sensors.binary_protocol import (
+    BINARY_BAUD_RATE, BINARY_COMMAND, BINARY_ACK, FRAME_DELIMITER, decode_frames
+)
 
 @dataclass
 class SensorReading:
@@ -18,36 +25,130 @@ class SensorReading:
     timestamp: float = 0.0
 
 
+class LineFramer:
+    """Separa un flujo de bytes en líneas usando un buffer preasignado
+
+    Los bytes se leen directamente al buffer con ``readinto`` sobre un
+    memoryview; las líneas incompletas quedan al inicio del buffer para la
+    siguiente lectura. ``received`` es el instante (``time.time()``) de la
+    lectura que completó el último bloque: el timestamp de sus lecturas.
+    """
+    
+    def __init__(self, size: int = 4096, delimiter: bytes = b"\n"):
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+        self.delimiter = delimiter
+        self.fill = 0
+        self.overflow = False
+        self.received: Optional[float] = None
+    
+    def feed(self, ser) -> List[str]:
+        """Lee lo disponible en ``ser`` y retorna las líneas completas"""
+        chunk = self._read_chunk(ser)
+        if chunk is None:
+            return []
+        # Un solo decode por lote en vez de uno por línea
+        lines = chunk.decode('utf-8', errors='ignore').split(self.delimiter.decode())
+        return [line.strip() for line in self._drop_overflow(lines)]
+    
+    def feed_frames(self, ser) -> List[bytes]:
+        """Lee lo disponible en ``ser`` y retorna las tramas binarias completas"""
+        chunk = self._read_chunk(ser)
+        if chunk is None:
+            return []
+        return self._drop_overflow(chunk.split(self.delimiter))
+    
+    def _read_chunk(self, ser) -> Optional[bytes]:
+        """Lee al buffer y extrae el bloque hasta el último delimitador"""
+        if self.fill == len(self.buffer):
+            # Línea más larga que el buffer: no es un dato válido, se descarta
+            # hasta el próximo delimitador
+            self.fill = 0
+            self.overflow = True
+        wanted = min(max(1, ser.in_waiting), len(self.buffer) - self.fill)
+        # Con timeout configurado, readinto bloquea hasta el primer byte
+        n = ser.readinto(self.view[self.fill:self.fill + wanted])
+        if not n:
+            return None
+        self.received = time.time()
+        self.fill += n
+        end = self.buffer.rfind(self.delimiter, 0, self.fill)
+        if end < 0:
+            return None
+        chunk = self.view[:end].tobytes()
+        rest = self.fill - end - 1
+        self.buffer[:rest] = self.buffer[end + 1:self.fill]
+        self.fill = rest
+        return chunk
+    
+    def _drop_overflow(self, parts: list) -> list:
+        if self.overflow:
+            self.overflow = False
+            return parts[1:]
+        return parts
+
+
+def find_arduino_ports() -> List[str]:
+    """Retorna todos los puertos USB que parecen un Arduino"""
+    return [port.device for port in serial.tools.list_ports.comports()
+            if 'usbserial' in port.device.lower() or 'CH340' in port.description]
+
+
 class ArduinoSerial:
     """Gestiona comunicación serial con Arduino"""
     
-    def __init__(self, baudrate: int = 9600):
+    def __init__(self, baudrate: int = 9600, binary: bool = False,
+                 binary_baudrate: int = BINARY_BAUD_RATE, port: Optional[str] = None):
         self.baudrate = baudrate
+        # Puerto fijo (ej. pty del emulador); si no, ARDUINO_PORT o autodetección
+        self.port_override = port or os.environ.get("ARDUINO_PORT")
+        self.binary = binary  # Pedir modo binario al conectar
+        self.binary_baudrate = binary_baudrate
+        self.binary_active = False
+        self.frame_errors = 0  # Tramas binarias descartadas (COBS/CRC)
+        self.lines_dropped = 0  # Líneas de datos que no se pudieron parsear
+        self.tracer = None  # LatencyTracer opcional (etapas parseada/escuchada/guardada)
+        self.conditioner = None  # ConditioningStage opcional (filtros antes de los callbacks)
         self.port = None
         self.ser = None
         self.running = False
         self.thread = None
         self.callback = None
+        self.batch_callback = None
+        self.listeners: List[Callable[[np.ndarray], None]] = []  # Etapas extra (grabación, etc.)
+        self.read_timeout = 0.5  # Tiempo máximo bloqueado esperando bytes
+        self.reset_delay = 2.0  # Espera al reinicio del Arduino al abrir el puerto
         
+    def add_listener(self, listener: Callable[[np.ndarray], None]):
+        """Registra una etapa que recibe cada lote en el thread de lectura"""
+        self.listeners.append(listener)
+    
     def find_arduino_port(self) -> Optional[str]:
         """Busca puerto USB del Arduino"""
-        ports = serial.tools.list_ports.comports()
-        for port in ports:
-            if 'usbserial' in port.device.lower() or 'CH340' in port.description:
-                return port.device
-        return None
-    
-    def connect(self, callback: Callable[[SensorReading], None] = None) -> bool:
-        """Conecta a Arduino y inicia lectura en thread"""
+        if self.port_override:
+            return self.port_override
+        ports = find_arduino_ports()
+        return ports[0] if ports else None
+    
+    def connect(self, callback: Callable[[SensorReading], None] = None,
+                batch_callback: Callable[[np.ndarray], None] = None) -> bool:
+        """Conecta a Arduino y inicia lectura en thread
+
+        ``batch_callback`` recibe cada lote como array estructurado
+        (``READING_DTYPE``); ``callback`` recibe un ``SensorReading`` por lectura.
+        """
         self.port = self.find_arduino_port()
         if not self.port:
             print("❌ Arduino no encontrado")
             return False
         
         try:
-            self.ser = serial.Serial(self.port, self.baudrate, timeout=2)
-            time.sleep(2)  # Esperar reinicio del Arduino
+            self.ser = serial.Serial(self.port, self.baudrate, timeout=self.read_timeout)
+            time.sleep(self.reset_delay)  # Esperar reinicio del Arduino
+            if self.binary:
+                self.binary_active = self._negotiate_binary()
             self.callback = callback
+            self.batch_callback = batch_callback
             self.running = True
             self.thread = threading.Thread(target=self._read_loop, daemon=True)
             self.thread.start()
@@ -58,58 +159,111 @@ class ArduinoSerial:
             return False
     
     def _read_loop(self):
-        """Loop de lectura (corre en thread separado)"""
+        """Loop de lectura (corre en thread separado)
+
+        Bloquea en el puerto hasta que llegan bytes (sin busy-poll), los copia
+        con ``readinto`` a un buffer preasignado y entrega lotes de líneas
+        completas al parser.
+        """
+        framer = LineFramer(delimiter=FRAME_DELIMITER if self.binary_active else b"\n")
         while self.running and self.ser:
             try:
-                if self.ser.in_waiting > 0:
-                    line = self.ser.readline().decode('utf-8', errors='ignore').strip()
-                    # Ignorar líneas que no son datos de sensores
-                    if line and not line.endswith("_READY") and "Offset" not in line and "Calibrando" not in line:
-                        self._parse_and_callback(line)
+                if self.binary_active:
+                    frames = framer.feed_frames(self.ser)
+                    if frames:
+                        self._handle_frames(frames, framer.received)
+                    continue
+                lines = framer.feed(self.ser)
+                if lines:
+                    self._handle_lines(lines, framer.received)
             except Exception as e:
                 print(f"Error leyendo: {e}")
                 self.running = False
     
+    def _negotiate_binary(self, timeout: float = 5.0) -> bool:
+        """Espera ``SENSORS_READY`` y pide al sketch el modo binario
+
+        Si el sketch no confirma, se sigue en modo texto.
+        """
+        deadline = time.time() + timeout
+        framer = LineFramer()
+        ready = False
+        while time.time() < deadline:
+            lines = framer.feed(self.ser)
+            if not ready and "SENSORS_READY" in lines:
+                ready = True
+                self.ser.write(BINARY_COMMAND)
+            elif ready and BINARY_ACK in lines:
+                self.ser.flush()
+                self.ser.baudrate = self.binary_baudrate
+                self.ser.reset_input_buffer()
+                print(f"✅ Modo binario a {self.binary_baudrate} baud")
+                return True
+        print("⚠️  Sketch sin modo binario - usando texto")
+        return False
+    
+    def _handle_frames(self, frames: List[bytes], received: Optional[float] = None):
+        """Decodifica un lote de tramas binarias leídas en ``received``"""
+        batch = decode_frames(frames, received)
+        self.frame_errors += sum(1 for frame in frames if frame) - len(batch)
+        self._dispatch(batch)
+    
+    def _handle_lines(self, lines: List[str], received: Optional[float] = None):
+        """Filtra líneas que no son datos y parsea el lote leído en ``received``"""
+        # Ignorar líneas que no son datos de sensores
+        data = [line for line in lines
+                if line and not line.endswith("_READY") and "Offset" not in line and "Calibrando" not in line]
+        if data:
+            batch = parse_lines(data, received)
+            self.lines_dropped += len(data) - len(batch)
+            self._dispatch(batch)
+    
     def _parse_and_callback(self, line: str):
         """Parsea línea y ejecuta callback"""
-        try:
-            parts = line.split(',')
-            if len(parts) >= 2:
-                sensor_name = parts[0]
-                
-                # Casos especiales con múltiples valores
-                if sensor_name == "JOYSTICK" and len(parts) == 3:
-                    # Joystick tiene formato: JOYSTICK,X,Y
-                    x_value = float(parts[1])
-                    y_value = float(parts[2])
-                    reading = SensorReading(
-                        name="JOYSTICK",
-                        value=(int(x_value), int(y_value)),
-                        units="%",
-                        timestamp=time.time()
-                    )
-                else:
-                    # Sensores de un solo valor
-                    value = float(parts[1])
-                    
-                    # Determinar unidades según sensor
-                    units = ""
-                    if sensor_name in ["POT", "LDR", "JOYSTICK_BTN"]:
-                        units = "%"
-                    elif sensor_name == "LM35":
-                        units = "°C"
-                    
-                    reading = SensorReading(
-                        name=sensor_name,
-                        value=int(value) if sensor_name in ["BUTTON", "JOYSTICK_BTN"] else value,
-                        units=units,
-                        timestamp=time.time()
-                    )
-                
-                if self.callback:
-                    self.callback(reading)
-        except Exception as e:
-            print(f"Error parseando: {line} - {e}")
+        self._dispatch(parse_lines([line]))
+    
+    def _dispatch(self, batch: np.ndarray) -> np.ndarray:
+        """Entrega el lote al callback por lotes y al callback por lectura
+
+        Los listeners (grabación, sinks) reciben el lote crudo; los callbacks,
+        el lote filtrado por ``conditioner``, que es el que se retorna.
+        """
+        if not len(batch):
+            return batch
+        parsed = time.time()  # Fin del parseo, antes de listeners y filtros
+        for listener in self.listeners:
+            listener(batch)
+        if self.conditioner:
+            batch = self.conditioner(batch)
+        listened = time.time()
+        if self.batch_callback:
+            self.batch_callback(batch)
+        if self.tracer:
+            self.tracer.ingest(batch, parsed, listened, time.time())
+        if self.callback:
+            for reading in self._readings(batch):
+                self.callback(reading)
+        return batch
+    
+    @staticmethod
+    def _readings(batch: np.ndarray) -> List[SensorReading]:
+        """Convierte un lote a ``SensorReading`` (compatibilidad con callbacks por lectura)"""
+        readings = []
+        for sid, value0, value1, timestamp, *_ in batch.tolist():
+            spec = sensor_spec(sid)
+            if spec is None:
+                # Tag sin declarar: valor crudo sin unidades
+                readings.append(SensorReading(name=sensor_name(sid), value=value0, timestamp=timestamp))
+                continue
+            if spec.arity == 2 and value1 == value1:
+                # Ej. JOYSTICK,X,Y
+                value = (int(value0), int(value1))
+            elif spec.kind != ANALOG:
+                value = int(value0)
+            else:
+                value = value0
+            readings.append(SensorReading(name=spec.tag, value=value, units=spec.units, timestamp=timestamp))
+        return readings
     
     def disconnect(self):
         """Desconecta de Arduino"""
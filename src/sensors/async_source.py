@@ -0,0 +1,156 @@
+"""
+Transporte asyncio para el Arduino: el puerto se registra en el event loop
+
+``AsyncArduinoSerial`` no crea threads: abre el puerto en modo no bloqueante,
+lo registra con ``loop.add_reader`` y parsea cada vez que hay bytes. Los
+lotes se consumen con::
+
+    source = AsyncArduinoSerial(port="/dev/ttyUSB0")
+    await source.open()
+    async for batch in source.stream(batch_size=256, max_latency=0.05):
+        ...  # array READING_DTYPE
+
+Los listeners de ``add_listener`` siguen funcionando y corren en el loop.
+"""
+
+import asyncio
+import time
+import numpy as np
+import serial
+from typing import AsyncIterator, List, Optional
+from src.sensors.arduino_serial import ArduinoSerial, LineFramer
+from src.sensors.binary_protocol import BINARY_BAUD_RATE, BINARY_COMMAND, BINARY_ACK, FRAME_DELIMITER
+
+# Lotes pendientes por consumidor antes de descartar los más viejos
+MAX_PENDING = 1024
+
+
+class AsyncArduinoSerial(ArduinoSerial):
+    """Fuente con la interfaz de ``ArduinoSerial`` para un event loop asyncio"""
+
+    def __init__(self, baudrate: int = 9600, binary: bool = False,
+                 binary_baudrate: int = BINARY_BAUD_RATE, port: Optional[str] = None,
+                 max_pending: int = MAX_PENDING):
+        super().__init__(baudrate=baudrate, binary=binary, binary_baudrate=binary_baudrate, port=port)
+        self.max_pending = max_pending
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.framer = LineFramer()
+        self.queues: List[asyncio.Queue] = []
+        self.batches_dropped = 0  # Lotes descartados por consumidores lentos
+
+    async def open(self) -> bool:
+        """Abre el puerto y lo registra en el loop actual"""
+        self.port = self.find_arduino_port()
+        if not self.port:
+            print("❌ Arduino no encontrado")
+            return False
+        try:
+            # timeout=0: lecturas no bloqueantes, el loop avisa cuándo hay bytes
+            self.ser = serial.Serial(self.port, self.baudrate, timeout=0, write_timeout=0)
+        except (serial.SerialException, OSError) as e:
+            print(f"❌ Error conectando: {e}")
+            return False
+        await asyncio.sleep(self.reset_delay)  # Esperar reinicio del Arduino sin bloquear el loop
+        self.loop = asyncio.get_running_loop()
+        self.loop.add_reader(self.ser.fileno(), self._on_readable)
+        self.running = True
+        print(f"✅ Conectado a Arduino en {self.port}")
+        return True
+
+    def _on_readable(self):
+        """Callback del loop: lee lo disponible y entrega lotes completos"""
+        try:
+            if self.binary_active:
+                frames = self.framer.feed_frames(self.ser)
+                if frames:
+                    self._handle_frames(frames, self.framer.received)
+                return
+            lines = self.framer.feed(self.ser)
+            if self.binary and lines:
+                self._negotiate_step(lines)
+            if lines and not self.binary_active:
+                self._handle_lines(lines, self.framer.received)
+        except (serial.SerialException, OSError) as e:
+            print(f"Error leyendo: {e}")
+            self.close()
+
+    def _negotiate_step(self, lines: List[str]):
+        """Negociación del modo binario sin bloquear (ver ``_negotiate_binary``)"""
+        if "SENSORS_READY" in lines:
+            self.ser.write(BINARY_COMMAND)
+        elif BINARY_ACK in lines:
+            self.binary = False
+            self.ser.baudrate = self.binary_baudrate
+            self.ser.reset_input_buffer()
+            self.framer = LineFramer(delimiter=FRAME_DELIMITER)
+            self.binary_active = True
+            print(f"✅ Modo binario a {self.binary_baudrate} baud")
+
+    def _dispatch(self, batch: np.ndarray) -> np.ndarray:
+        batch = super()._dispatch(batch)
+        if not len(batch):
+            return batch
+        for queue in self.queues:
+            if queue.full():
+                queue.get_nowait()
+                self.batches_dropped += 1
+            queue.put_nowait(batch)
+        return batch
+
+    async def stream(self, batch_size: int = 256, max_latency: float = 0.05) -> AsyncIterator[np.ndarray]:
+        """Itera lotes de hasta ``batch_size`` lecturas
+
+        Un lote se entrega al juntar ``batch_size`` lecturas o cuando pasan
+        ``max_latency`` segundos desde que llegó la primera, lo que ocurra
+        antes. Cada llamada crea un consumidor independiente.
+        """
+        queue: asyncio.Queue = asyncio.Queue(self.max_pending)
+        self.queues.append(queue)
+        try:
+            while True:
+                first = await queue.get()
+                if first is None:
+                    return
+                parts = [first]
+                rows = len(first)
+                deadline = time.monotonic() + max_latency
+                closed = False
+                while rows < batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        part = await asyncio.wait_for(queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    if part is None:
+                        closed = True
+                        break
+                    parts.append(part)
+                    rows += len(part)
+                batch = parts[0] if len(parts) == 1 else np.concatenate(parts)
+                # Un lote grande del parser se reparte en varios de batch_size
+                for start in range(0, len(batch), batch_size):
+                    yield batch[start:start + batch_size]
+                if closed:
+                    return
+        finally:
+            self.queues.remove(queue)
+
+    def close(self):
+        """Quita el puerto del loop, lo cierra y termina los ``stream``"""
+        if not self.running:
+            return
+        self.running = False
+        if self.loop and self.ser:
+            self.loop.remove_reader(self.ser.fileno())
+        if self.ser:
+            self.ser.close()
+        for queue in self.queues:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(None)
+        print("✅ Desconectado")
+
+    def disconnect(self):
+        self.close()
@@ -0,0 +1,142 @@
+"""
+Protocolo binario del sketch: tramas COBS con CRC-8
+
+Cada trama (antes de COBS) tiene un layout fijo little-endian::
+
+    id sensor (u8) | valor0 (i16) | valor1 (i16) | millis (u32) | crc8 (u8)
+
+Los valores son lecturas ADC crudas; la conversión a unidades se hace aquí,
+vectorizada sobre el lote. Las tramas se separan con un byte 0x00.
+"""
+
+import time
+import numpy as np
+from typing import List, Optional
+from src.sensors.batch_parser import READING_DTYPE
+from src.sensors.registry import DECODER_BY_ID, DECODER_FUNCTIONS
+
+BINARY_BAUD_RATE = 115200
+BINARY_COMMAND = b"BIN\n"
+BINARY_ACK = "BINARY_READY"
+FRAME_DELIMITER = b"\x00"
+
+FRAME_DTYPE = np.dtype([
+    ('sensor', np.uint8),
+    ('raw0', '<i2'),
+    ('raw1', '<i2'),
+    ('millis', '<u4'),
+    ('crc', np.uint8),
+])
+FRAME_SIZE = FRAME_DTYPE.itemsize
+
+
+def _crc8_table(poly: int = 0x07) -> np.ndarray:
+    table = np.zeros(256, dtype=np.uint8)
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = ((crc << 1) ^ poly) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table[i] = crc
+    return table
+
+
+CRC8_TABLE = _crc8_table()
+
+
+def crc8(data: bytes) -> int:
+    """CRC-8 (polinomio 0x07) de un bloque de bytes"""
+    crc = 0
+    for byte in data:
+        crc = int(CRC8_TABLE[crc ^ byte])
+    return crc
+
+
+def cobs_encode(data: bytes) -> bytes:
+    """Codifica ``data`` con COBS (sin el delimitador final)"""
+    out = bytearray(b"\x00")
+    code_index = 0
+    code = 1
+    for byte in data:
+        if byte == 0:
+            out[code_index] = code
+            code_index = len(out)
+            out.append(0)
+            code = 1
+        else:
+            out.append(byte)
+            code += 1
+            if code == 0xFF:
+                out[code_index] = code
+                code_index = len(out)
+                out.append(0)
+                code = 1
+    out[code_index] = code
+    return bytes(out)
+
+
+def cobs_decode(data: bytes) -> Optional[bytes]:
+    """Decodifica una trama COBS; retorna None si está malformada"""
+    out = bytearray()
+    i = 0
+    n = len(data)
+    while i < n:
+        code = data[i]
+        if code == 0 or i + code > n:
+            return None
+        out += data[i + 1:i + code]
+        i += code
+        if code < 0xFF and i < n:
+            out.append(0)
+    return bytes(out)
+
+
+def encode_frame(sensor: int, raw0: int, raw1: int, millis: int) -> bytes:
+    """Arma una trama completa (COBS + delimitador), como la envía el sketch"""
+    frame = np.zeros(1, dtype=FRAME_DTYPE)
+    frame[0] = (sensor, raw0, raw1, millis & 0xFFFFFFFF, 0)
+    payload = frame.tobytes()[:-1]
+    return cobs_encode(payload + bytes([crc8(payload)])) + FRAME_DELIMITER
+
+
+def _to_units(sensor: np.ndarray, raw0: np.ndarray, raw1: np.ndarray, out: np.ndarray):
+    """Convierte ADC crudo a las mismas unidades que el modo texto
+
+    El decodificador de cada fila sale de ``DECODER_BY_ID`` con un solo
+    lookup; luego se aplica una llamada vectorizada por decodificador
+    presente en el lote, sin importar cuántos sensores haya registrados.
+    """
+    decoders = DECODER_BY_ID[sensor]
+    for index in np.unique(decoders):
+        rows = decoders == index
+        out['value0'][rows], out['value1'][rows] = DECODER_FUNCTIONS[index](raw0[rows], raw1[rows])
+
+
+def decode_frames(frames: List[bytes], timestamp: Optional[float] = None) -> np.ndarray:
+    """Decodifica tramas COBS a un array ``READING_DTYPE``
+
+    Las tramas con largo o CRC inválido se descartan; el llamador puede
+    contarlas como tramas recibidas menos filas del lote.
+    """
+    if timestamp is None:
+        timestamp = time.time()
+    payloads = []
+    for frame in frames:
+        decoded = cobs_decode(frame) if frame else None
+        if decoded is not None and len(decoded) == FRAME_SIZE:
+            payloads.append(decoded)
+    raw = np.frombuffer(b"".join(payloads), dtype=FRAME_DTYPE)
+    # CRC vectorizado: una búsqueda en tabla por byte de la trama, para todas a la vez
+    columns = raw.view(np.uint8).reshape(-1, FRAME_SIZE)
+    crc = np.zeros(len(raw), dtype=np.uint8)
+    for col in range(FRAME_SIZE - 1):
+        crc = CRC8_TABLE[crc ^ columns[:, col]]
+    raw = raw[crc == raw['crc']]
+
+    batch = np.empty(len(raw), dtype=READING_DTYPE)
+    batch['sensor'] = raw['sensor']
+    batch['timestamp'] = timestamp
+    batch['device_time'] = raw['millis'] / 1000.0
+    batch['device'] = 0
+    _to_units(raw['sensor'], raw['raw0'].astype(np.float64), raw['raw1'].astype(np.float64), batch)
+    return batch
+
@@ -0,0 +1,239 @@
+"""
+Emulador de ``button_sketch.ino`` sobre un pseudo-terminal
+
+Reproduce el firmware: banner de calibración, ``SENSORS_READY``, envío solo
+de cambios con los mismos umbrales (2 % pot/LDR, 0.5 °C LM35, 3 % joystick),
+los mismos formatos de línea y el modo binario opcional. Las señales de cada
+pin salen de generadores configurables.
+
+Uso::
+
+    python -m src.sensors.emulator --interval 0.001
+    ARDUINO_PORT=/dev/pts/N python3 src/main.py
+"""
+
+import argparse
+import errno
+import math
+import os
+import random
+import threading
+import time
+import tty
+from typing import Callable, Dict, Optional
+from src.sensors.batch_parser import SENSOR_IDS
+from src.sensors.binary_protocol import BINARY_ACK, encode_frame
+
+# Generador de señal: recibe segundos desde el inicio y retorna el nivel del pin
+# (ADC 0-1023 para entradas analógicas, True = presionado para botones)
+Generator = Callable[[float], float]
+
+READ_INTERVAL = 0.1
+BINARY_READ_INTERVAL = 0.01
+
+
+def default_generators() -> Dict[str, Generator]:
+    """Señales por defecto, con ruido similar al de los sensores reales
+
+    El joystick parte centrado, como espera la calibración de ``setup()``.
+    """
+    return {
+        "BUTTON": lambda t: (t % 3.0) < 0.4,
+        "POT": lambda t: 512 + 480 * math.sin(t * 0.5) + random.gauss(0, 3),
+        "LDR": lambda t: 512 + 400 * math.sin(t * 0.1) + random.gauss(0, 5),
+        "LM35": lambda t: (24 + 2 * math.sin(t * 0.05)) * 1023 / 500 + random.gauss(0, 0.5),
+        "JOYSTICK_X": lambda t: 512 + 400 * math.sin(t * 0.8),
+        "JOYSTICK_Y": lambda t: 510 + 400 * math.sin(t * 0.6),
+        "JOYSTICK_SW": lambda t: (t % 5.0) < 0.3,
+    }
+
+
+def arduino_map(x: int, in_min: int, in_max: int, out_min: int, out_max: int) -> int:
+    """``map()`` de Arduino: aritmética entera con división truncada hacia cero"""
+    num = (x - in_min) * (out_max - out_min)
+    den = in_max - in_min
+    quotient = abs(num) // abs(den)
+    return (quotient if (num >= 0) == (den > 0) else -quotient) + out_min
+
+
+class SketchEmulator:
+    """Emula el sketch escribiendo en el lado maestro de un pty
+
+    ``port`` es la ruta del lado esclavo, para pasarla a ``ArduinoSerial``.
+    """
+
+    def __init__(self, generators: Optional[Dict[str, Generator]] = None,
+                 interval: float = READ_INTERVAL, binary_interval: float = BINARY_READ_INTERVAL,
+                 startup_delay: float = 0.0):
+        self.generators = default_generators()
+        self.generators.update(generators or {})
+        self.interval = interval
+        self.binary_interval = binary_interval
+        self.startup_delay = startup_delay  # El sketch real espera 2 s en setup()
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        self.port = os.ttyname(self.slave)
+        os.set_blocking(self.master, False)
+        self.binary_mode = False
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self.lines_sent = 0
+        self.bytes_dropped = 0
+        self._command = b""
+
+    def start(self) -> str:
+        """Inicia el firmware emulado y retorna la ruta del puerto"""
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self.port
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=1)
+        os.close(self.master)
+        os.close(self.slave)
+
+    def _read(self, name: str, t: float) -> int:
+        """``analogRead()``: entero entre 0 y 1023"""
+        return min(1023, max(0, int(self.generators[name](t))))
+
+    def _pressed(self, name: str, t: float) -> bool:
+        return bool(self.generators[name](t))
+
+    def _write(self, data: bytes):
+        """Escribe al puerto; como el UART real, descarta si el host no lee"""
+        try:
+            os.write(self.master, data)
+        except OSError as e:
+            if e.errno not in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EIO):
+                raise
+            self.bytes_dropped += len(data)
+
+    def _println(self, text: str):
+        self._write(text.encode() + b"\r\n")
+        self.lines_sent += 1
+
+    def _check_command(self):
+        """Lee comandos del host (``BIN``) como ``checkCommand()`` del sketch"""
+        try:
+            data = os.read(self.master, 64)
+        except OSError:
+            return
+        for byte in data:
+            if byte == ord("\n"):
+                if self._command == b"BIN":
+                    self._println(BINARY_ACK)
+                    self.binary_mode = True
+                self._command = b""
+            elif len(self._command) < 8:
+                self._command += bytes([byte])
+
+    def _run(self):
+        time.sleep(self.startup_delay)
+        start = time.perf_counter()
+
+        # ===== CALIBRACIÓN DEL JOYSTICK =====
+        self._println("Calibrando joystick...")
+        sum_x = sum(self._read("JOYSTICK_X", 0.0) for _ in range(50))
+        sum_y = sum(self._read("JOYSTICK_Y", 0.0) for _ in range(50))
+        x_offset = sum_x // 50
+        y_offset = sum_y // 50
+        self._println(f"Offset X: {x_offset}, Offset Y: {y_offset}")
+        self._println("SENSORS_READY")
+
+        last_button = -1
+        last_pot = -1
+        last_ldr = -1
+        last_lm35 = -1000.0
+        last_joy_x = -1
+        last_joy_y = -1
+        last_joy_sw = -1
+        next_read = time.perf_counter()
+
+        while self.running:
+            if not self.binary_mode:
+                self._check_command()
+            interval = self.binary_interval if self.binary_mode else self.interval
+            delay = next_read - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            next_read += interval
+            t = time.perf_counter() - start
+
+            if self.binary_mode:
+                millis = int(t * 1000)
+                self._write(
+                    encode_frame(SENSOR_IDS["BUTTON"], int(self._pressed("BUTTON", t)), 0, millis)
+                    + encode_frame(SENSOR_IDS["POT"], self._read("POT", t), 0, millis)
+                    + encode_frame(SENSOR_IDS["LDR"], self._read("LDR", t), 0, millis)
+                    + encode_frame(SENSOR_IDS["LM35"], self._read("LM35", t), 0, millis)
+                    + encode_frame(SENSOR_IDS["JOYSTICK"], self._read("JOYSTICK_X", t) - x_offset,
+                                   self._read("JOYSTICK_Y", t) - y_offset, millis)
+                    + encode_frame(SENSOR_IDS["JOYSTICK_BTN"], int(self._pressed("JOYSTICK_SW", t)), 0, millis)
+                )
+                continue
+
+            # ===== BOTÓN DIGITAL =====
+            # Con INPUT_PULLUP el pin está en LOW (0) cuando se presiona
+            button_state = 0 if self._pressed("BUTTON", t) else 1
+            if button_state != last_button:
+                last_button = button_state
+                self._println(f"BUTTON,{1 if button_state == 0 else 0}")
+
+            # ===== POTENCIÓMETRO ANALÓGICO =====
+            pot_percent = arduino_map(self._read("POT", t), 0, 1023, 0, 100)
+            if abs(pot_percent - last_pot) >= 2:
+                last_pot = pot_percent
+                self._println(f"POT,{pot_percent}")
+
+            # ===== LDR ANALÓGICO (LUZ) =====
+            ldr_percent = arduino_map(self._read("LDR", t), 0, 1023, 0, 100)
+            if abs(ldr_percent - last_ldr) >= 2:
+                last_ldr = ldr_percent
+                self._println(f"LDR,{ldr_percent}")
+
+            # ===== LM35 TEMPERATURA =====
+            temperature = self._read("LM35", t) * (5.0 / 1023.0) * 100.0
+            if abs(temperature - last_lm35) >= 0.5:
+                last_lm35 = temperature
+                self._println(f"LM35,{temperature:.1f}")
+
+            # ===== JOYSTICK ANALÓGICO =====
+            joy_x = arduino_map(self._read("JOYSTICK_X", t) - x_offset, -512, 512, -100, 100)
+            joy_y = arduino_map(self._read("JOYSTICK_Y", t) - y_offset, -512, 512, -100, 100)
+            if abs(joy_x - last_joy_x) >= 3 or abs(joy_y - last_joy_y) >= 3:
+                last_joy_x = joy_x
+                last_joy_y = joy_y
+                self._println(f"JOYSTICK,{joy_x},{joy_y}")
+
+            # ===== JOYSTICK BOTÓN =====
+            joy_sw = 0 if self._pressed("JOYSTICK_SW", t) else 1
+            if joy_sw != last_joy_sw:
+                last_joy_sw = joy_sw
+                self._println(f"JOYSTICK_BTN,{1 if joy_sw == 0 else 0}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Emulador de button_sketch.ino sobre un pty")
+    parser.add_argument("--interval", type=float, default=READ_INTERVAL,
+                        help="Segundos entre lecturas (READ_INTERVAL del sketch)")
+    parser.add_argument("--binary-interval", type=float, default=BINARY_READ_INTERVAL,
+                        help="Segundos entre tramas en modo binario")
+    args = parser.parse_args()
+
+    emulator = SketchEmulator(interval=args.interval, binary_interval=args.binary_interval)
+    port = emulator.start()
+    print(f"✅ Emulador en {port}")
+    print(f"   ARDUINO_PORT={port} python3 src/main.py")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        emulator.stop()
+        print(f"\n✅ {emulator.lines_sent} líneas enviadas, {emulator.bytes_dropped} bytes descartados")
+
+
+if __name__ == "__main__":
+    main()
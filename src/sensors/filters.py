@@ -0,0 +1,330 @@
+"""
+Acondicionamiento de señal en el host: filtros online vectorizados por lote
+
+Cada filtro procesa de una vez las lecturas de un canal dentro del lote
+(sin bucles por muestra en Python) y guarda su estado entre lotes en arrays
+compactos, una fila por canal. Un canal es (placa, columna) de un sensor.
+
+Las recurrencias ``y[n] = a[n] * y[n-1] + b[n]`` (EMA, one-euro, Kalman) se
+resuelven con ``linear_recurrence`` en forma cerrada por tramos.
+
+Uso::
+
+    stage = ConditioningStage.from_specs(["POT=ema:0.3", "LM35=median:5"])
+    source.conditioner = stage  # ArduinoSerial lo aplica antes del batch_callback
+"""
+
+import math
+import numpy as np
+from typing import Dict, Hashable, Iterable, Optional
+from numpy.lib.stride_tricks import sliding_window_view
+from src.sensors.registry import REGISTRY, sensor_name
+
+# Decaimiento máximo (en unidades de log) dentro de un tramo de linear_recurrence;
+# e**-500 todavía es representable y 1/e**-500 no desborda
+MAX_DECAY = 500.0
+# Coeficiente mínimo de la recurrencia (evita log(0))
+TINY = 1e-12
+
+
+def linear_recurrence(a: np.ndarray, b: np.ndarray, y0: float) -> np.ndarray:
+    """Resuelve ``y[n] = a[n] * y[n-1] + b[n]`` con ``y[-1] = y0`` y ``0 <= a <= 1``
+
+    Con ``P[n] = a[0] * ... * a[n]`` la solución es
+    ``y[n] = P[n] * (y0 + sum(b[k] / P[k]))``. ``P`` decae y ``1/P`` crece,
+    así que el lote se parte en tramos donde ``P`` cae a lo sumo
+    ``e**-MAX_DECAY``; cada tramo son unas pocas llamadas de NumPy.
+    """
+    n = len(b)
+    out = np.empty(n)
+    if not n:
+        return out
+    decay = -np.cumsum(np.log(np.maximum(a, TINY)))  # No decreciente
+    start = 0
+    while start < n:
+        base = decay[start - 1] if start else 0.0
+        end = max(start + 1, int(np.searchsorted(decay, base + MAX_DECAY, side='right')))
+        p = np.exp(base - decay[start:end])
+        out[start:end] = p * (y0 + np.cumsum(b[start:end] / p))
+        y0 = out[end - 1]
+        start = end
+    return out
+
+
+def _alpha(dt: np.ndarray, cutoff) -> np.ndarray:
+    """Factor de un pasabajos de primer orden con frecuencia de corte ``cutoff`` (Hz)"""
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class StreamingFilter:
+    """Base de los filtros: asigna a cada canal una fila de los arrays de estado
+
+    Las subclases declaran su estado en ``STATE`` (nombre → valor inicial) e
+    implementan ``apply(slot, values, times)``.
+    """
+
+    STATE: Dict[str, float] = {}
+
+    def __init__(self, capacity: int = 4):
+        self.slots: Dict[Hashable, int] = {}
+        self.capacity = 0
+        for name in self.STATE:
+            setattr(self, name, np.empty(0))
+        self._grow(capacity)
+
+    def _grow(self, capacity: int) -> None:
+        for name, initial in self.STATE.items():
+            old = getattr(self, name)
+            new = np.full((capacity,) + old.shape[1:], initial)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def slot(self, key: Hashable) -> int:
+        """Fila de estado de un canal, creándola si es nuevo"""
+        index = self.slots.get(key)
+        if index is None:
+            index = self.slots[key] = len(self.slots)
+            if index >= self.capacity:
+                self._grow(self.capacity * 2)
+        return index
+
+    def apply(self, slot: int, values: np.ndarray, times: np.ndarray) -> np.ndarray:
+        """Filtra ``values`` (en orden cronológico) y actualiza el estado del canal"""
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        for name, initial in self.STATE.items():
+            getattr(self, name)[:] = initial
+
+
+class EmaFilter(StreamingFilter):
+    """Media móvil exponencial: ``y = alpha * x + (1 - alpha) * y_prev``"""
+
+    STATE = {"last": np.nan}
+
+    def __init__(self, alpha: float = 0.3):
+        if not 0 < alpha <= 1:
+            raise ValueError(f"alpha debe estar en (0, 1]: {alpha}")
+        self.alpha = alpha
+        super().__init__()
+
+    def apply(self, slot, values, times):
+        y0 = self.last[slot]
+        if y0 != y0:
+            y0 = values[0]
+        out = linear_recurrence(np.full(len(values), 1 - self.alpha), self.alpha * values, y0)
+        self.last[slot] = out[-1]
+        return out
+
+
+class MedianFilter(StreamingFilter):
+    """Mediana de las últimas ``window`` lecturas (quita picos aislados)"""
+
+    def __init__(self, window: int = 5):
+        if window < 1:
+            raise ValueError(f"window debe ser al menos 1: {window}")
+        self.window = int(window)
+        # Últimas window-1 lecturas crudas de cada canal (NaN hasta llenarse)
+        self.history = np.empty((0, self.window - 1))
+        super().__init__()
+
+    def _grow(self, capacity: int) -> None:
+        new = np.full((capacity, self.window - 1), np.nan)
+        new[:len(self.history)] = self.history
+        self.history = new
+        self.capacity = capacity
+
+    def reset(self) -> None:
+        self.history[:] = np.nan
+
+    def apply(self, slot, values, times):
+        if self.window == 1:
+            return values.copy()
+        history = self.history[slot]
+        extended = np.concatenate((history, values))
+        windows = sliding_window_view(extended, self.window)
+        out = np.nanmedian(windows, axis=1) if np.isnan(history[0]) else np.median(windows, axis=1)
+        self.history[slot] = extended[-(self.window - 1):]
+        return out
+
+
+class OneEuroFilter(StreamingFilter):
+    """Filtro one-euro (Casiez et al.): suaviza fuerte en reposo y poco en movimiento
+
+    El corte es ``min_cutoff + beta * |dx|``, con ``dx`` la derivada suavizada
+    con corte ``d_cutoff``. La derivada se toma sobre la señal cruda (no sobre
+    la filtrada) para que ambas etapas sean recurrencias lineales. Las
+    lecturas sin separación de tiempo (mismo lote en modo texto) se suponen
+    espaciadas ``1 / rate`` segundos.
+    """
+
+    STATE = {"x_prev": np.nan, "t_prev": np.nan, "dx": 0.0, "last": np.nan}
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 0.0, d_cutoff: float = 1.0, rate: float = 100.0):
+        if min_cutoff <= 0 or d_cutoff <= 0 or rate <= 0:
+            raise ValueError("min_cutoff, d_cutoff y rate deben ser positivos")
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.rate = rate
+        super().__init__()
+
+    def apply(self, slot, values, times):
+        x_prev = self.x_prev[slot]
+        t_prev = self.t_prev[slot]
+        if x_prev != x_prev:
+            x_prev, t_prev = values[0], times[0]
+        dt = np.diff(times, prepend=t_prev)
+        dt = np.where(dt > 0, dt, 1.0 / self.rate)
+        dx = np.diff(values, prepend=x_prev) / dt
+        alpha_d = _alpha(dt, self.d_cutoff)
+        edx = linear_recurrence(1 - alpha_d, alpha_d * dx, self.dx[slot])
+        alpha = _alpha(dt, self.min_cutoff + self.beta * np.abs(edx))
+        y0 = self.last[slot]
+        if y0 != y0:
+            y0 = values[0]
+        out = linear_recurrence(1 - alpha, alpha * values, y0)
+        self.x_prev[slot] = values[-1]
+        self.t_prev[slot] = times[-1]
+        self.dx[slot] = edx[-1]
+        self.last[slot] = out[-1]
+        return out
+
+
+class KalmanFilter(StreamingFilter):
+    """Kalman 1-D de paseo aleatorio: ruido de proceso ``q`` y de medición ``r``
+
+    La varianza ``P`` no depende de los datos: su recurrencia de Riccati
+    ``P' = r (P + q) / (P + q + r)`` es una transformación de Möbius y se
+    evalúa en forma cerrada para todo el lote con las potencias de sus
+    autovalores. Con las ganancias ``K`` ya calculadas, la estimación es una
+    recurrencia lineal.
+    """
+
+    STATE = {"x": np.nan, "p": np.nan}
+
+    def __init__(self, q: float = 0.01, r: float = 1.0):
+        if q <= 0 or r <= 0:
+            raise ValueError("q y r deben ser positivos")
+        self.q = q
+        self.r = r
+        # Autovalores de [[r, r q], [1, q + r]] (reales, distintos, positivos)
+        root = math.sqrt(q * q + 4 * r * q)
+        self.l1 = (2 * r + q + root) / 2
+        self.l2 = (2 * r + q - root) / 2
+        super().__init__()
+
+    def _variances(self, p0: float, n: int) -> np.ndarray:
+        """``P`` después de 0..n pasos desde ``p0``"""
+        r, q, l1, l2 = self.r, self.q, self.l1, self.l2
+        # M^k ∝ (M - l2 I) - (l2/l1)^k (M - l1 I)
+        rho = (l2 / l1) ** np.arange(n + 1)
+        m11 = (r - l2) - rho * (r - l1)
+        m12 = r * q * (1 - rho)
+        m21 = 1 - rho
+        m22 = (q + r - l2) - rho * (q + r - l1)
+        return (m11 * p0 + m12) / (m21 * p0 + m22)
+
+    def apply(self, slot, values, times):
+        x0 = self.x[slot]
+        p0 = self.p[slot]
+        if x0 != x0:
+            x0, p0 = values[0], self.r
+        p = self._variances(p0, len(values))
+        predicted = p[:-1] + self.q
+        gain = predicted / (predicted + self.r)
+        out = linear_recurrence(1 - gain, gain * values, x0)
+        self.x[slot] = out[-1]
+        self.p[slot] = p[-1]
+        return out
+
+
+FILTERS = {
+    "ema": EmaFilter,
+    "median": MedianFilter,
+    "oneeuro": OneEuroFilter,
+    "kalman": KalmanFilter,
+}
+
+
+def parse_filter(text: str) -> StreamingFilter:
+    """Crea un filtro desde ``tipo[:param[:param...]]`` (ej. ``ema:0.3``, ``kalman:0.01:4``)"""
+    kind, *params = text.split(":")
+    cls = FILTERS.get(kind.strip().lower())
+    if cls is None:
+        raise ValueError(f"Filtro desconocido: {kind} (opciones: {', '.join(FILTERS)})")
+    try:
+        values = [float(param) for param in params]
+    except ValueError:
+        raise ValueError(f"Parámetros inválidos en {text}") from None
+    if cls is MedianFilter:
+        values = [int(value) for value in values]
+    return cls(*values)
+
+
+class ConditioningStage:
+    """Aplica un filtro por sensor a cada lote ``READING_DTYPE``
+
+    Retorna una copia con ``value0``/``value1`` filtrados (el lote original
+    queda crudo para la grabación). Cada placa y columna de un sensor es un
+    canal con su propio estado; los valores NaN pasan sin filtrar.
+    """
+
+    def __init__(self, filters: Optional[Dict[str, StreamingFilter]] = None):
+        self.filters: Dict[int, StreamingFilter] = {}
+        for name, stream_filter in (filters or {}).items():
+            self.set_filter(name, stream_filter)
+
+    @classmethod
+    def from_specs(cls, specs: Iterable[str]) -> "ConditioningStage":
+        """Crea la etapa desde textos ``SENSOR=tipo[:params]`` (ej. ``POT=ema:0.3``)"""
+        filters = {}
+        for spec in specs:
+            name, sep, text = spec.partition("=")
+            if not sep:
+                raise ValueError(f"Se esperaba SENSOR=filtro: {spec}")
+            filters[name.strip()] = parse_filter(text)
+        return cls(filters)
+
+    def set_filter(self, name: str, stream_filter: Optional[StreamingFilter]) -> None:
+        """Asigna (o quita, con None) el filtro de un sensor"""
+        # Un tag mal escrito registraría un sensor nuevo y el filtro no se aplicaría
+        if name not in REGISTRY:
+            raise ValueError(f"Sensor desconocido en el filtro: {name} (opciones: {', '.join(REGISTRY)})")
+        sid = REGISTRY[name].id
+        if stream_filter is None:
+            self.filters.pop(sid, None)
+        else:
+            self.filters[sid] = stream_filter
+
+    def describe(self) -> str:
+        return ", ".join(f"{sensor_name(sid)}={type(f).__name__}" for sid, f in self.filters.items())
+
+    def __call__(self, batch: np.ndarray) -> np.ndarray:
+        if not self.filters or not len(batch):
+            return batch
+        sensors = batch['sensor']
+        out = None
+        for sid, stream_filter in self.filters.items():
+            rows = np.flatnonzero(sensors == sid)
+            if not len(rows):
+                continue
+            if out is None:
+                out = batch.copy()
+                # Tiempo del Arduino si lo hay (modo binario), si no el del host
+                times = np.where(np.isnan(batch['device_time']), batch['timestamp'], batch['device_time'])
+            devices = batch['device'][rows]
+            boards = np.unique(devices)
+            for device in boards.tolist():
+                channel = rows if len(boards) == 1 else rows[devices == device]
+                for column in ('value0', 'value1'):
+                    values = out[column][channel]
+                    finite = np.isfinite(values)
+                    if not finite.any():
+                        continue
+                    keep = channel[finite]
+                    slot = stream_filter.slot((device, column))
+                    out[column][keep] = stream_filter.apply(slot, values[finite], times[keep])
+        return batch if out is None else out
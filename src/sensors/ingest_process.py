@@ -0,0 +1,114 @@
+"""
+Ingesta serial en un proceso separado, con entrega a la GUI por memoria compartida
+
+El proceso hijo lee el Arduino, parsea y escribe en un ``SharedSensorStore``;
+la GUI lo mapea en solo lectura. Así cada lado tiene su propio GIL (y su
+propio núcleo) y un repintado lento de la GUI no demora la lectura serial.
+El proceso se crea con ``spawn``: no hereda Qt ni el estado del padre.
+"""
+
+import multiprocessing
+import time
+import numpy as np
+from typing import Callable, List, Optional
+from src.sensors.arduino_serial import ArduinoSerial, SensorReading
+from src.sensors.shared_store import SharedSensorStore, DEFAULT_SLOTS
+
+# Segundos máximos esperando que el hijo conecte (incluye el reinicio de 2 s del Arduino)
+CONNECT_TIMEOUT = 10.0
+
+
+def _run_ingest(shm_name: str, port: Optional[str], binary: bool, record_dir: Optional[str],
+                filters: List[str], alerts: List[str], alert_socket: Optional[str], connected, stop):
+    """Cuerpo del proceso de ingesta"""
+    store = SharedSensorStore(shm_name)
+    source = ArduinoSerial(port=port, binary=binary)
+    if filters:
+        from src.sensors.filters import ConditioningStage
+        source.conditioner = ConditioningStage.from_specs(filters)
+    engine = None
+    if alerts:
+        from src.sensors.alerts import AlertEngine, LogAlertSink, SocketAlertSink
+        engine = AlertEngine.from_specs(alerts, [LogAlertSink()])
+        if alert_socket:
+            engine.add_sink(SocketAlertSink(alert_socket))
+        source.add_listener(engine)
+    recorder = None
+    if record_dir:
+        from src.sensors.recorder import SessionRecorder
+        recorder = SessionRecorder(record_dir)
+        recorder.start()
+        source.add_listener(recorder.append)
+    if source.connect(batch_callback=store.append_batch):
+        connected.set()
+        while not stop.wait(0.5) and source.running:
+            pass
+        source.disconnect()
+    if recorder:
+        recorder.stop()
+    if engine:
+        engine.close()
+    store.close()
+
+
+class IngestProcess:
+    """Fuente con ``connect``/``disconnect`` de ``ArduinoSerial`` que lee en otro proceso
+
+    ``store`` es la vista de solo lectura que debe usar la GUI. La grabación
+    (``record_dir``) y los filtros (``filters``, textos ``SENSOR=tipo[:params]``
+    de ``ConditioningStage.from_specs``) también corren en el proceso de ingesta,
+    igual que las reglas de alerta (``alerts``, textos de ``parse_rule``), que
+    se informan en su stdout y en el socket ``alert_socket``.
+
+    No tiene ``add_listener`` ni ``conditioner``: los lotes no cruzan procesos,
+    así que todo lo que procesa lotes se configura con los argumentos del
+    constructor (``record_dir``, ``filters``, ``alerts``) y corre en el hijo.
+    """
+
+    def __init__(self, port: Optional[str] = None, binary: bool = False,
+                 record_dir: Optional[str] = None, capacity: int = 4096, slots: int = DEFAULT_SLOTS,
+                 filters: Optional[List[str]] = None, alerts: Optional[List[str]] = None,
+                 alert_socket: Optional[str] = None):
+        self.port = port
+        self.binary = binary
+        self.record_dir = record_dir
+        self.filters = list(filters or [])
+        self.alerts = list(alerts or [])
+        self.alert_socket = alert_socket
+        self.store = SharedSensorStore(capacity=capacity, slots=slots, create=True, readonly=True)
+        self.context = multiprocessing.get_context("spawn")
+        self.connected = self.context.Event()
+        self.stop = self.context.Event()
+        self.process: Optional[multiprocessing.process.BaseProcess] = None
+        self.running = False
+
+    def connect(self, callback: Callable[[SensorReading], None] = None,
+                batch_callback: Callable[[np.ndarray], None] = None) -> bool:
+        """Inicia el proceso de ingesta y espera a que conecte con el Arduino
+
+        Los callbacks no se usan: los lotes quedan en ``store``.
+        """
+        self.process = self.context.Process(
+            target=_run_ingest, daemon=True,
+            args=(self.store.name, self.port, self.binary, self.record_dir, self.filters,
+                  self.alerts, self.alert_socket, self.connected, self.stop))
+        self.process.start()
+        deadline = time.monotonic() + CONNECT_TIMEOUT
+        while self.process.is_alive() and time.monotonic() < deadline:
+            if self.connected.wait(0.1):
+                self.running = True
+                print(f"✅ Ingesta en proceso {self.process.pid}")
+                return True
+        self.disconnect()
+        return False
+
+    def disconnect(self):
+        """Detiene el proceso de ingesta y libera la memoria compartida"""
+        self.running = False
+        self.stop.set()
+        if self.process:
+            self.process.join(timeout=3)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process = None
+        self.store.close()
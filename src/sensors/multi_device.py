@@ -0,0 +1,215 @@
+"""
+Lectura de varias placas Arduino desde un solo thread con ``selectors``
+
+``MultiArduinoSerial`` abre todos los puertos detectados (o una lista fija),
+los registra en un selector (epoll en Linux) y lee cada uno solo cuando tiene
+bytes disponibles. Cada lectura se etiqueta con el id de su placa en el campo
+``device`` de ``READING_DTYPE``. Una placa lenta o desconectada no detiene a
+las demás: los puertos son no bloqueantes y una placa que falla se cierra y
+se vuelve a buscar cada ``scan_interval`` segundos.
+"""
+
+import selectors
+import threading
+import time
+import numpy as np
+import serial
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional
+from src.sensors.arduino_serial import ArduinoSerial, LineFramer, SensorReading, find_arduino_ports
+from src.sensors.batch_parser import parse_lines
+from src.sensors.binary_protocol import (
+    BINARY_BAUD_RATE, BINARY_COMMAND, BINARY_ACK, FRAME_DELIMITER, decode_frames
+)
+
+
+@dataclass
+class DeviceStats:
+    """Estadísticas de una placa"""
+    device: int
+    port: str
+    connected: bool = False
+    binary: bool = False
+    readings: int = 0
+    batches: int = 0
+    frame_errors: int = 0
+    disconnects: int = 0
+    connected_at: float = 0.0
+    last_reading: float = 0.0
+
+
+class _Device:
+    """Puerto abierto de una placa con su framer y estado de negociación"""
+
+    def __init__(self, ser: serial.Serial, stats: DeviceStats, binary: bool):
+        self.ser = ser
+        self.stats = stats
+        self.framer = LineFramer()
+        self.want_binary = binary  # Pedir modo binario al ver SENSORS_READY
+        self.binary_active = False
+
+    def switch_to_binary(self, baudrate: int):
+        self.ser.baudrate = baudrate
+        self.ser.reset_input_buffer()
+        self.framer = LineFramer(delimiter=FRAME_DELIMITER)
+        self.binary_active = True
+        self.stats.binary = True
+
+
+class MultiArduinoSerial(ArduinoSerial):
+    """Fuente con la interfaz de ``ArduinoSerial`` que lee varias placas
+
+    ``ports`` fija la lista de puertos; si es ``None`` se usan todos los que
+    detecta ``find_arduino_ports``. Los ids de placa (1, 2, ...) se asignan
+    por puerto en orden de aparición y se mantienen al reconectar.
+    """
+
+    def __init__(self, ports: Optional[List[str]] = None, baudrate: int = 9600,
+                 binary: bool = False, binary_baudrate: int = BINARY_BAUD_RATE,
+                 scan_interval: float = 2.0):
+        super().__init__(baudrate=baudrate, binary=binary, binary_baudrate=binary_baudrate)
+        self.ports = ports
+        self.scan_interval = scan_interval
+        self.selector = selectors.DefaultSelector()
+        self.devices: Dict[str, _Device] = {}
+        self.device_ids: Dict[str, int] = {}
+        self.device_stats: Dict[int, DeviceStats] = {}
+
+    def connect(self, callback: Callable[[SensorReading], None] = None,
+                batch_callback: Callable[[np.ndarray], None] = None) -> bool:
+        """Abre las placas disponibles e inicia el thread de lectura"""
+        self.callback = callback
+        self.batch_callback = batch_callback
+        self._scan()
+        if not self.devices and not self.ports:
+            print("❌ Arduino no encontrado")
+            return False
+        self.port = ", ".join(self.devices) or ", ".join(self.ports)
+        self.running = True
+        self.thread = threading.Thread(target=self._read_loop, daemon=True)
+        self.thread.start()
+        print(f"✅ Leyendo {len(self.devices)} placa(s): {self.port}")
+        return True
+
+    def _scan(self):
+        """Abre los puertos esperados que aún no están abiertos"""
+        ports = self.ports if self.ports is not None else find_arduino_ports()
+        for port in ports:
+            if port not in self.devices:
+                self._open(port)
+
+    def _open(self, port: str):
+        device = self.device_ids.setdefault(port, len(self.device_ids) + 1)
+        stats = self.device_stats.setdefault(device, DeviceStats(device=device, port=port))
+        try:
+            # timeout=0: lecturas no bloqueantes, el selector avisa cuándo hay bytes
+            ser = serial.Serial(port, self.baudrate, timeout=0, write_timeout=0)
+        except (serial.SerialException, OSError):
+            return
+        self.devices[port] = _Device(ser, stats, self.binary)
+        self.selector.register(ser.fileno(), selectors.EVENT_READ, port)
+        stats.connected = True
+        stats.binary = False
+        stats.connected_at = time.time()
+        print(f"✅ Placa {device} conectada en {port}")
+
+    def _close(self, port: str, lost: bool = True):
+        device = self.devices.pop(port, None)
+        if device is None:
+            return
+        try:
+            self.selector.unregister(device.ser.fileno())
+        except (KeyError, ValueError, OSError):
+            pass
+        try:
+            device.ser.close()
+        except (serial.SerialException, OSError):
+            pass
+        device.stats.connected = False
+        if lost:
+            device.stats.disconnects += 1
+            print(f"⚠️  Placa {device.stats.device} desconectada ({port})")
+
+    def _read_loop(self):
+        """Loop único para todas las placas"""
+        next_scan = time.monotonic() + self.scan_interval
+        while self.running:
+            try:
+                events = self.selector.select(timeout=self.scan_interval)
+            except OSError:
+                # Selector sin descriptores en algunas plataformas
+                time.sleep(self.scan_interval)
+                events = []
+            for key, _ in events:
+                port = key.data
+                device = self.devices.get(port)
+                if device is None:
+                    continue
+                try:
+                    self._read_device(device)
+                except (serial.SerialException, OSError):
+                    self._close(port)
+                except Exception as e:
+                    # Un error de decodificación, listener o callback cierra
+                    # solo esa placa; el loop sigue con las demás (y la vuelve
+                    # a buscar en el próximo escaneo)
+                    print(f"Error leyendo placa {device.stats.device} ({port}): {e}")
+                    self._close(port)
+            if time.monotonic() >= next_scan:
+                self._scan()
+                next_scan = time.monotonic() + self.scan_interval
+
+    def _read_device(self, device: _Device):
+        if device.binary_active:
+            frames = device.framer.feed_frames(device.ser)
+            if frames:
+                batch = decode_frames(frames, device.framer.received)
+                device.stats.frame_errors += sum(1 for frame in frames if frame) - len(batch)
+                self._dispatch_device(device, batch)
+            return
+        lines = device.framer.feed(device.ser)
+        if not lines:
+            return
+        if device.want_binary:
+            if "SENSORS_READY" in lines:
+                device.ser.write(BINARY_COMMAND)
+            elif BINARY_ACK in lines:
+                device.want_binary = False
+                device.switch_to_binary(self.binary_baudrate)
+                return
+        data = [line for line in lines
+                if line and not line.endswith("_READY") and "Offset" not in line and "Calibrando" not in line]
+        if data:
+            batch = parse_lines(data, device.framer.received)
+            self.lines_dropped += len(data) - len(batch)
+            self._dispatch_device(device, batch)
+
+    def _dispatch_device(self, device: _Device, batch: np.ndarray):
+        if not len(batch):
+            return
+        batch['device'] = device.stats.device
+        device.stats.readings += len(batch)
+        device.stats.batches += 1
+        device.stats.last_reading = float(batch['timestamp'][-1])
+        self._dispatch(batch)
+
+    def stats(self) -> List[dict]:
+        """Estadísticas por placa, con lecturas/s desde la última conexión"""
+        now = time.time()
+        result = []
+        for stats in self.device_stats.values():
+            row = asdict(stats)
+            elapsed = now - stats.connected_at if stats.connected_at else 0.0
+            row["readings_per_s"] = stats.readings / elapsed if elapsed > 0 else 0.0
+            result.append(row)
+        return result
+
+    def disconnect(self):
+        """Cierra todas las placas"""
+        self.running = False
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=self.scan_interval + 1)
+        for port in list(self.devices):
+            self._close(port, lost=False)
+        self.selector.close()
+        print("✅ Desconectado")
@@ -0,0 +1,232 @@
+"""
+Grabación de sesiones en segmentos columnares mapeados en memoria
+
+Estructura en disco::
+
+    sesion/
+      seg_000000/
+        meta.json        # base_time, capacidad y filas escritas por sensor
+        LM35.dt.u4       # deltas de timestamp en microsegundos (uint32)
+        LM35.v0.f4       # valor0 (float32)
+        LM35.v1.f4       # valor1 (float32, NaN si el sensor tiene un valor)
+        LM35.idx.f8      # índice: (primer, último) timestamp de cada bloque
+      seg_000001/
+        ...
+
+Cada columna es un archivo de tamaño fijo que se abre con ``np.memmap``; el
+primer delta de cada sensor es relativo a ``base_time`` del segmento. Las
+lecturas de varias placas llevan el id en el nombre (``LM35@2.v0.f4``).
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+import numpy as np
+from typing import Deque, Dict, Optional
+from src.sensors.batch_parser import sensor_name
+
+SEGMENT_PREFIX = "seg_"
+META_FILE = "meta.json"
+DELTA_DTYPE = np.dtype('<u4')
+VALUE_DTYPE = np.dtype('<f4')
+INDEX_DTYPE = np.dtype('<f8')
+# Separa el sensor del id de placa en el nombre de columna (``LM35@2``)
+DEVICE_SEPARATOR = "@"
+# Filas por bloque del índice temporal disperso
+INDEX_BLOCK = 4096
+# Mayor salto representable en un delta (µs); uno mayor abre un segmento nuevo
+MAX_DELTA = np.iinfo(np.uint32).max
+
+
+def column_path(segment_dir: str, sensor: str, column: str) -> str:
+    """Ruta del archivo de una columna (``dt``, ``v0``, ``v1`` o ``idx``)"""
+    suffix = {"dt": "u4", "idx": "f8"}.get(column, "f4")
+    return os.path.join(segment_dir, f"{sensor}.{column}.{suffix}")
+
+
+class _SensorColumns:
+    """Columnas memmap de un sensor dentro de un segmento"""
+
+    def __init__(self, segment_dir: str, sensor: str, capacity: int, base_time: float):
+        self.count = 0
+        self.first_time = base_time
+        self.last_time = base_time
+        self.dt = np.memmap(column_path(segment_dir, sensor, "dt"), dtype=DELTA_DTYPE, mode='w+', shape=(capacity,))
+        self.v0 = np.memmap(column_path(segment_dir, sensor, "v0"), dtype=VALUE_DTYPE, mode='w+', shape=(capacity,))
+        self.v1 = np.memmap(column_path(segment_dir, sensor, "v1"), dtype=VALUE_DTYPE, mode='w+', shape=(capacity,))
+        blocks = (capacity + INDEX_BLOCK - 1) // INDEX_BLOCK
+        self.idx = np.memmap(column_path(segment_dir, sensor, "idx"), dtype=INDEX_DTYPE, mode='w+', shape=(blocks, 2))
+
+    def update_index(self, start: int, timestamps: np.ndarray):
+        """Actualiza (primer, último) timestamp de los bloques tocados por ``[start, start+n)``"""
+        end = start + len(timestamps)
+        if start == 0:
+            self.first_time = float(timestamps[0])
+        first_block = start // INDEX_BLOCK
+        for block in range(first_block, (end - 1) // INDEX_BLOCK + 1):
+            lo = max(block * INDEX_BLOCK, start) - start
+            hi = min((block + 1) * INDEX_BLOCK, end) - start
+            if block * INDEX_BLOCK >= start:
+                self.idx[block, 0] = timestamps[lo]
+            self.idx[block, 1] = timestamps[hi - 1]
+
+    def flush(self):
+        for column in (self.dt, self.v0, self.v1, self.idx):
+            column.flush()
+
+
+class _Segment:
+    """Segmento abierto para escritura"""
+
+    def __init__(self, directory: str, index: int, capacity: int, base_time: float):
+        self.path = os.path.join(directory, f"{SEGMENT_PREFIX}{index:06d}")
+        os.makedirs(self.path, exist_ok=True)
+        self.capacity = capacity
+        self.base_time = base_time
+        self.sensors: Dict[str, _SensorColumns] = {}
+
+    def columns(self, sensor: str) -> _SensorColumns:
+        columns = self.sensors.get(sensor)
+        if columns is None:
+            columns = self.sensors[sensor] = _SensorColumns(self.path, sensor, self.capacity, self.base_time)
+        return columns
+
+    def fits(self, sensor: str, timestamps: np.ndarray) -> bool:
+        """True si las filas caben y sus deltas se pueden representar"""
+        columns = self.sensors.get(sensor)
+        count = columns.count if columns else 0
+        last = columns.last_time if columns else self.base_time
+        if count + len(timestamps) > self.capacity:
+            return False
+        return (timestamps[-1] - last) * 1e6 < MAX_DELTA and timestamps[0] >= self.base_time
+
+    def write_meta(self):
+        meta = {
+            "base_time": self.base_time,
+            "capacity": self.capacity,
+            "index_block": INDEX_BLOCK,
+            "sensors": {name: {"count": columns.count, "first_time": columns.first_time,
+                               "last_time": columns.last_time}
+                        for name, columns in self.sensors.items()},
+        }
+        tmp = os.path.join(self.path, META_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, os.path.join(self.path, META_FILE))
+
+    def flush(self):
+        for columns in self.sensors.values():
+            columns.flush()
+        self.write_meta()
+
+
+class SessionRecorder:
+    """Etapa de grabación para ``ArduinoSerial.add_listener``
+
+    ``append`` solo encola el lote (no bloquea el thread de lectura); un
+    thread escritor drena la cola cada ``write_interval`` segundos, escribe en
+    los memmap y hace ``flush``/fsync cada ``sync_interval`` segundos.
+    """
+
+    def __init__(self, directory: str, segment_capacity: int = 1 << 20,
+                 write_interval: float = 0.2, sync_interval: float = 2.0):
+        self.directory = directory
+        self.segment_capacity = segment_capacity
+        self.write_interval = write_interval
+        self.sync_interval = sync_interval
+        self.pending: Deque[np.ndarray] = deque()
+        self.segment: Optional[_Segment] = None
+        self.segment_index = self._next_segment_index()
+        self.rows_written = 0
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+
+    def _next_segment_index(self) -> int:
+        os.makedirs(self.directory, exist_ok=True)
+        indexes = [int(name[len(SEGMENT_PREFIX):]) for name in os.listdir(self.directory)
+                   if name.startswith(SEGMENT_PREFIX)]
+        return max(indexes) + 1 if indexes else 0
+
+    def append(self, batch: np.ndarray) -> None:
+        """Encola un lote ``READING_DTYPE`` (llamado desde el thread de lectura)"""
+        self.pending.append(batch)
+
+    def start(self) -> None:
+        self.running = True
+        self.thread = threading.Thread(target=self._write_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Detiene el escritor, graba lo pendiente y sincroniza a disco"""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2)
+        self._drain()
+        if self.segment:
+            self.segment.flush()
+
+    def _write_loop(self):
+        last_sync = time.monotonic()
+        while self.running:
+            time.sleep(self.write_interval)
+            try:
+                self._drain()
+                if self.segment and time.monotonic() - last_sync >= self.sync_interval:
+                    self.segment.flush()
+                    last_sync = time.monotonic()
+            except Exception as e:
+                print(f"Error grabando sesión: {e}")
+                self.running = False
+
+    def _drain(self):
+        batches = []
+        while self.pending:
+            batches.append(self.pending.popleft())
+        if batches:
+            self.write(np.concatenate(batches))
+
+    def write(self, batch: np.ndarray) -> None:
+        """Escribe un lote directamente en el segmento actual"""
+        # Una columna por (placa, sensor); con varias placas el nombre es ``LM35@2``
+        keys = batch['device'].astype(np.uint16) << 8 | batch['sensor']
+        for key in np.unique(keys):
+            rows = batch[keys == key]
+            device, sid = divmod(int(key), 256)
+            name = sensor_name(sid) if device == 0 else f"{sensor_name(sid)}{DEVICE_SEPARATOR}{device}"
+            timestamps = np.maximum.accumulate(rows['timestamp'])
+            if self.segment is None or not self.segment.fits(name, timestamps):
+                self._rotate(float(timestamps[0]))
+            start = 0
+            while start < len(rows):
+                # Un lote mayor que el segmento se reparte en varios
+                chunk = slice(start, start + self.segment_capacity - self.segment.columns(name).count)
+                if chunk.stop - chunk.start <= 0:
+                    self._rotate(float(timestamps[start]))
+                    continue
+                self._write_rows(name, timestamps[chunk], rows[chunk])
+                start = chunk.stop
+
+    def _write_rows(self, name: str, timestamps: np.ndarray, rows: np.ndarray):
+        columns = self.segment.columns(name)
+        n = len(rows)
+        end = columns.count + n
+        micros = np.round(np.diff(timestamps, prepend=columns.last_time) * 1e6)
+        columns.dt[columns.count:end] = np.clip(micros, 0, MAX_DELTA)
+        columns.v0[columns.count:end] = rows['value0']
+        columns.v1[columns.count:end] = rows['value1']
+        # Las marcas se reconstruyen desde los deltas, igual que al leer
+        absolute = columns.last_time + np.cumsum(columns.dt[columns.count:end], dtype=np.float64) / 1e6
+        columns.update_index(columns.count, absolute)
+        columns.last_time = float(absolute[-1])
+        columns.count = end
+        self.rows_written += n
+
+    def _rotate(self, base_time: float):
+        if self.segment:
+            self.segment.flush()
+        self.segment = _Segment(self.directory, self.segment_index, self.segment_capacity, base_time)
+        self.segment_index += 1
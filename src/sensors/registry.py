@@ -0,0 +1,175 @@
+"""
+Registro declarativo de sensores
+
+Cada sensor se declara una sola vez con su tag del protocolo, id del modo
+binario, cantidad de valores, tipo, unidades, rango, decodificador de ADC
+crudo, widget de la GUI (atributo y método) y canales del simulador. A
+partir de esa tabla se arman los ids de ``batch_parser``, la conversión de
+unidades del modo binario, los ``SensorReading`` por lectura y el ruteo a
+widgets.
+
+Para una placa con canales nuevos alcanza con::
+
+    register(SensorSpec("CO2", 40, units="ppm", max_value=5000))
+
+El parser descarta las líneas con tags sin declarar (ruido de la línea
+serial). ``sensor_id`` asigna un id a un tag nuevo solo cuando se lo llama
+explícitamente; esos tags se tratan como analógicos sin unidades.
+"""
+
+import threading
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Tipos de sensor
+ANALOG = "analog"    # Valor continuo; la GUI muestra el último por frame
+DIGITAL = "digital"  # Flancos 0/1; cada uno llega a la GUI como evento
+KEY = "key"          # Índice de tecla en ``sensor_data.KEYS``; también como evento
+
+
+@dataclass(frozen=True)
+class SensorSpec:
+    """Declaración de un sensor"""
+    tag: str
+    id: int  # Id en el modo binario y en la columna ``sensor`` de los lotes
+    arity: int = 1  # Valores por lectura (``value0`` y, si es 2, ``value1``)
+    kind: str = ANALOG
+    units: str = ""
+    min_value: float = 0.0
+    max_value: float = 100.0
+    decoder: str = "raw"  # Conversión de ADC crudo en ``DECODERS``
+    widget: Optional[str] = None  # Atributo de ``MainWindow`` que lo muestra
+    slot: str = "value"  # El widget recibe ``update_<slot>`` (y ``push_<slot>`` con eventos)
+    simulated: Tuple[str, ...] = ()  # Campos de ``SimulatorBlock``, uno por valor
+
+
+def _raw(raw0: np.ndarray, raw1: np.ndarray):
+    return raw0, np.full(len(raw0), np.nan)
+
+
+def _percent(raw0: np.ndarray, raw1: np.ndarray):
+    # map(x, 0, 1023, 0, 100) del sketch, con división entera
+    return raw0 * 100 // 1023, np.full(len(raw0), np.nan)
+
+
+def _lm35(raw0: np.ndarray, raw1: np.ndarray):
+    return np.round(raw0 * (500.0 / 1023.0), 1), np.full(len(raw0), np.nan)
+
+
+def _joystick(raw0: np.ndarray, raw1: np.ndarray):
+    # Offset ya restado en el sketch, map(v, -512, 512, -100, 100)
+    return np.trunc((raw0 + 512) * 200 / 1024) - 100, np.trunc((raw1 + 512) * 200 / 1024) - 100
+
+
+# Conversiones vectorizadas de ADC crudo a unidades (mismas que el modo texto)
+DECODERS: Dict[str, Callable[[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]]] = {
+    "raw": _raw,
+    "percent": _percent,
+    "lm35": _lm35,
+    "joystick": _joystick,
+}
+DECODER_FUNCTIONS = list(DECODERS.values())
+DECODER_INDEX = {name: i for i, name in enumerate(DECODERS)}
+
+SENSORS: List[SensorSpec] = [
+    # Sensores del sketch (ids fijos, iguales a ID_* en button_sketch.ino)
+    SensorSpec("BUTTON", 1, kind=DIGITAL, max_value=1, widget="button_sensor", slot="state",
+               simulated=("button",)),
+    SensorSpec("POT", 2, units="%", decoder="percent", widget="potentiometer", simulated=("potentiometer",)),
+    SensorSpec("LDR", 3, units="%", decoder="percent", widget="light_indicator", simulated=("light_ldr",)),
+    SensorSpec("LM35", 4, units="°C", min_value=15, max_value=35, decoder="lm35",
+               widget="lm35_graph", simulated=("lm35",)),
+    SensorSpec("JOYSTICK", 5, arity=2, units="%", min_value=-100, max_value=100, decoder="joystick",
+               widget="joystick", slot="position", simulated=("joystick_x", "joystick_y")),
+    SensorSpec("JOYSTICK_BTN", 6, kind=DIGITAL, units="%", max_value=1, widget="joystick", slot="button",
+               simulated=("joystick_button",)),
+    # Canales del simulador y de placas con más sensores
+    SensorSpec("FLAME", 7, kind=DIGITAL, max_value=1, widget="flame_sensor", slot="state",
+               simulated=("flame",)),
+    SensorSpec("KEYPAD", 8, kind=KEY, max_value=15, widget="keyboard", slot="key", simulated=("keyboard",)),
+    SensorSpec("TILT", 9, kind=DIGITAL, max_value=1, widget="tilt_switch", slot="state", simulated=("tilt",)),
+    SensorSpec("DHT_TEMP", 10, units="°C", min_value=15, max_value=32,
+               widget="dht_temp_graph", simulated=("dht_temperature",)),
+    SensorSpec("DHT_HUM", 11, units="%", min_value=30, max_value=90,
+               widget="dht_humidity_graph", simulated=("dht_humidity",)),
+    SensorSpec("SOIL", 12, units="%", widget="soil_humidity", simulated=("soil_humidity",)),
+]
+
+# Tablas derivadas, indexadas por id: tag, declaración y decodificador
+SENSOR_NAMES: List[str] = ["UNKNOWN"]
+SENSOR_IDS: Dict[str, int] = {"UNKNOWN": 0}
+SPECS: List[Optional[SensorSpec]] = [None]
+REGISTRY: Dict[str, SensorSpec] = {}
+# Índice en ``DECODER_FUNCTIONS`` por id (un lookup por lote en el modo binario)
+DECODER_BY_ID = np.zeros(np.iinfo(np.uint8).max + 1, dtype=np.uint8)
+# Protege el alta de ids (``register`` y ``sensor_id`` se llaman desde varios threads)
+_LOCK = threading.RLock()
+
+
+def register(spec: SensorSpec) -> SensorSpec:
+    """Agrega un sensor al registro
+
+    El id debe estar libre (o ser el que ya recibió el tag con
+    ``sensor_id``) y el decodificador debe existir en ``DECODERS``.
+    """
+    with _LOCK:
+        return _register(spec)
+
+
+def _register(spec: SensorSpec) -> SensorSpec:
+    if not 0 < spec.id <= np.iinfo(np.uint8).max:
+        raise ValueError(f"Id fuera de rango: {spec.id}")
+    if spec.decoder not in DECODERS:
+        raise ValueError(f"Decodificador desconocido: {spec.decoder}")
+    if spec.tag in REGISTRY or SENSOR_IDS.get(spec.tag, spec.id) != spec.id:
+        raise ValueError(f"Sensor ya registrado: {spec.tag}")
+    if spec.id < len(SPECS) and SENSOR_NAMES[spec.id] not in ("UNKNOWN", spec.tag):
+        raise ValueError(f"Id {spec.id} ya usado por {SENSOR_NAMES[spec.id]}")
+    while len(SENSOR_NAMES) <= spec.id:
+        SENSOR_NAMES.append("UNKNOWN")
+        SPECS.append(None)
+    SENSOR_NAMES[spec.id] = spec.tag
+    SENSOR_IDS[spec.tag] = spec.id
+    SPECS[spec.id] = spec
+    REGISTRY[spec.tag] = spec
+    DECODER_BY_ID[spec.id] = DECODER_INDEX[spec.decoder]
+    if spec not in SENSORS:
+        SENSORS.append(spec)
+    return spec
+
+
+for _spec in list(SENSORS):
+    register(_spec)
+
+
+def sensor_id(name: str) -> int:
+    """Retorna el id de un tag, registrándolo si es nuevo (0 si no quedan ids)"""
+    sid = SENSOR_IDS.get(name)
+    if sid is not None:
+        return sid
+    with _LOCK:
+        sid = SENSOR_IDS.get(name)
+        if sid is None:
+            if len(SENSOR_NAMES) > np.iinfo(np.uint8).max:
+                return 0
+            sid = len(SENSOR_NAMES)
+            SENSOR_NAMES.append(name)
+            SENSOR_IDS[name] = sid
+            SPECS.append(None)
+        return sid
+
+
+def sensor_name(sid: int) -> str:
+    """Retorna el tag de un id de sensor"""
+    return SENSOR_NAMES[sid] if sid < len(SENSOR_NAMES) else SENSOR_NAMES[0]
+
+
+def sensor_spec(sid: int) -> Optional[SensorSpec]:
+    """Declaración de un id, o None si el tag llegó sin declarar"""
+    return SPECS[sid] if sid < len(SPECS) else None
+
+
+def specs_of_kind(*kinds: str) -> List[SensorSpec]:
+    """Sensores declarados de los tipos indicados, en orden de id"""
+    return sorted((spec for spec in SENSORS if spec.kind in kinds), key=lambda spec: spec.id)
@@ -0,0 +1,163 @@
+"""
+Reproducción de sesiones grabadas a través del pipeline de ``ArduinoSerial``
+
+``ReplaySource`` reemplaza al puerto serial: lee la sesión por ventanas de
+tiempo, la vuelve a convertir en líneas de texto como las del sketch y las
+pasa por el mismo parser y los mismos callbacks/listeners que una conexión
+real.
+"""
+
+import threading
+import time
+import numpy as np
+from typing import Callable, Dict, List, Optional
+from src.sensors.arduino_serial import ArduinoSerial, SensorReading
+from src.sensors.batch_parser import parse_lines
+from src.sensors.recorder import DEVICE_SEPARATOR
+from src.sensors.session_query import SessionReader
+
+
+class StageTimer:
+    """Acumula duración total y máxima de una etapa"""
+
+    def __init__(self):
+        self.total = 0.0
+        self.max = 0.0
+        self.calls = 0
+
+    def add(self, seconds: float):
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.calls += 1
+
+    def summary(self) -> Dict[str, float]:
+        mean = self.total / self.calls if self.calls else 0.0
+        return {"mean_ms": mean * 1000, "max_ms": self.max * 1000, "total_s": self.total}
+
+
+class ReplaySource(ArduinoSerial):
+    """Fuente que reproduce una sesión grabada con la interfaz de ``ArduinoSerial``
+
+    ``speed`` = 1 reproduce en tiempo real, N acelera N veces y 0 reproduce
+    lo más rápido posible y reporta throughput y latencia por etapa.
+    """
+
+    def __init__(self, directory: str, speed: float = 1.0, window: float = 1.0,
+                 tick: float = 0.01):
+        super().__init__()
+        self.reader = SessionReader(directory)
+        self.speed = speed
+        self.window = window  # Segundos de sesión leídos por consulta
+        self.tick = tick  # Agrupación de filas por lote al reproducir con pausa
+        self.rows_replayed = 0
+        self.stages = {"format": StageTimer(), "parse": StageTimer(), "dispatch": StageTimer()}
+        self.stats: Dict[str, object] = {}
+
+    def connect(self, callback: Callable[[SensorReading], None] = None,
+                batch_callback: Callable[[np.ndarray], None] = None) -> bool:
+        """Inicia la reproducción en un thread"""
+        self.reader.refresh()
+        self.sensors = self.reader.sensors()
+        if not self.sensors:
+            print(f"❌ Sesión vacía: {self.reader.directory}")
+            return False
+        self.port = self.reader.directory
+        self.callback = callback
+        self.batch_callback = batch_callback
+        self.running = True
+        self.thread = threading.Thread(target=self._read_loop, daemon=True)
+        self.thread.start()
+        mode = "máxima velocidad" if self.speed <= 0 else f"{self.speed:g}×"
+        print(f"✅ Reproduciendo {self.port} ({mode})")
+        return True
+
+    def _session_bounds(self):
+        first = min(meta["sensors"][s]["first_time"] for meta in self.reader.metas.values()
+                    for s in meta["sensors"] if meta["sensors"][s]["count"])
+        last = max(meta["sensors"][s]["last_time"] for meta in self.reader.metas.values()
+                   for s in meta["sensors"] if meta["sensors"][s]["count"])
+        return first, last
+
+    def _load_window(self, start: float, end: float):
+        """Filas de todos los sensores en [start, end), ordenadas por tiempo"""
+        names: List[str] = []
+        timestamps, value0, value1 = [], [], []
+        for sensor in self.sensors:
+            chunk = self.reader.query(sensor, start, end)
+            keep = chunk.timestamps < end
+            names.extend([sensor] * int(keep.sum()))
+            timestamps.append(chunk.timestamps[keep])
+            value0.append(chunk.value0[keep])
+            value1.append(chunk.value1[keep])
+        timestamps = np.concatenate(timestamps)
+        order = np.argsort(timestamps, kind='stable')
+        return ([names[i] for i in order], timestamps[order],
+                np.concatenate(value0)[order], np.concatenate(value1)[order])
+
+    def _read_loop(self):
+        """Reproduce la sesión ventana por ventana"""
+        first, last = self._session_bounds()
+        wall_start = time.perf_counter()
+        clock_start = time.time()
+        start = first
+        while self.running and start <= last:
+            names, timestamps, value0, value1 = self._load_window(start, start + self.window)
+            start += self.window
+            if self.speed <= 0:
+                self._emit(names, timestamps, value0, value1, None)
+                continue
+            # Agrupar por ticks y esperar hasta el momento de cada lote
+            ticks = ((timestamps - first) / self.tick).astype(np.int64)
+            bounds = np.flatnonzero(np.diff(ticks)) + 1
+            for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, len(ticks)]):
+                if not self.running:
+                    break
+                due = (timestamps[lo] - first) / self.speed
+                delay = due - (time.perf_counter() - wall_start)
+                if delay > 0:
+                    time.sleep(delay)
+                shifted = clock_start + (timestamps[lo:hi] - first) / self.speed
+                self._emit(names[lo:hi], timestamps[lo:hi], value0[lo:hi], value1[lo:hi], shifted)
+        self._finish(time.perf_counter() - wall_start)
+
+    def _emit(self, names, timestamps, value0, value1, shifted: Optional[np.ndarray]):
+        """Pasa un lote por formato de texto, parser y callbacks, midiendo cada etapa"""
+        if not names:
+            return
+        t0 = time.perf_counter()
+        tags = [name.partition(DEVICE_SEPARATOR) for name in names]
+        lines = [f"{tag},{v0:g},{v1:g}" if v1 == v1 else f"{tag},{v0:g}"
+                 for (tag, _, _), v0, v1 in zip(tags, value0.tolist(), value1.tolist())]
+        t1 = time.perf_counter()
+        batch = parse_lines(lines)
+        if any(device for _, _, device in tags):
+            batch['device'] = [int(device or 0) for _, _, device in tags]
+        if shifted is not None:
+            batch['timestamp'] = shifted
+        t2 = time.perf_counter()
+        self._dispatch(batch)
+        t3 = time.perf_counter()
+        self.stages["format"].add(t1 - t0)
+        self.stages["parse"].add(t2 - t1)
+        self.stages["dispatch"].add(t3 - t2)
+        self.rows_replayed += len(batch)
+
+    def _finish(self, elapsed: float):
+        self.running = False
+        self.stats = {
+            "rows": self.rows_replayed,
+            "elapsed_s": elapsed,
+            "rows_per_s": self.rows_replayed / elapsed if elapsed > 0 else 0.0,
+            "stages": {name: timer.summary() for name, timer in self.stages.items()},
+        }
+        print(f"✅ Reproducción terminada: {self.rows_replayed} lecturas en {elapsed:.2f} s "
+              f"({self.stats['rows_per_s']:.0f} lecturas/s)")
+        for name, summary in self.stats["stages"].items():
+            print(f"   {name:<9} media {summary['mean_ms']:.3f} ms  máx {summary['max_ms']:.3f} ms")
+
+    def disconnect(self):
+        """Detiene la reproducción"""
+        self.running = False
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=1)
+        print("✅ Reproducción detenida")
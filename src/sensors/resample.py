@@ -0,0 +1,226 @@
+"""
+Remuestreo de los canales a una grilla de tiempo uniforme
+
+El sketch solo transmite cuando un valor cambia más que un umbral, así que
+cada canal llega con timestamps irregulares. ``resample`` lleva un canal a
+una grilla fija con *sample-and-hold* (último valor conocido) o
+interpolación lineal, con ``searchsorted``/``np.interp`` sobre toda la
+grilla a la vez; ``resample_session`` arma la matriz (ticks × canales) de
+una sesión grabada y ``StreamingResampler`` produce las mismas filas de a
+poco a partir de los lotes de la ingesta.
+
+Los ticks son múltiplos enteros de ``1 / rate`` (``k / rate``), así la
+grilla de un flujo y la de la sesión grabada coinciden. Un valor es
+*viejo* (``stale``) si su última lectura tiene más de ``max_age`` segundos,
+o si el canal todavía no envió nada (valor NaN). Después de la última
+lectura de un canal se mantiene su valor también en modo lineal: en un
+flujo que solo envía cambios, no recibir nada significa que no cambió.
+
+Un canal se nombra ``SENSOR[.columna][@placa]``, como en ``WindowedStats``
+(ej. ``LM35``, ``JOYSTICK.1``, ``POT@2``).
+"""
+
+import math
+import re
+import threading
+import numpy as np
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+from src.sensors.recorder import DEVICE_SEPARATOR
+from src.sensors.registry import REGISTRY, SENSORS
+from src.sensors.session_query import SessionReader
+
+HOLD = "hold"
+LINEAR = "linear"
+METHODS = (HOLD, LINEAR)
+
+CHANNEL_PATTERN = re.compile(r"^(?P<sensor>[A-Za-z0-9_]+)(?:\.(?P<column>[01]))?(?:@(?P<device>\d+))?$")
+
+
+@dataclass
+class Resampled:
+    """Canales alineados en una grilla uniforme"""
+    times: np.ndarray  # (ticks,)
+    values: np.ndarray  # (ticks, canales); NaN antes de la primera lectura
+    stale: np.ndarray  # (ticks, canales) bool; True = valor viejo o ausente
+    channels: List[str]
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, self.channels.index(name)]
+
+
+def parse_channel(name: str) -> Tuple[str, int, int]:
+    """``SENSOR[.columna][@placa]`` -> (sensor, columna, placa)"""
+    match = CHANNEL_PATTERN.match(name)
+    if not match:
+        raise ValueError(f"Canal inválido: {name}")
+    return match["sensor"], int(match["column"] or 0), int(match["device"] or 0)
+
+
+def channel_name(sensor: str, column: int = 0, device: int = 0) -> str:
+    return sensor + (f".{column}" if column else "") + (f"@{device}" if device else "")
+
+
+def default_channels() -> List[str]:
+    """Un canal por columna de cada sensor del registro (placa 0)"""
+    return [channel_name(spec.tag, column) for spec in SENSORS for column in range(spec.arity)]
+
+
+def uniform_grid(start: float, end: float, rate: float) -> np.ndarray:
+    """Ticks ``k / rate`` con ``start <= tick <= end``"""
+    first = math.ceil(start * rate)
+    last = math.floor(end * rate)
+    return np.arange(first, last + 1) / rate
+
+
+def resample(times: np.ndarray, values: np.ndarray, grid: np.ndarray, method: str = HOLD,
+             max_age: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Valores de un canal en ``grid`` y su máscara de valores viejos
+
+    ``times`` debe estar ordenado. Antes de la primera lectura el valor es
+    NaN (y viejo); después de la última se mantiene.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Método desconocido: {method} (usa {', '.join(METHODS)})")
+    if not len(times):
+        return np.full(len(grid), np.nan), np.ones(len(grid), dtype=bool)
+    # Índice de la última lectura en o antes de cada tick (-1: ninguna)
+    index = np.searchsorted(times, grid, side='right') - 1
+    missing = index < 0
+    if method == HOLD:
+        result = values[np.maximum(index, 0)].astype(np.float64)
+    else:
+        result = np.interp(grid, times, values, left=np.nan)
+    result[missing] = np.nan
+    stale = missing
+    if max_age is not None:
+        stale = missing | (grid - times[np.maximum(index, 0)] > max_age)
+    return result, stale
+
+
+def resample_session(reader: SessionReader, rate: float, channels: Optional[Iterable[str]] = None,
+                     start: Optional[float] = None, end: Optional[float] = None, method: str = HOLD,
+                     max_age: Optional[float] = None, lookback: Optional[float] = None) -> Resampled:
+    """Matriz uniforme de una sesión grabada
+
+    Por defecto toma todos los canales y todo el rango de la sesión. Para
+    conocer el valor en ``start`` se leen también las filas previas: toda la
+    sesión, o solo ``lookback`` segundos si se indica (los canales sin
+    lecturas en ese lapso empiezan en NaN).
+    """
+    reader.refresh()
+    metas = [info for meta in reader.metas.values() for info in meta["sensors"].values() if info["count"]]
+    first = min((info["first_time"] for info in metas), default=0.0)
+    last = max((info["last_time"] for info in metas), default=0.0)
+    start = first if start is None else start
+    end = last if end is None else end
+    if channels is None:
+        channels = []
+        for recorded in reader.sensors():
+            tag, _, device = recorded.partition(DEVICE_SEPARATOR)
+            arity = REGISTRY[tag].arity if tag in REGISTRY else 1
+            channels.extend(channel_name(tag, column, int(device or 0)) for column in range(arity))
+    channels = list(channels)
+    grid = uniform_grid(start, end, rate)
+    values = np.empty((len(grid), len(channels)))
+    stale = np.empty((len(grid), len(channels)), dtype=bool)
+    since = first if lookback is None else start - lookback
+    for i, name in enumerate(channels):
+        tag, column, device = parse_channel(name)
+        recorded = tag + (f"{DEVICE_SEPARATOR}{device}" if device else "")
+        chunk = reader.query(recorded, min(since, start), end)
+        column_values = chunk.value1 if column else chunk.value0
+        values[:, i], stale[:, i] = resample(chunk.timestamps, column_values, grid, method, max_age)
+    return Resampled(grid, values, stale, channels)
+
+
+class StreamingResampler:
+    """Produce filas de la grilla uniforme a medida que llegan los lotes
+
+    Se registra con ``source.add_listener(resampler)``. El reloj es el
+    timestamp más nuevo recibido: cada lote emite los ticks hasta ese reloj
+    menos ``delay``. Con interpolación lineal, un tick posterior a la última
+    lectura de un canal se emite con el valor mantenido; un ``delay`` mayor
+    deja esperar la lectura siguiente y acerca el resultado al de
+    ``resample_session``. ``take()`` retorna (y descarta) las filas
+    acumuladas; si se indica ``callback``, recibe cada ``Resampled`` nuevo
+    en el thread de lectura y las filas no se acumulan.
+    """
+
+    def __init__(self, rate: float, channels: Optional[Iterable[str]] = None, method: str = HOLD,
+                 max_age: Optional[float] = None, delay: float = 0.0, callback=None):
+        if method not in METHODS:
+            raise ValueError(f"Método desconocido: {method} (usa {', '.join(METHODS)})")
+        self.rate = rate
+        self.channels = list(channels) if channels is not None else default_channels()
+        self.method = method
+        self.max_age = max_age
+        self.delay = delay
+        self.callback = callback
+        self.keys = []
+        for name in self.channels:
+            tag, column, device = parse_channel(name)
+            # Un tag mal escrito registraría un sensor nuevo con un canal siempre vacío
+            if tag not in REGISTRY:
+                raise ValueError(f"Sensor desconocido en el canal: {name} (opciones: {', '.join(REGISTRY)})")
+            if column >= REGISTRY[tag].arity:
+                raise ValueError(f"{tag} no tiene columna {column}")
+            self.keys.append((REGISTRY[tag].id, column, device))
+        # Lecturas pendientes de cada canal (timestamps, valores): la última en o
+        # antes del próximo tick y todas las posteriores
+        empty = np.empty(0)
+        self.tails: List[Tuple[np.ndarray, np.ndarray]] = [(empty, empty)] * len(self.channels)
+        self.next_tick: Optional[int] = None  # k del próximo tick a emitir (tick = k / rate)
+        self.ticks_emitted = 0
+        self._pending: List[Resampled] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, batch: np.ndarray) -> None:
+        self.append(batch)
+
+    def append(self, batch: np.ndarray) -> None:
+        """Agrega un lote ``READING_DTYPE`` y emite los ticks que ya quedaron atrás"""
+        if not len(batch):
+            return
+        stamps = batch['timestamp']
+        if self.next_tick is None:
+            self.next_tick = math.ceil(float(stamps.min()) * self.rate)
+        last_tick = math.floor((float(stamps.max()) - self.delay) * self.rate)
+        grid = np.arange(self.next_tick, last_tick + 1) / self.rate
+        values = np.empty((len(grid), len(self.channels)))
+        stale = np.empty((len(grid), len(self.channels)), dtype=bool)
+        sensors = batch['sensor']
+        devices = batch['device']
+        for i, (sid, column, device) in enumerate(self.keys):
+            rows = (sensors == sid) & (devices == device)
+            times = stamps[rows]
+            readings = batch['value1' if column else 'value0'][rows]
+            finite = np.isfinite(readings)
+            tail_times, tail_values = self.tails[i]
+            times = np.concatenate((tail_times, times[finite]))
+            readings = np.concatenate((tail_values, readings[finite]))
+            if len(grid):
+                values[:, i], stale[:, i] = resample(times, readings, grid, self.method, self.max_age)
+            keep = max(int(np.searchsorted(times, (last_tick + 1) / self.rate, side='right')) - 1, 0)
+            self.tails[i] = (times[keep:], readings[keep:])
+        if not len(grid):
+            return
+        self.next_tick = last_tick + 1
+        self.ticks_emitted += len(grid)
+        chunk = Resampled(grid, values, stale, self.channels)
+        if self.callback:
+            self.callback(chunk)
+            return
+        with self._lock:
+            self._pending.append(chunk)
+
+    def take(self) -> Resampled:
+        """Filas emitidas desde la llamada anterior"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return Resampled(np.empty(0), np.empty((0, len(self.channels))),
+                             np.empty((0, len(self.channels)), dtype=bool), self.channels)
+        return Resampled(np.concatenate([c.times for c in pending]),
+                         np.concatenate([c.values for c in pending]),
+                         np.concatenate([c.stale for c in pending]), self.channels)
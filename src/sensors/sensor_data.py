@@ -27,115 +27,160 @@ class JoystickData:
     button: bool
 
 
+# Teclas del teclado 4x4 en el orden que las emite el simulador
+KEYS = ["1", "2", "3", "A", "4", "5", "6", "B", "7", "8", "9", "C", "*", "0", "#", "D"]
+
+
+@dataclass
+class SimulatorBlock:
+    """Bloque de muestras simuladas para todos los canales, un valor por paso"""
+    time_steps: np.ndarray
+    lm35: np.ndarray
+    dht_temperature: np.ndarray
+    dht_humidity: np.ndarray
+    soil_humidity: np.ndarray
+    light_ldr: np.ndarray
+    potentiometer: np.ndarray
+    joystick_x: np.ndarray
+    joystick_y: np.ndarray
+    joystick_button: np.ndarray
+    flame: np.ndarray
+    tilt: np.ndarray
+    button: np.ndarray
+    keyboard: np.ndarray  # Índice en KEYS, -1 si no hay tecla
+
+
 class SensorSimulator:
-    """Genera datos simulados para pruebas de GUI"""
+    """Genera datos simulados para pruebas de GUI
+
+    Las señales se generan por bloques vectorizados (``generate_block``) con
+    un ``np.random.Generator`` sembrable y un buffer de ruido que se rellena
+    en su lugar. Los métodos ``get_*`` leen el paso actual del bloque vigente.
+    """
     
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None, block_size: int = 1024):
         self.time_step = 0
+        self.rng = np.random.default_rng(seed)
+        self.block_size = block_size
+        # Ruido normal estándar: una fila por canal analógico
+        self._noise = np.empty((6, block_size))
+        self._block: Optional[SimulatorBlock] = None
+        self._block_start = 0
+    
+    def generate_block(self, start: int, n: int) -> SimulatorBlock:
+        """Genera ``n`` pasos de todos los canales a partir del paso ``start``"""
+        t = np.arange(start, start + n, dtype=np.float64)
+        if n == self.block_size:
+            noise = self.rng.standard_normal(out=self._noise)
+        else:
+            noise = self.rng.standard_normal((6, n))
+        steps = t.astype(np.int64)
+        return SimulatorBlock(
+            time_steps=t,
+            # LM35: temperatura ambiente (20-30°C con variación suave)
+            lm35=np.clip(25 + 3 * np.sin(t * 0.01) + 0.5 * noise[0], 15, 35),
+            # DHT22 temperatura (18-28°C)
+            dht_temperature=np.clip(23 + 2 * np.sin(t * 0.008) + 0.3 * noise[1], 15, 32),
+            # DHT22 humedad (40-80%)
+            dht_humidity=np.clip(60 + 15 * np.sin(t * 0.005) + 2 * noise[2], 30, 90),
+            # Humedad de suelo (0-100%)
+            soil_humidity=np.clip(50 + 20 * np.sin(t * 0.003) + 1 * noise[3], 0, 100),
+            # LDR luz (0-100%)
+            light_ldr=np.clip(50 + 40 * np.sin(t * 0.002) + 3 * noise[4], 0, 100),
+            # Potenciómetro (0-100%)
+            potentiometer=np.clip(50 + 45 * np.sin(t * 0.02) + 2 * noise[5], 0, 100),
+            joystick_x=80 * np.sin(t * 0.015),
+            joystick_y=80 * np.cos(t * 0.01),
+            joystick_button=(steps // 100) % 2 == 0,
+            # Digitales con activaciones periódicas
+            flame=(steps // 50) % 3 == 0,
+            tilt=(steps // 80) % 2 == 0,
+            button=(steps // 30) % 4 < 1,
+            # Una tecla cada 40 pasos
+            keyboard=np.where(steps % 40 == 0, (steps // 40) % len(KEYS), -1).astype(np.int8),
+        )
+    
+    def next_block(self, n: Optional[int] = None) -> SimulatorBlock:
+        """Genera el siguiente bloque desde ``time_step`` y avanza la simulación"""
+        n = self.block_size if n is None else n
+        block = self.generate_block(int(self.time_step), n)
+        self.time_step += n
+        return block
+    
+    def _current(self):
+        """Bloque vigente e índice del paso actual dentro de él"""
+        index = int(self.time_step) - self._block_start
+        if self._block is None or not 0 <= index < self.block_size:
+            self._block_start = int(self.time_step)
+            self._block = self.generate_block(self._block_start, self.block_size)
+            index = 0
+        return self._block, index
+    
+    def current(self, field: str):
+        """Valor del paso actual de un campo de ``SimulatorBlock`` (ej. ``"lm35"``)"""
+        block, index = self._current()
+        return getattr(block, field)[index]
     
     def get_temperature_lm35(self) -> SensorData:
         """Simula LM35: temperatura ambiente (20-30°C con variación suave)"""
-        value = 25 + 3 * np.sin(self.time_step * 0.01) + np.random.normal(0, 0.5)
-        value = np.clip(value, 15, 35)
-        return SensorData(
-            timestamp=self.time_step,
-            value=value,
-            unit="°C"
-        )
+        block, i = self._current()
+        return SensorData(timestamp=self.time_step, value=block.lm35[i], unit="°C")
     
     def get_dht_temperature(self) -> SensorData:
         """Simula DHT22 temperatura (18-28°C)"""
-        value = 23 + 2 * np.sin(self.time_step * 0.008) + np.random.normal(0, 0.3)
-        value = np.clip(value, 15, 32)
-        return SensorData(
-            timestamp=self.time_step,
-            value=value,
-            unit="°C"
-        )
+        block, i = self._current()
+        return SensorData(timestamp=self.time_step, value=block.dht_temperature[i], unit="°C")
     
     def get_dht_humidity(self) -> SensorData:
         """Simula DHT22 humedad (40-80%)"""
-        value = 60 + 15 * np.sin(self.time_step * 0.005) + np.random.normal(0, 2)
-        value = np.clip(value, 30, 90)
-        return SensorData(
-            timestamp=self.time_step,
-            value=value,
-            unit="%"
-        )
+        block, i = self._current()
+        return SensorData(timestamp=self.time_step, value=block.dht_humidity[i], unit="%")
     
     def get_soil_humidity(self) -> SensorData:
         """Simula sensor de humedad de suelo (0-100%)"""
-        value = 50 + 20 * np.sin(self.time_step * 0.003) + np.random.normal(0, 1)
-        value = np.clip(value, 0, 100)
-        return SensorData(
-            timestamp=self.time_step,
-            value=value,
-            unit="%"
-        )
+        block, i = self._current()
+        return SensorData(timestamp=self.time_step, value=block.soil_humidity[i], unit="%")
     
     def get_light_ldr(self) -> SensorData:
         """Simula LDR luz (0-100%)"""
-        value = 50 + 40 * np.sin(self.time_step * 0.002) + np.random.normal(0, 3)
-        value = np.clip(value, 0, 100)
-        return SensorData(
-            timestamp=self.time_step,
-            value=value,
-            unit="%"
-        )
+        block, i = self._current()
+        return SensorData(timestamp=self.time_step, value=block.light_ldr[i], unit="%")
     
     def get_flame_sensor(self) -> DigitalSensorData:
         """Simula sensor de llama (digital)"""
-        state = bool(int(self.time_step / 50) % 3 == 0)  # Activaciones periódicas
-        return DigitalSensorData(
-            timestamp=self.time_step,
-            state=state
-        )
+        block, i = self._current()
+        return DigitalSensorData(timestamp=self.time_step, state=bool(block.flame[i]))
     
     def get_tilt_switch(self) -> DigitalSensorData:
         """Simula tilt switch (digital)"""
-        state = bool(int(self.time_step / 80) % 2 == 0)
-        return DigitalSensorData(
-            timestamp=self.time_step,
-            state=state
-        )
+        block, i = self._current()
+        return DigitalSensorData(timestamp=self.time_step, state=bool(block.tilt[i]))
     
     def get_button(self) -> DigitalSensorData:
         """Simula botón táctil (digital)"""
-        state = bool(int(self.time_step / 30) % 4 < 1)
-        return DigitalSensorData(
-            timestamp=self.time_step,
-            state=state
-        )
+        block, i = self._current()
+        return DigitalSensorData(timestamp=self.time_step, state=bool(block.button[i]))
     
     def get_potentiometer(self) -> SensorData:
         """Simula potenciómetro (0-100%)"""
-        value = 50 + 45 * np.sin(self.time_step * 0.02) + np.random.normal(0, 2)
-        value = np.clip(value, 0, 100)
-        return SensorData(
-            timestamp=self.time_step,
-            value=value,
-            unit="%"
-        )
+        block, i = self._current()
+        return SensorData(timestamp=self.time_step, value=block.potentiometer[i], unit="%")
     
     def get_joystick(self) -> JoystickData:
         """Simula joystick XY"""
-        x = 80 * np.sin(self.time_step * 0.015)
-        y = 80 * np.cos(self.time_step * 0.01)
-        button = bool(int(self.time_step / 100) % 2 == 0)
+        block, i = self._current()
         return JoystickData(
             timestamp=self.time_step,
-            x=x,
-            y=y,
-            button=button
+            x=block.joystick_x[i],
+            y=block.joystick_y[i],
+            button=bool(block.joystick_button[i])
         )
     
     def get_keyboard(self) -> Optional[str]:
         """Simula pulsaciones del teclado 4x4"""
-        keys = ["1", "2", "3", "A", "4", "5", "6", "B", "7", "8", "9", "C", "*", "0", "#", "D"]
-        # Emite una tecla cada 40 pasos
-        if int(self.time_step) % 40 == 0 and self.time_step % 1 < 0.2:
-            return keys[int(self.time_step / 40) % len(keys)]
-        return None
+        block, i = self._current()
+        key = block.keyboard[i]
+        return KEYS[key] if key >= 0 else None
     
     def update(self):
         """Avanza el tiempo de simulación"""
@@ -0,0 +1,134 @@
+"""
+Almacén de series de tiempo por sensor sobre buffers circulares NumPy
+
+Un solo thread escribe (el de lectura serial) y cualquier thread lee. La
+coherencia se garantiza con un seqlock: el escritor incrementa el contador de
+secuencia antes y después de escribir (impar = escritura en curso) y el
+lector reintenta si la secuencia cambió durante la copia. Al reintentar el
+lector cede el CPU (el escritor puede estar en otro proceso, así que no hay
+un lock al cual recurrir).
+"""
+
+import time
+import numpy as np
+from typing import Callable, Dict, Optional
+from src.sensors.batch_parser import SENSOR_NAMES, sensor_name
+
+# Columnas de cada fila del buffer
+TIMESTAMP, VALUE0, VALUE1 = 0, 1, 2
+ROW_WIDTH = 3
+
+# Posiciones en el header: secuencia del seqlock y total de filas escritas
+SEQ, COUNT = 0, 1
+# Reintentos del lector que solo ceden el CPU (sleep(0)) antes de dormir RETRY_SLEEP s
+YIELD_RETRIES = 8
+RETRY_SLEEP = 0.0005
+
+
+class RingBuffer:
+    """Buffer circular preasignado de filas (timestamp, valor0, valor1)
+
+    ``data`` y ``header`` se pueden pasar ya creados (por ejemplo sobre
+    memoria compartida); si no, se asignan aquí.
+    """
+
+    def __init__(self, capacity: int = 4096, data: Optional[np.ndarray] = None,
+                 header: Optional[np.ndarray] = None):
+        self.data = np.zeros((capacity, ROW_WIDTH)) if data is None else data
+        self.header = np.zeros(2, dtype=np.int64) if header is None else header
+        self.capacity = len(self.data)
+
+    def append(self, rows: np.ndarray) -> None:
+        """Agrega filas (n, ROW_WIDTH). Solo debe llamarlo el thread escritor"""
+        n = len(rows)
+        if n == 0:
+            return
+        count = int(self.header[COUNT])
+        if n > self.capacity:
+            # Solo sobreviven las últimas ``capacity`` filas del lote
+            rows = rows[-self.capacity:]
+        start = (count + n - len(rows)) % self.capacity
+        first = min(len(rows), self.capacity - start)
+        self.header[SEQ] += 1
+        self.data[start:start + first] = rows[:first]
+        self.data[:len(rows) - first] = rows[first:]
+        self.header[COUNT] = count + n
+        self.header[SEQ] += 1
+
+    def __len__(self) -> int:
+        return min(int(self.header[COUNT]), self.capacity)
+
+    def _read(self, read: Callable[[int], object]):
+        """Ejecuta ``read(count)`` hasta obtener una copia sin escritura concurrente"""
+        attempt = 0
+        while True:
+            seq = int(self.header[SEQ])
+            if not seq & 1:
+                result = read(int(self.header[COUNT]))
+                if int(self.header[SEQ]) == seq:
+                    return result
+            # Escritura en curso: ceder al escritor en vez de girar en vacío
+            time.sleep(0 if attempt < YIELD_RETRIES else RETRY_SLEEP)
+            attempt += 1
+
+    def latest(self) -> Optional[np.ndarray]:
+        """Última fila escrita, o None si el buffer está vacío"""
+        return self._read(lambda count: self.data[(count - 1) % self.capacity].copy() if count else None)
+
+    def since(self, timestamp: float) -> np.ndarray:
+        """Filas con timestamp mayor a ``timestamp``, en orden cronológico"""
+        rows = self._read(self._copy_all)
+        first = np.searchsorted(rows[:, TIMESTAMP], timestamp, side='right')
+        return rows[first:]
+
+    def _copy_all(self, count: int) -> np.ndarray:
+        size = min(count, self.capacity)
+        start = (count - size) % self.capacity
+        if start + size <= self.capacity:
+            return self.data[start:start + size].copy()
+        return np.concatenate((self.data[start:], self.data[:start + size - self.capacity]))
+
+
+class SensorStore:
+    """Un ``RingBuffer`` por sensor, indexado por nombre"""
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self.buffers: Dict[str, RingBuffer] = {
+            name: self._create(name) for name in SENSOR_NAMES[1:]
+        }
+
+    def _create(self, name: str) -> RingBuffer:
+        return RingBuffer(self.capacity)
+
+    def buffer(self, name: str) -> RingBuffer:
+        """Retorna (o crea) el buffer de un sensor"""
+        ring = self.buffers.get(name)
+        if ring is None:
+            ring = self.buffers[name] = self._create(name)
+        return ring
+
+    def append_batch(self, batch: np.ndarray) -> None:
+        """Agrega un lote ``READING_DTYPE``, agrupado por sensor"""
+        if not len(batch):
+            return
+        rows = np.empty((len(batch), ROW_WIDTH))
+        rows[:, TIMESTAMP] = batch['timestamp']
+        rows[:, VALUE0] = batch['value0']
+        rows[:, VALUE1] = batch['value1']
+        sensors = batch['sensor']
+        for sid in np.unique(sensors):
+            self.buffer(sensor_name(int(sid))).append(rows[sensors == sid])
+
+    def latest(self, name: str) -> Optional[np.ndarray]:
+        """Última fila (timestamp, valor0, valor1) de un sensor"""
+        ring = self.buffers.get(name)
+        return ring.latest() if ring is not None else None
+
+    def since(self, name: str, timestamp: float) -> np.ndarray:
+        """Filas de un sensor posteriores a ``timestamp``"""
+        ring = self.buffers.get(name)
+        if ring is None:
+            return np.empty((0, ROW_WIDTH))
+        return ring.since(timestamp)
+
@@ -0,0 +1,122 @@
+"""
+Consultas por rango de tiempo sobre sesiones grabadas con ``SessionRecorder``
+
+La búsqueda es en dos pasos: ``meta.json`` descarta segmentos fuera de rango
+y el índice disperso de cada sensor (primer/último timestamp por bloque de
+``INDEX_BLOCK`` filas) ubica los bloques con búsqueda binaria. Solo se
+decodifican los deltas de esos bloques; los valores se retornan como vistas
+de los ``np.memmap`` sin copiar.
+"""
+
+import json
+import os
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+from src.sensors.recorder import (
+    SEGMENT_PREFIX, META_FILE, DELTA_DTYPE, VALUE_DTYPE, INDEX_DTYPE, column_path
+)
+
+
+@dataclass
+class RangeChunk:
+    """Filas de un sensor dentro de un segmento"""
+    timestamps: np.ndarray
+    value0: np.ndarray  # Vista del memmap
+    value1: np.ndarray  # Vista del memmap
+
+
+class SessionReader:
+    """Lector de una sesión grabada (puede seguir creciendo mientras se lee)"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.metas: Dict[str, dict] = {}
+        self._columns: Dict[Tuple[str, str, str], np.memmap] = {}
+
+    def refresh(self) -> None:
+        """Relee los ``meta.json`` (solo son unos bytes por segmento)"""
+        for name in sorted(os.listdir(self.directory)):
+            if not name.startswith(SEGMENT_PREFIX):
+                continue
+            path = os.path.join(self.directory, name, META_FILE)
+            try:
+                with open(path) as f:
+                    self.metas[name] = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+    def sensors(self) -> List[str]:
+        """Sensores presentes en la sesión"""
+        names = set()
+        for meta in self.metas.values():
+            names.update(meta["sensors"])
+        return sorted(names)
+
+    def _column(self, segment: str, sensor: str, column: str) -> np.memmap:
+        key = (segment, sensor, column)
+        mapped = self._columns.get(key)
+        if mapped is None:
+            dtype = {"dt": DELTA_DTYPE, "idx": INDEX_DTYPE}.get(column, VALUE_DTYPE)
+            path = column_path(os.path.join(self.directory, segment), sensor, column)
+            mapped = self._columns[key] = np.memmap(path, dtype=dtype, mode='r')
+        return mapped
+
+    def query_chunks(self, sensor: str, start: float, end: float) -> List[RangeChunk]:
+        """Filas de ``sensor`` con ``start <= timestamp <= end``, un chunk por segmento"""
+        self.refresh()
+        chunks = []
+        for segment, meta in sorted(self.metas.items()):
+            info = meta["sensors"].get(sensor)
+            if not info or info["count"] == 0:
+                continue
+            if info["first_time"] > end + 1e-6 or info["last_time"] < start - 1e-6:
+                continue
+            chunk = self._query_segment(segment, sensor, info["count"], meta["index_block"], start, end)
+            if chunk is not None:
+                chunks.append(chunk)
+        return chunks
+
+    def query(self, sensor: str, start: float, end: float) -> RangeChunk:
+        """Como ``query_chunks`` pero en un solo chunk (copia solo si hay varios segmentos)"""
+        chunks = self.query_chunks(sensor, start, end)
+        if len(chunks) == 1:
+            return chunks[0]
+        if not chunks:
+            empty = np.empty(0)
+            return RangeChunk(empty, empty.astype(VALUE_DTYPE), empty.astype(VALUE_DTYPE))
+        return RangeChunk(
+            np.concatenate([c.timestamps for c in chunks]),
+            np.concatenate([c.value0 for c in chunks]),
+            np.concatenate([c.value1 for c in chunks]),
+        )
+
+    def _query_segment(self, segment: str, sensor: str, count: int, block: int,
+                       start: float, end: float):
+        blocks = (count + block - 1) // block
+        index = self._column(segment, sensor, "idx")[:2 * blocks].reshape(blocks, 2)
+        # Bloques cuyo rango [primero, último] se cruza con [start, end]; el
+        # margen de 1 µs cubre el redondeo entre el índice y los deltas
+        first_block = int(np.searchsorted(index[:, 1], start - 1e-6, side='left'))
+        last_block = int(np.searchsorted(index[:, 0], end + 1e-6, side='right'))
+        if first_block >= last_block:
+            return None
+        row0 = first_block * block
+        row1 = min(last_block * block, count)
+        # Cada fila se reconstruye desde el inicio de su propio bloque, así una
+        # fila da el mismo timestamp sin importar dónde empieza la consulta
+        deltas = self._column(segment, sensor, "dt")[row0:row1].astype(np.float64)
+        deltas[::block] = 0
+        elapsed = np.cumsum(deltas)
+        starts = np.arange(0, row1 - row0, block)
+        within = elapsed - np.repeat(elapsed[starts], np.diff(np.r_[starts, row1 - row0]))
+        timestamps = np.repeat(index[first_block:last_block, 0], np.diff(np.r_[starts, row1 - row0])) + within / 1e6
+        lo = int(np.searchsorted(timestamps, start, side='left'))
+        hi = int(np.searchsorted(timestamps, end, side='right'))
+        if lo >= hi:
+            return None
+        return RangeChunk(
+            timestamps[lo:hi],
+            self._column(segment, sensor, "v0")[row0 + lo:row0 + hi],
+            self._column(segment, sensor, "v1")[row0 + lo:row0 + hi],
+        )
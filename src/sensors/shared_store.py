@@ -0,0 +1,118 @@
+"""
+``SensorStore`` sobre ``multiprocessing.shared_memory`` para ingesta en otro proceso
+
+Todo vive en un solo bloque de memoria compartida::
+
+    header   int64[4]            capacidad, slots, slots usados, reservado
+    nombres  slots × NAME_SIZE   tag de cada slot (ASCII, relleno con ceros)
+    slot 0   int64[2] + f8[capacidad, ROW_WIDTH]   header y datos del RingBuffer
+    slot 1   ...
+
+El proceso de ingesta es el único escritor; los slots se asignan al aparecer
+cada sensor y el nombre se publica (incrementando "slots usados") después de
+inicializarlo. La GUI mapea el bloque en solo lectura y usa el mismo seqlock
+de ``RingBuffer``.
+"""
+
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Optional
+from src.sensors.sensor_store import RingBuffer, SensorStore, ROW_WIDTH
+
+NAME_SIZE = 32
+HEADER_SIZE = 4
+# Posiciones en el header del bloque
+CAPACITY, SLOTS, USED = 0, 1, 2
+DEFAULT_SLOTS = 32
+
+
+def block_size(capacity: int, slots: int) -> int:
+    """Bytes necesarios para ``slots`` buffers de ``capacity`` filas"""
+    slot = 16 + capacity * ROW_WIDTH * 8
+    return HEADER_SIZE * 8 + slots * NAME_SIZE + slots * slot
+
+
+class SharedSensorStore(SensorStore):
+    """Almacén por sensor en memoria compartida
+
+    ``create=True`` crea el bloque (el creador lo libera en ``close``).
+    Con ``readonly=True`` los arrays no se pueden escribir y los sensores
+    nuevos se descubren al consultarlos.
+    """
+
+    def __init__(self, name: Optional[str] = None, capacity: int = 4096,
+                 slots: int = DEFAULT_SLOTS, create: bool = False, readonly: bool = False):
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=block_size(capacity, slots))
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.owner = create
+        self.readonly = readonly
+        self.header = np.ndarray(HEADER_SIZE, dtype=np.int64, buffer=self.shm.buf)
+        if create:
+            self.header[CAPACITY] = capacity
+            self.header[SLOTS] = slots
+        self.slots = int(self.header[SLOTS])
+        self.names = np.ndarray((self.slots, NAME_SIZE), dtype=np.uint8, buffer=self.shm.buf,
+                                offset=HEADER_SIZE * 8)
+        if readonly:
+            self.capacity = int(self.header[CAPACITY])
+            self.buffers = {}
+            self.refresh()
+        else:
+            super().__init__(int(self.header[CAPACITY]))
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def _slot(self, index: int) -> RingBuffer:
+        """RingBuffer sobre el slot ``index`` del bloque"""
+        offset = HEADER_SIZE * 8 + self.slots * NAME_SIZE + index * (16 + self.capacity * ROW_WIDTH * 8)
+        header = np.ndarray(2, dtype=np.int64, buffer=self.shm.buf, offset=offset)
+        data = np.ndarray((self.capacity, ROW_WIDTH), dtype=np.float64, buffer=self.shm.buf,
+                          offset=offset + 16)
+        if self.readonly:
+            header.flags.writeable = False
+            data.flags.writeable = False
+        return RingBuffer(data=data, header=header)
+
+    def _create(self, name: str) -> RingBuffer:
+        used = int(self.header[USED])
+        encoded = name.encode()[:NAME_SIZE]
+        if used >= self.slots:
+            print(f"⚠️  Sin slots compartidos para {name} - buffer local")
+            return RingBuffer(self.capacity)
+        ring = self._slot(used)
+        self.names[used, :len(encoded)] = np.frombuffer(encoded, dtype=np.uint8)
+        # Publicar el slot recién cuando el nombre está escrito
+        self.header[USED] = used + 1
+        return ring
+
+    def refresh(self) -> None:
+        """Mapea los slots publicados desde la última consulta (solo lectura)"""
+        for index in range(int(self.header[USED])):
+            name = self.names[index].tobytes().rstrip(b"\0").decode()
+            if name not in self.buffers:
+                self.buffers[name] = self._slot(index)
+
+    def latest(self, name: str) -> Optional[np.ndarray]:
+        if self.readonly and name not in self.buffers:
+            self.refresh()
+        return super().latest(name)
+
+    def since(self, name: str, timestamp: float) -> np.ndarray:
+        if self.readonly and name not in self.buffers:
+            self.refresh()
+        return super().since(name, timestamp)
+
+    def close(self) -> None:
+        """Suelta las vistas y cierra el bloque (el creador además lo elimina)"""
+        if self.shm is None:
+            return
+        self.buffers = {}
+        self.header = self.names = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+        self.shm = None
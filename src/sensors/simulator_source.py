@@ -0,0 +1,89 @@
+"""
+Fuente de lecturas simuladas con la interfaz de ``ArduinoSerial``
+
+Genera bloques con ``SensorSimulator.next_block`` y los entrega como lotes
+``READING_DTYPE`` por el mismo ``_dispatch`` (listeners y callbacks) que una
+conexión real.
+"""
+
+import threading
+import time
+import numpy as np
+from typing import Callable, Optional
+from src.sensors.arduino_serial import ArduinoSerial, SensorReading
+from src.sensors.batch_parser import READING_DTYPE, sensor_id
+from src.sensors.registry import ANALOG, DIGITAL, specs_of_kind
+from src.sensors.sensor_data import SensorSimulator
+
+# Canales del bloque y su etiqueta en el protocolo, según el registro
+# (el teclado no se emite: el simulador marca -1 los pasos sin tecla)
+ANALOG_CHANNELS = {spec.tag: spec.simulated[0] for spec in specs_of_kind(ANALOG)
+                   if spec.arity == 1 and spec.simulated}
+DIGITAL_CHANNELS = {spec.tag: spec.simulated[0] for spec in specs_of_kind(DIGITAL) if spec.simulated}
+# Canales de dos valores (ej. JOYSTICK: joystick_x, joystick_y)
+PAIR_CHANNELS = {spec.tag: spec.simulated for spec in specs_of_kind(ANALOG) if spec.arity == 2 and spec.simulated}
+
+
+class SimulatorSource(ArduinoSerial):
+    """Fuente que emite ``rate`` pasos de simulación por segundo
+
+    Cada paso produce una lectura por canal. Los pasos se agrupan en lotes de
+    ``tick`` segundos.
+    """
+
+    def __init__(self, rate: float = 10.0, tick: float = 0.1, seed: Optional[int] = None):
+        super().__init__()
+        self.simulator = SensorSimulator(seed=seed)
+        self.rate = rate
+        self.tick = tick
+        self.rows_generated = 0
+
+    def connect(self, callback: Callable[[SensorReading], None] = None,
+                batch_callback: Callable[[np.ndarray], None] = None) -> bool:
+        """Inicia la simulación en un thread"""
+        self.port = "simulador"
+        self.callback = callback
+        self.batch_callback = batch_callback
+        self.running = True
+        self.thread = threading.Thread(target=self._read_loop, daemon=True)
+        self.thread.start()
+        print(f"✅ Simulador a {self.rate:g} pasos/s")
+        return True
+
+    def _read_loop(self):
+        start = time.time()
+        emitted = 0
+        while self.running:
+            due = int((time.time() - start) * self.rate)
+            if due > emitted:
+                block = self.simulator.next_block(due - emitted)
+                self._dispatch(self.to_batch(block, start + block.time_steps / self.rate))
+                emitted = due
+            time.sleep(self.tick)
+
+    def to_batch(self, block, timestamps: np.ndarray) -> np.ndarray:
+        """Convierte un ``SimulatorBlock`` a lecturas ``READING_DTYPE`` ordenadas por tiempo"""
+        n = len(timestamps)
+        channels = len(ANALOG_CHANNELS) + len(DIGITAL_CHANNELS) + len(PAIR_CHANNELS)
+        batch = np.zeros((n, channels), dtype=READING_DTYPE)
+        batch['timestamp'] = timestamps[:, None]
+        batch['value1'] = np.nan
+        batch['device_time'] = np.nan
+        columns = [(tag, getattr(block, field)) for tag, field in ANALOG_CHANNELS.items()]
+        columns += [(tag, getattr(block, field)) for tag, field in DIGITAL_CHANNELS.items()]
+        for col, (tag, values) in enumerate(columns):
+            batch['sensor'][:, col] = sensor_id(tag)
+            batch['value0'][:, col] = values
+        for col, (tag, (first, second)) in enumerate(PAIR_CHANNELS.items(), start=len(columns)):
+            batch['sensor'][:, col] = sensor_id(tag)
+            batch['value0'][:, col] = np.trunc(getattr(block, first))
+            batch['value1'][:, col] = np.trunc(getattr(block, second))
+        self.rows_generated += batch.size
+        return batch.reshape(-1)
+
+    def disconnect(self):
+        """Detiene la simulación"""
+        self.running = False
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=1)
+        print("✅ Simulador detenido")
@@ -0,0 +1,114 @@
+"""
+Salidas de lotes para ``ArduinoSerial.add_listener``: JSON Lines y socket local
+
+Ambas serializan cada fila ``READING_DTYPE`` como un objeto JSON por línea::
+
+    {"sensor": "LM35", "value0": 24.5, "value1": null, "timestamp": 1700000000.1, "device": 0}
+"""
+
+import json
+import os
+import socket
+import sys
+import threading
+import numpy as np
+from typing import List, Optional, TextIO
+from src.sensors.batch_parser import sensor_name
+
+
+def to_json_lines(batch: np.ndarray) -> str:
+    """Serializa un lote como JSON Lines (NaN se escribe como ``null``)"""
+    lines = []
+    for sid, value0, value1, timestamp, device_time, device in batch.tolist():
+        row = {"sensor": sensor_name(sid), "value0": value0,
+               "value1": value1 if value1 == value1 else None, "timestamp": timestamp,
+               "device": device}
+        if device_time == device_time:
+            row["device_time"] = device_time
+        lines.append(json.dumps(row))
+    lines.append("")
+    return "\n".join(lines)
+
+
+class JsonLinesSink:
+    """Escribe cada lote en un stream de texto (por defecto stdout)"""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream or sys.stdout
+        self.rows_written = 0
+
+    def __call__(self, batch: np.ndarray) -> None:
+        try:
+            self.stream.write(to_json_lines(batch))
+            self.stream.flush()
+        except BrokenPipeError:
+            # El consumidor cerró la tubería (ej. ``| head``); se deja de escribir
+            return
+        self.rows_written += len(batch)
+
+
+class SocketSink:
+    """Publica JSON Lines en un socket Unix a todos los clientes conectados
+
+    Un cliente que no lee a tiempo se desconecta en vez de bloquear el
+    thread de lectura.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.exists(path):
+            os.unlink(path)
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(path)
+        self.server.listen()
+        self.server.settimeout(0.5)  # Para revisar ``running`` al cerrar
+        self.clients: List[socket.socket] = []
+        self.lock = threading.Lock()
+        self.clients_dropped = 0
+        self.running = True
+        self.thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self.thread.start()
+
+    def _accept_loop(self):
+        while self.running:
+            try:
+                client, _ = self.server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            client.setblocking(False)
+            with self.lock:
+                self.clients.append(client)
+
+    def __call__(self, batch: np.ndarray) -> None:
+        if self.clients:
+            self.send_text(to_json_lines(batch))
+
+    def send_text(self, text: str) -> None:
+        """Envía ``text`` (líneas completas) a todos los clientes"""
+        if not self.clients:
+            return
+        data = text.encode()
+        with self.lock:
+            for client in list(self.clients):
+                try:
+                    sent = client.send(data)
+                except OSError:
+                    sent = -1
+                if sent != len(data):
+                    # Una línea cortada dejaría el stream inválido para el cliente
+                    self.clients.remove(client)
+                    client.close()
+                    self.clients_dropped += 1
+
+    def close(self):
+        self.running = False
+        self.thread.join(timeout=1)
+        self.server.close()
+        with self.lock:
+            for client in self.clients:
+                client.close()
+            self.clients.clear()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
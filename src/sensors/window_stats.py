@@ -0,0 +1,255 @@
+"""
+Estadísticas por ventanas de tiempo (10 s, 1 min, 1 h) para cada canal
+
+Cada ventana se divide en ``buckets`` intervalos iguales. Por canal y
+bucket se acumulan cantidad, suma, suma de cuadrados, mínimo, máximo y un
+histograma sobre el rango declarado del sensor en el registro. Al llegar
+un lote se suman sus muestras, de todos los canales a la vez, solo en las
+celdas que les tocan (``np.add.at``, O(1) por muestra) y un bucket se vacía
+al reutilizarse para un intervalo nuevo. Una consulta combina los ``buckets`` de la ventana sin
+recorrer el historial; los percentiles se interpolan en el histograma, así
+que su error es a lo sumo el ancho de un bin.
+
+La ventana se desliza de a un bucket: una ventana de 60 s con 60 buckets
+cubre entre 59 y 60 s. El reloj es el timestamp más nuevo recibido, así
+que la reproducción de sesiones grabadas también funciona.
+
+Un canal es (placa, sensor, columna); ``JOYSTICK`` tiene las columnas 0 (X)
+y 1 (Y).
+"""
+
+import threading
+import numpy as np
+from typing import Dict, Iterable, Optional, Tuple
+from src.sensors.registry import SENSOR_IDS, sensor_name, sensor_spec
+
+DEFAULT_WINDOWS = (10.0, 60.0, 3600.0)
+DEFAULT_BUCKETS = 60
+DEFAULT_BINS = 64
+PERCENTILES = (50, 90, 99)
+
+
+def window_label(seconds: float) -> str:
+    """Nombre corto de una ventana: ``10 s``, ``1 min``, ``1 h``"""
+    if seconds >= 3600 and seconds % 3600 == 0:
+        return f"{seconds / 3600:g} h"
+    if seconds >= 60 and seconds % 60 == 0:
+        return f"{seconds / 60:g} min"
+    return f"{seconds:g} s"
+
+
+class _Window:
+    """Buckets de una ventana para todos los canales (una fila por canal)"""
+
+    def __init__(self, seconds: float, buckets: int, bins: int, capacity: int):
+        self.seconds = seconds
+        self.buckets = buckets
+        self.bins = bins
+        self.width = seconds / buckets
+        self.capacity = 0
+        self.epoch = np.empty((0, buckets), dtype=np.int64)
+        self.count = np.empty((0, buckets), dtype=np.int64)
+        self.total = np.empty((0, buckets))
+        self.sumsq = np.empty((0, buckets))
+        self.low = np.empty((0, buckets))
+        self.high = np.empty((0, buckets))
+        self.hist = np.empty((0, buckets, bins), dtype=np.int64)
+        self.grow(capacity)
+
+    def grow(self, capacity: int) -> None:
+        def extend(old, fill):
+            new = np.full((capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            new[:len(old)] = old
+            return new
+        self.epoch = extend(self.epoch, -1)
+        self.count = extend(self.count, 0)
+        self.total = extend(self.total, 0.0)
+        self.sumsq = extend(self.sumsq, 0.0)
+        self.low = extend(self.low, np.inf)
+        self.high = extend(self.high, -np.inf)
+        self.hist = extend(self.hist, 0)
+        self.capacity = capacity
+
+    def add(self, channels: np.ndarray, times: np.ndarray, values: np.ndarray, bins: np.ndarray) -> None:
+        """Suma muestras de varios canales (``values`` ya centrados en la referencia de su canal)"""
+        epochs = (times // self.width).astype(np.int64)
+        # Celda (canal, bucket) de cada muestra en los arrays aplanados
+        cells = channels * self.buckets + epochs % self.buckets
+        labels = self.epoch.reshape(-1)
+        # Un bucket se vacía al reutilizarse para un intervalo más nuevo: por
+        # celda, el intervalo más nuevo del lote
+        newer = epochs > labels[cells]
+        if newer.any():
+            renewed, renewed_epochs = cells[newer], epochs[newer]
+            order = np.lexsort((renewed_epochs, renewed))
+            renewed, renewed_epochs = renewed[order], renewed_epochs[order]
+            last = np.append(renewed[1:] != renewed[:-1], True)
+            renewed = renewed[last]
+            labels[renewed] = renewed_epochs[last]
+            self.count.reshape(-1)[renewed] = 0
+            self.total.reshape(-1)[renewed] = 0.0
+            self.sumsq.reshape(-1)[renewed] = 0.0
+            self.low.reshape(-1)[renewed] = np.inf
+            self.high.reshape(-1)[renewed] = -np.inf
+            self.hist.reshape(-1, self.bins)[renewed] = 0
+        # Muestras de intervalos que ya salieron de la ventana (llegaron tarde)
+        current = labels[cells] == epochs
+        if not current.all():
+            cells, values, bins = cells[current], values[current], bins[current]
+        # Solo se tocan las celdas de las muestras (no todo el ancho de la ventana)
+        np.add.at(self.count.reshape(-1), cells, 1)
+        np.add.at(self.total.reshape(-1), cells, values)
+        np.add.at(self.sumsq.reshape(-1), cells, values * values)
+        np.minimum.at(self.low.reshape(-1), cells, values)
+        np.maximum.at(self.high.reshape(-1), cells, values)
+        np.add.at(self.hist.reshape(-1), cells * self.bins + bins, 1)
+
+    def live(self, channel: int, now: float) -> np.ndarray:
+        """Máscara de los buckets de ``channel`` dentro de la ventana que termina en ``now``"""
+        newest = int(now // self.width)
+        return self.epoch[channel] > newest - self.buckets
+
+
+class WindowedStats:
+    """Min, max, media, varianza y percentiles por canal sobre varias ventanas
+
+    Se registra como listener o se llama con cada lote ``READING_DTYPE``
+    (thread de lectura); ``query`` y ``summary`` se pueden llamar desde
+    cualquier thread.
+    """
+
+    def __init__(self, windows: Iterable[float] = DEFAULT_WINDOWS, buckets: int = DEFAULT_BUCKETS,
+                 bins: int = DEFAULT_BINS, capacity: int = 16):
+        self.windows: Dict[float, _Window] = {
+            float(seconds): _Window(float(seconds), buckets, bins, capacity) for seconds in windows
+        }
+        self.bins = bins
+        self.channels: Dict[Tuple[int, int, int], int] = {}
+        # Por canal: referencia para centrar las sumas y rango del histograma
+        self.reference = np.zeros(capacity)
+        self.range_low = np.zeros(capacity)
+        self.range_high = np.ones(capacity)
+        self.now = 0.0
+        self._lock = threading.Lock()
+
+    def _channel(self, device: int, sid: int, column: int, first: float) -> int:
+        index = self.channels[(device, sid, column)] = len(self.channels)
+        if index >= len(self.reference):
+            capacity = 2 * len(self.reference)
+            for window in self.windows.values():
+                window.grow(capacity)
+            self.reference = np.resize(self.reference, capacity)
+            self.range_low = np.resize(self.range_low, capacity)
+            self.range_high = np.resize(self.range_high, capacity)
+        spec = sensor_spec(sid)
+        self.reference[index] = first
+        self.range_low[index] = spec.min_value if spec else 0.0
+        self.range_high[index] = spec.max_value if spec and spec.max_value > spec.min_value else 100.0
+        return index
+
+    def __call__(self, batch: np.ndarray) -> None:
+        self.append(batch)
+
+    def append(self, batch: np.ndarray) -> None:
+        """Agrega un lote ``READING_DTYPE``"""
+        if not len(batch):
+            return
+        keys = batch['device'].astype(np.int64) << 8 | batch['sensor']
+        groups, inverse = np.unique(keys, return_inverse=True)
+        stamps = batch['timestamp']
+        with self._lock:
+            self.now = max(self.now, float(stamps.max()))
+            # Canal de cada fila y columna; los canales nuevos se crean con su
+            # primer valor finito como referencia
+            parts = []
+            for column, field in enumerate(('value0', 'value1')):
+                values = batch[field]
+                finite = np.isfinite(values)
+                if not finite.any():
+                    continue
+                present = np.bincount(inverse[finite], minlength=len(groups)) > 0
+                mapping = np.full(len(groups), -1, dtype=np.int64)
+                for group in np.flatnonzero(present).tolist():
+                    key = int(groups[group])
+                    channel = self.channels.get((key >> 8, key & 0xFF, column))
+                    if channel is None:
+                        row = np.flatnonzero(finite & (inverse == group))[0]
+                        channel = self._channel(key >> 8, key & 0xFF, column, float(values[row]))
+                    mapping[group] = channel
+                parts.append((mapping[inverse[finite]], stamps[finite], values[finite]))
+            if not parts:
+                return
+            channels = np.concatenate([part[0] for part in parts])
+            times = np.concatenate([part[1] for part in parts])
+            values = np.concatenate([part[2] for part in parts]).astype(np.float64)
+            low, high = self.range_low[channels], self.range_high[channels]
+            bins = np.clip(((values - low) / (high - low) * self.bins).astype(np.int64), 0, self.bins - 1)
+            centered = values - self.reference[channels]
+            for window in self.windows.values():
+                window.add(channels, times, centered, bins)
+
+    def query(self, name: str, window: float = 60.0, column: int = 0, device: int = 0,
+              now: Optional[float] = None) -> Optional[Dict[str, float]]:
+        """Estadísticas de un canal en la ventana de ``window`` segundos, o None sin datos
+
+        Retorna ``count``, ``mean``, ``var``, ``std``, ``min``, ``max`` y
+        ``p50``/``p90``/``p99``.
+        """
+        # Solo lectura: un tag nunca visto no se registra, simplemente no tiene datos
+        sid = SENSOR_IDS.get(name)
+        if sid is None:
+            return None
+        with self._lock:
+            channel = self.channels.get((device, sid, column))
+            if channel is None:
+                return None
+            return self._stats(channel, self.windows[float(window)], self.now if now is None else now)
+
+    def _stats(self, channel: int, window: _Window, now: float) -> Optional[Dict[str, float]]:
+        live = window.live(channel, now)
+        count = int(window.count[channel][live].sum())
+        if count == 0:
+            return None
+        reference = self.reference[channel]
+        total = window.total[channel][live].sum()
+        mean = total / count
+        var = max(0.0, window.sumsq[channel][live].sum() / count - mean * mean)
+        low = float(window.low[channel][live].min() + reference)
+        high = float(window.high[channel][live].max() + reference)
+        stats = {
+            "count": count,
+            "mean": float(mean + reference),
+            "var": float(var),
+            "std": float(np.sqrt(var)),
+            "min": low,
+            "max": high,
+        }
+        hist = window.hist[channel][live].sum(axis=0)
+        cumulative = np.cumsum(hist)
+        edges = np.linspace(self.range_low[channel], self.range_high[channel], self.bins + 1)
+        for p in PERCENTILES:
+            rank = p / 100 * count
+            index = int(np.searchsorted(cumulative, rank))
+            before = cumulative[index - 1] if index else 0
+            fraction = (rank - before) / hist[index] if hist[index] else 0.0
+            value = edges[index] + fraction * (edges[index + 1] - edges[index])
+            # Los bins de los extremos también acumulan valores fuera del rango
+            stats[f"p{p}"] = float(min(max(value, low), high))
+        return stats
+
+    def summary(self, window: float = 60.0, now: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """Estadísticas de todos los canales con datos en la ventana
+
+        Las claves son el tag del sensor, con ``@placa`` si no es la placa 0 y
+        ``.1`` para la segunda columna (ej. ``JOYSTICK.1``).
+        """
+        result = {}
+        with self._lock:
+            reference = self.now if now is None else now
+            for (device, sid, column), channel in self.channels.items():
+                stats = self._stats(channel, self.windows[float(window)], reference)
+                if stats is None:
+                    continue
+                name = sensor_name(sid) + (f".{column}" if column else "") + (f"@{device}" if device else "")
+                result[name] = stats
+        return result
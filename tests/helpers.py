@@ -0,0 +1,25 @@
+"""
+Lotes sintéticos ``READING_DTYPE`` para las pruebas
+"""
+
+import numpy as np
+from src.sensors.batch_parser import READING_DTYPE
+from src.sensors.registry import sensor_id
+
+
+def make_batch(sensors, values0, times, values1=None, devices=None) -> np.ndarray:
+    """Arma un lote con ``device_time`` NaN (modo texto)"""
+    batch = np.zeros(len(times), dtype=READING_DTYPE)
+    batch['sensor'] = [sensor_id(name) for name in sensors] if isinstance(sensors, list) else sensor_id(sensors)
+    batch['value0'] = values0
+    batch['value1'] = np.nan if values1 is None else values1
+    batch['timestamp'] = times
+    batch['device_time'] = np.nan
+    batch['device'] = 0 if devices is None else devices
+    return batch
+
+
+def split(batch: np.ndarray, rng: np.random.Generator, parts: int) -> list:
+    """Parte un lote en ``parts`` trozos de largo aleatorio (al menos 1 fila)"""
+    cuts = np.sort(rng.choice(np.arange(1, len(batch)), parts - 1, replace=False))
+    return np.split(batch, cuts)
@@ -0,0 +1,109 @@
+"""
+Reglas de alerta contra evaluaciones escalares, fila por fila
+"""
+
+import time
+import numpy as np
+import pytest
+from helpers import make_batch, split
+from src.sensors.alerts import (COMPARISONS, AlertEngine, HeldRule, HysteresisRule, RateRule, ThresholdRule,
+                                ZScoreRule, parse_rule)
+from src.sensors.registry import sensor_id
+
+RULES = ["LM35>30", "LM35<=20", "LM35>30/28", "LM35 rate>50", "LM35>27 for 200ms", "LM35 z>3",
+         "JOYSTICK.1 rate>2000", "JOYSTICK.1<-50/-40"]
+# Timestamps un día en el futuro: el thread de plazos no vence ninguna regla "sostenido"
+BASE = time.time() + 86400
+
+
+def reference_active(rule, values, times):
+    """Estado de la regla en cada fila, evaluada de a una lectura"""
+    out = []
+    on, previous, since, held = False, None, None, False
+    mean, var, count = values[0], 0.0, 0
+    for x, t in zip(values, times):
+        if isinstance(rule, ThresholdRule):
+            on = COMPARISONS[rule.op](x, rule.limit)
+        elif isinstance(rule, HysteresisRule):
+            high = rule.on > rule.off
+            if (x > rule.on) if high else (x < rule.on):
+                on = True
+            elif (x < rule.off) if high else (x > rule.off):
+                on = False
+        elif isinstance(rule, RateRule):
+            px, pt = previous or (x, t)
+            on = abs(x - px) / max(t - pt, rule.min_interval) > rule.limit
+            previous = (x, t)
+        elif isinstance(rule, HeldRule):
+            if COMPARISONS[rule.op](x, rule.limit):
+                since = t if since is None else since
+                held = held or t - since >= rule.hold
+            else:
+                since, held = None, False
+            on = held
+        elif isinstance(rule, ZScoreRule):
+            deviation = x - mean
+            on = count >= rule.warmup and var > 0 and abs(deviation) / np.sqrt(var) > rule.threshold
+            mean = rule.alpha * x + (1 - rule.alpha) * mean
+            var = (1 - rule.alpha) * (var + rule.alpha * deviation * deviation)
+            count += 1
+        out.append(bool(on))
+    return out
+
+
+def reference_transitions(rules, batch):
+    transitions = []
+    for rule in rules:
+        for device in (0, 1):
+            rows = batch[(batch['sensor'] == sensor_id(rule.sensor)) & (batch['device'] == device)]
+            values = rows['value1' if rule.column else 'value0']
+            previous = False
+            for active, t in zip(reference_active(rule, values, rows['timestamp']), rows['timestamp']):
+                if active != previous:
+                    transitions.append((rule.name, device, float(t), active))
+                previous = active
+    return sorted(transitions)
+
+
+def run(batches):
+    alerts = []
+    engine = AlertEngine([parse_rule(text) for text in RULES], [alerts.append])
+    try:
+        for batch in batches:
+            engine(batch)
+    finally:
+        engine.close()
+    return sorted((alert.rule, alert.device, alert.timestamp, alert.active) for alert in alerts)
+
+
+@pytest.fixture
+def batch():
+    rng = np.random.default_rng(5)
+    n = 6000
+    sensors = np.array(rng.choice(["LM35", "JOYSTICK", "POT"], n, p=[0.6, 0.3, 0.1]))
+    lm35 = 25 + np.cumsum(rng.normal(0, 0.4, n))
+    lm35[rng.random(n) < 0.01] += 15  # Picos para la regla z
+    values1 = np.where(sensors == "JOYSTICK", rng.uniform(-100, 100, n), np.nan)
+    times = BASE + np.round(np.cumsum(rng.uniform(0, 0.03, n)), 2)
+    return make_batch(list(sensors), lm35, times, values1, devices=rng.integers(0, 2, n))
+
+
+def test_engine_matches_reference(batch):
+    rules = [parse_rule(text) for text in RULES]
+    expected = reference_transitions(rules, batch)
+    assert {name for name, *_ in expected} == {rule.name for rule in rules}
+    assert run([batch]) == expected
+
+
+def test_engine_is_batch_split_invariant(batch):
+    rng = np.random.default_rng(6)
+    whole = run([batch])
+    assert run(split(batch, rng, 300)) == whole
+    assert run(batch[i:i + 1] for i in range(len(batch))) == whole
+
+
+def test_rules_reject_unknown_sensor_or_column():
+    with pytest.raises(ValueError):
+        parse_rule("LM53>30")
+    with pytest.raises(ValueError):
+        parse_rule("LM35.1>30")
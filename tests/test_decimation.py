@@ -0,0 +1,64 @@
+"""
+``MinMaxPyramid`` contra el mínimo y máximo por fuerza bruta de cada bloque
+"""
+
+import numpy as np
+import pytest
+from src.gui.decimation import MinMaxPyramid, minmax_decimate
+
+
+def assert_levels_match(pyramid, history):
+    for level in range(pyramid.levels):
+        block = 1 << level
+        count = pyramid.level_count(level)
+        lows = pyramid.window(level, 0, count, pyramid.mins)
+        highs = pyramid.window(level, 0, count, pyramid.maxs)
+        first = count - len(lows)
+        blocks = history[first * block:count * block].reshape(-1, block)
+        assert np.array_equal(lows, blocks.min(axis=1))
+        assert np.array_equal(highs, blocks.max(axis=1))
+
+
+@pytest.mark.parametrize("capacity", [256, 1024])
+def test_levels_match_brute_force(capacity):
+    rng = np.random.default_rng(capacity)
+    # Lotes de uno, apenas menores o mayores que la capacidad y de varias vueltas
+    sizes = [1, 3, 17, capacity - 1, capacity + 1, capacity + 37, 3 * capacity + 5]
+    for _ in range(30):
+        pyramid = MinMaxPyramid(capacity)
+        history = np.empty(0)
+        for size in rng.choice(sizes, rng.integers(1, 10)).tolist():
+            values = rng.normal(size=size)
+            pyramid.append(values)
+            history = np.concatenate((history, values))
+            assert_levels_match(pyramid, history)
+
+
+def test_render_level_zero_is_exact():
+    rng = np.random.default_rng(3)
+    history = rng.normal(size=5000)
+    pyramid = MinMaxPyramid(1024)
+    pyramid.append(history[:3000])
+    pyramid.append(history[3000:])
+    ages, values = pyramid.render(0, 1023, 2000)
+    assert np.array_equal(values, history[::-1][ages.astype(int)])
+    ages, values = pyramid.render(0, 1023, 100)
+    assert values.min() == history[-1024:].min() and values.max() == history[-1024:].max()
+
+
+def test_minmax_decimate_keeps_extremes():
+    rng = np.random.default_rng(4)
+    x = np.arange(10000.0)
+    y = rng.normal(size=10000)
+    dx, dy = minmax_decimate(x, y, 200)
+    assert len(dx) <= 200
+    assert dy.min() == y.min() and dy.max() == y.max()
+
+
+@pytest.mark.parametrize("n", [10001, 10099, 12345])
+def test_minmax_decimate_keeps_trailing_partial_block(n):
+    y = np.zeros(n)
+    y[-1] = 5.0  # Pico en la muestra más nueva
+    dx, dy = minmax_decimate(np.arange(float(n)), y, 200)
+    assert len(dx) == len(dy) <= 200
+    assert dy.max() == 5.0 and dx[-1] <= n - 1
@@ -0,0 +1,116 @@
+"""
+Filtros de acondicionamiento contra implementaciones escalares de referencia
+"""
+
+import math
+import numpy as np
+import pytest
+from helpers import make_batch, split
+from src.sensors.filters import (ConditioningStage, EmaFilter, KalmanFilter, MedianFilter, OneEuroFilter,
+                                 linear_recurrence)
+
+
+def reference_recurrence(a, b, y0):
+    out = []
+    for ak, bk in zip(a, b):
+        y0 = ak * y0 + bk
+        out.append(y0)
+    return np.array(out)
+
+
+def reference_ema(values, alpha):
+    y = values[0]
+    out = []
+    for x in values:
+        y = alpha * x + (1 - alpha) * y
+        out.append(y)
+    return np.array(out)
+
+
+def reference_median(values, window):
+    return np.array([np.median(values[max(0, i - window + 1):i + 1]) for i in range(len(values))])
+
+
+def reference_one_euro(values, times, min_cutoff, beta, d_cutoff, rate):
+    def alpha(dt, cutoff):
+        return 1.0 / (1.0 + 1.0 / (2 * math.pi * cutoff) / dt)
+
+    x_prev, t_prev, dx, y = values[0], times[0], 0.0, values[0]
+    out = []
+    for x, t in zip(values, times):
+        dt = t - t_prev if t > t_prev else 1.0 / rate
+        a_d = alpha(dt, d_cutoff)
+        dx = a_d * (x - x_prev) / dt + (1 - a_d) * dx
+        a = alpha(dt, min_cutoff + beta * abs(dx))
+        y = a * x + (1 - a) * y
+        x_prev, t_prev = x, t
+        out.append(y)
+    return np.array(out)
+
+
+def reference_kalman(values, q, r):
+    x, p = values[0], r
+    out = []
+    for z in values:
+        predicted = p + q
+        gain = predicted / (predicted + r)
+        x = x + gain * (z - x)
+        p = (1 - gain) * predicted
+        out.append(x)
+    return np.array(out)
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(7)
+
+
+def test_linear_recurrence_matches_loop(rng):
+    # Factores chicos y ceros obligan a partir el lote en varios tramos
+    a = rng.uniform(0, 1, 5000)
+    a[::97] = 0.0
+    a[::89] = 1e-12
+    b = rng.normal(size=5000)
+    assert np.allclose(linear_recurrence(a, b, 3.0), reference_recurrence(a, b, 3.0))
+    assert len(linear_recurrence(a[:0], b[:0], 1.0)) == 0
+
+
+@pytest.mark.parametrize("make, reference", [
+    (lambda: EmaFilter(0.2), lambda v, t: reference_ema(v, 0.2)),
+    (lambda: MedianFilter(5), lambda v, t: reference_median(v, 5)),
+    (lambda: OneEuroFilter(1.0, 0.05, 1.0, 100.0), lambda v, t: reference_one_euro(v, t, 1.0, 0.05, 1.0, 100.0)),
+    (lambda: KalmanFilter(0.01, 4.0), lambda v, t: reference_kalman(v, 0.01, 4.0)),
+])
+def test_filter_matches_reference(rng, make, reference):
+    values = np.cumsum(rng.normal(size=2000))
+    # Incluye lecturas repetidas en el mismo instante (mismo lote en modo texto)
+    times = np.round(np.cumsum(rng.uniform(0, 0.02, 2000)), 2)
+    stream_filter = make()
+    out = stream_filter.apply(stream_filter.slot("x"), values, times)
+    assert np.allclose(out, reference(values, times))
+
+
+@pytest.mark.parametrize("spec", ["ema:0.3", "median:7", "oneeuro:1:0.1", "kalman:0.01:4"])
+def test_conditioning_is_batch_split_invariant(rng, spec):
+    n = 3000
+    sensors = list(rng.choice(["POT", "JOYSTICK", "LDR"], n))
+    values1 = np.where(np.array(sensors) == "JOYSTICK", rng.normal(size=n), np.nan)
+    batch = make_batch(sensors, rng.normal(size=n), np.cumsum(rng.uniform(0, 0.01, n)), values1,
+                       devices=rng.integers(0, 2, n))
+    specs = [f"POT={spec}", f"JOYSTICK={spec}"]
+    whole = ConditioningStage.from_specs(specs)(batch)
+    stage = ConditioningStage.from_specs(specs)
+    parts = np.concatenate([stage(part) for part in split(batch, rng, 40)])
+    for column in ('value0', 'value1'):
+        assert np.allclose(whole[column], parts[column], equal_nan=True)
+    # LDR no tiene filtro y el lote original queda crudo
+    ldr = np.array(sensors) == "LDR"
+    assert np.array_equal(whole['value0'][ldr], batch['value0'][ldr])
+    assert not np.allclose(whole['value0'], batch['value0'])
+
+
+def test_unknown_sensor_is_rejected():
+    with pytest.raises(ValueError):
+        ConditioningStage.from_specs(["LM53=ema:0.3"])
+    with pytest.raises(ValueError):
+        ConditioningStage().set_filter("LM53", EmaFilter())
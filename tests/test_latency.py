@@ -0,0 +1,18 @@
+"""
+Etapas de ``LatencyTracer`` medidas por ``ArduinoSerial._dispatch``
+"""
+
+import time
+from src.sensors.arduino_serial import ArduinoSerial
+from src.sensors.latency import LatencyTracer
+
+
+def test_listeners_are_their_own_stage():
+    source = ArduinoSerial()
+    source.tracer = LatencyTracer()
+    source.add_listener(lambda batch: time.sleep(0.02))  # Ej. una grabación lenta
+    source.batch_callback = lambda batch: None
+    source._handle_lines(["POT,57", "LM35,24.5"])
+    stats = source.tracer.summary()["POT"]
+    assert stats["listen_p50_ms"] >= 20
+    assert stats["store_p50_ms"] < 5
@@ -0,0 +1,101 @@
+"""
+Remuestreo contra una búsqueda tick por tick y ``StreamingResampler`` por lotes
+"""
+
+import numpy as np
+import pytest
+from helpers import make_batch, split
+from src.sensors.registry import sensor_id
+from src.sensors.resample import HOLD, LINEAR, StreamingResampler, parse_channel, resample, uniform_grid
+
+CHANNELS = ["POT", "LM35", "JOYSTICK", "JOYSTICK.1", "BUTTON@1"]
+RATE = 50.0
+MAX_AGE = 0.1
+
+
+def reference_resample(times, values, grid, method, max_age):
+    result, stale = [], []
+    i = -1  # Última lectura en o antes del tick
+    for tick in grid:
+        while i + 1 < len(times) and times[i + 1] <= tick:
+            i += 1
+        if i < 0:
+            result.append(np.nan)
+            stale.append(True)
+            continue
+        value = values[i]
+        if method == LINEAR and i + 1 < len(times) and times[i] < tick:
+            fraction = (tick - times[i]) / (times[i + 1] - times[i])
+            value = values[i] + fraction * (values[i + 1] - values[i])
+        result.append(value)
+        stale.append(tick - times[i] > max_age)
+    return np.array(result), np.array(stale)
+
+
+@pytest.fixture
+def batch():
+    rng = np.random.default_rng(1)
+    n = 4000
+    sensors = np.array(rng.choice(["POT", "LM35", "JOYSTICK", "BUTTON"], n))
+    values1 = np.where(sensors == "JOYSTICK", rng.uniform(0, 100, n), np.nan)
+    devices = np.where(sensors == "BUTTON", rng.integers(0, 2, n), 0)
+    times = 1000.0 + np.sort(rng.uniform(0, 40, n))
+    return make_batch(list(sensors), rng.uniform(0, 100, n), times, values1, devices=devices)
+
+
+def channel_readings(batch, name):
+    tag, column, device = parse_channel(name)
+    rows = batch[(batch['sensor'] == sensor_id(tag)) & (batch['device'] == device)]
+    return rows['timestamp'], rows['value1' if column else 'value0']
+
+
+@pytest.mark.parametrize("method", [HOLD, LINEAR])
+def test_resample_matches_reference(batch, method):
+    grid = uniform_grid(999.5, 1041.0, RATE)
+    for name in CHANNELS:
+        times, values = channel_readings(batch, name)
+        result, stale = resample(times, values, grid, method, MAX_AGE)
+        expected, expected_stale = reference_resample(times, values, grid, method, MAX_AGE)
+        assert np.allclose(result, expected, equal_nan=True)
+        assert np.array_equal(stale, expected_stale)
+
+
+@pytest.mark.parametrize("method, delay", [(HOLD, 0.0), (HOLD, 1.0), (LINEAR, 1.0)])
+def test_streaming_is_batch_split_invariant(batch, method, delay):
+    # En modo lineal el delay debe superar el hueco entre lecturas: con
+    # delay 0 un tick se emite antes de conocer la lectura siguiente
+    rng = np.random.default_rng(2)
+    outputs = []
+    for parts in ([batch], split(batch, rng, 50), split(batch, rng, 1000)):
+        resampler = StreamingResampler(RATE, CHANNELS, method=method, max_age=MAX_AGE, delay=delay)
+        for part in parts:
+            resampler(part)
+        outputs.append(resampler.take())
+    whole = outputs[0]
+    assert np.array_equal(whole.times, uniform_grid(batch['timestamp'][0], batch['timestamp'][-1] - delay, RATE))
+    for other in outputs[1:]:
+        assert np.array_equal(other.times, whole.times)
+        assert np.allclose(other.values, whole.values, equal_nan=True)
+        assert np.array_equal(other.stale, whole.stale)
+
+
+@pytest.mark.parametrize("method", [HOLD, LINEAR])
+def test_streaming_matches_offline(batch, method):
+    rng = np.random.default_rng(3)
+    # Con un delay mayor que el hueco entre lecturas, el modo lineal ya
+    # conoce la lectura siguiente de cada tick
+    resampler = StreamingResampler(RATE, CHANNELS, method=method, max_age=MAX_AGE, delay=2.0)
+    for part in split(batch, rng, 200):
+        resampler(part)
+    out = resampler.take()
+    for i, name in enumerate(CHANNELS):
+        times, values = channel_readings(batch, name)
+        expected, stale = resample(times, values, out.times, method, MAX_AGE)
+        assert np.allclose(out.values[:, i], expected, equal_nan=True)
+        assert np.array_equal(out.stale[:, i], stale)
+
+
+@pytest.mark.parametrize("channel", ["LM53", "POT.1"])
+def test_streaming_rejects_unknown_channels(channel):
+    with pytest.raises(ValueError):
+        StreamingResampler(RATE, [channel])
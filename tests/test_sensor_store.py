@@ -0,0 +1,57 @@
+"""
+Lecturas de ``RingBuffer`` concurrentes con el escritor (seqlock)
+"""
+
+import threading
+import time
+import numpy as np
+from src.sensors.sensor_store import ROW_WIDTH, SEQ, TIMESTAMP, VALUE0, RingBuffer
+
+
+def test_reads_are_consistent_while_writing():
+    ring = RingBuffer(256)
+    done = threading.Event()
+
+    def writer():
+        step = 0
+        while not done.is_set():
+            rows = np.empty((37, ROW_WIDTH))
+            rows[:, TIMESTAMP] = np.arange(step, step + 37)
+            rows[:, VALUE0] = rows[:, TIMESTAMP] * 2
+            ring.append(rows)
+            step += 37
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for _ in range(2000):
+            rows = ring.since(-1.0)
+            # Una copia coherente: timestamps consecutivos y valores de la misma escritura
+            assert np.all(np.diff(rows[:, TIMESTAMP]) == 1)
+            assert np.array_equal(rows[:, VALUE0], rows[:, TIMESTAMP] * 2)
+            row = ring.latest()
+            assert row is None or row[VALUE0] == row[TIMESTAMP] * 2
+    finally:
+        done.set()
+        thread.join()
+
+
+def test_reader_yields_while_a_write_is_in_progress():
+    ring = RingBuffer(16)
+    ring.append(np.ones((4, ROW_WIDTH)))
+    ring.header[SEQ] += 1  # Escritura en curso (ej. otro proceso)
+    result = {}
+
+    def reader():
+        start = time.thread_time()
+        result["row"] = ring.latest()
+        result["cpu"] = time.thread_time() - start
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    time.sleep(0.2)
+    ring.header[SEQ] += 1
+    thread.join(timeout=2)
+    assert result["row"] is not None
+    # Esperó ~0.2 s durmiendo, no girando
+    assert result["cpu"] < 0.1
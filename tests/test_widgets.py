@@ -0,0 +1,76 @@
+"""
+Ruteo de lecturas reales a los widgets de ``MainWindow`` (Qt sin pantalla)
+"""
+
+import os
+import numpy as np
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+
+from src.gui.main_window import GRAPH_VISIBLE, MainWindow
+from src.gui.widgets import MAX_PENDING_EDGES, DigitalIndicatorWidget
+from src.sensors.arduino_serial import ArduinoSerial
+from src.sensors.batch_parser import parse_lines
+
+
+@pytest.fixture(scope="module")
+def window():
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    # Un puerto inexistente: la ventana arranca sin conexión y sin threads
+    window = MainWindow(source=ArduinoSerial(port="/dev/null/arduino"))
+    window.arduino_connected = True  # Las filas del store cuentan como lecturas reales
+    yield window
+    window.arduino_connected = False
+    window.close()
+    app.processEvents()
+
+
+def dot_offset(window, line):
+    """Desplazamiento vertical del punto del joystick (positivo: hacia arriba)"""
+    window.store.append_batch(parse_lines([line]))
+    window.update_real({"JOYSTICK"})
+    canvas = window.joystick.joystick_display
+    pixel_y = canvas.height() // 2 - (window.joystick.joy_y / 100) * (canvas.height() / 2 - 10)
+    return canvas.height() // 2 - pixel_y
+
+
+def test_real_joystick_y_is_inverted(window):
+    # Como en el cálculo original (``-y``): el módulo reporta Y creciendo hacia abajo
+    assert dot_offset(window, "JOYSTICK,0,100") < 0
+    assert window.joystick.joy_y == -100
+    assert dot_offset(window, "JOYSTICK,0,-100") > 0
+    assert window.joystick.joy_x == 0
+
+
+def test_graphs_use_level_of_detail(window):
+    # Historial largo: la pirámide tiene niveles min/max además del crudo
+    graph = window.lm35_graph
+    assert graph.history.levels > 1
+    graph.update_values(np.linspace(15, 35, 5000))
+    ages, _ = graph.curve.getData()
+    assert ages.max() < GRAPH_VISIBLE
+    # Al alejar el zoom se grafica todo el rango con pares min/max
+    graph.plot_widget.setXRange(0, 4999, padding=0)
+    ages, values = graph.curve.getData()
+    assert ages.max() > 4000 and len(ages) < 5000
+    assert values.min() == 15 and values.max() == 35
+
+
+def test_simulated_joystick_is_not_inverted(window):
+    spec, update = window.simulated_handlers["JOYSTICK"]
+    update(10, 40)
+    assert (window.joystick.joy_x, window.joystick.joy_y) == (10, 40)
+
+
+def test_dropped_edges_are_counted_and_shown(window):
+    widget = DigitalIndicatorWidget("Botón")
+    # El primer flanco se aplica; los siguientes esperan su turno en pantalla
+    for i in range(MAX_PENDING_EDGES + 5):
+        widget.push_state(i % 2 == 0)
+    assert widget.edges.dropped == 4
+    assert len(widget.edges.pending) <= MAX_PENDING_EDGES
+    assert not widget.dropped_label.isHidden() and "4" in widget.dropped_label.text()
+    # El estado final no cambia: el último flanco sigue en la cola
+    assert widget.edges.pending[-1] == ((MAX_PENDING_EDGES + 4) % 2 == 0)
@@ -0,0 +1,68 @@
+"""
+``WindowedStats`` contra NumPy sobre las muestras de la ventana
+"""
+
+import numpy as np
+from helpers import make_batch, split
+from src.sensors.registry import SENSOR_IDS, sensor_id
+from src.sensors.window_stats import WindowedStats
+
+WINDOW = 10.0
+BUCKETS = 10
+BINS = 64
+
+
+def reference(times, values, now):
+    """Muestras de los buckets vivos: los ``BUCKETS`` intervalos hasta el de ``now``"""
+    width = WINDOW / BUCKETS
+    live = np.floor(times / width) > np.floor(now / width) - BUCKETS
+    return values[live & (times <= now)]
+
+
+def test_matches_numpy_while_sliding():
+    rng = np.random.default_rng(11)
+    n = 20000
+    times = 1000.0 + np.sort(rng.uniform(0, 60, n))
+    sensors = list(rng.choice(["LM35", "JOYSTICK"], n))
+    joystick = np.array(sensors) == "JOYSTICK"
+    values0 = np.where(joystick, rng.uniform(-100, 100, n), rng.normal(25, 3, n).clip(15, 35))
+    values1 = np.where(joystick, rng.uniform(-100, 100, n), np.nan)
+    batch = make_batch(sensors, values0, times, values1, devices=rng.integers(0, 2, n))
+    stats = WindowedStats(windows=(WINDOW,), buckets=BUCKETS, bins=BINS)
+    seen = 0
+    for part in split(batch, rng, 200):
+        stats(part)
+        seen += len(part)
+        if rng.random() > 0.1:
+            continue
+        now = part['timestamp'].max()
+        done = batch[:seen]
+        for name, column, device, low, high in (("LM35", 0, 0, 15, 35), ("JOYSTICK", 1, 1, -100, 100)):
+            rows = (done['sensor'] == sensor_id(name)) & (done['device'] == device)
+            expected = reference(done['timestamp'][rows], done['value1' if column else 'value0'][rows], now)
+            result = stats.query(name, WINDOW, column, device)
+            assert result["count"] == len(expected)
+            assert np.isclose(result["mean"], expected.mean())
+            assert np.isclose(result["var"], expected.var(), rtol=1e-6, atol=1e-9)
+            assert result["min"] == expected.min()
+            assert result["max"] == expected.max()
+            # Los percentiles salen del histograma: error de a lo sumo un bin
+            bin_width = (high - low) / BINS
+            for p in (50, 90, 99):
+                assert abs(result[f"p{p}"] - np.percentile(expected, p)) <= bin_width
+
+
+def test_old_buckets_are_emptied():
+    stats = WindowedStats(windows=(WINDOW,), buckets=BUCKETS)
+    stats(make_batch("POT", [10.0, 20.0], [0.5, 1.5]))
+    stats(make_batch("POT", [90.0], [30.5]))
+    result = stats.query("POT", WINDOW)
+    assert result["count"] == 1 and result["min"] == result["max"] == 90.0
+    assert stats.query("LM35", WINDOW) is None
+
+
+def test_query_does_not_register_unknown_tags():
+    stats = WindowedStats(windows=(WINDOW,), buckets=BUCKETS)
+    stats(make_batch("POT", [10.0], [0.5]))
+    assert stats.query("LM53", WINDOW) is None
+    assert "LM53" not in SENSOR_IDS